@@ -2,33 +2,65 @@
     Module that contains Airplane class 
     Factory Medthod
 """
-from typing import List, Tuple, Union
+from typing import Dict, List, Tuple, Union
 import math
 
+from collision import CollisionStats, bounding_box, shapes_overlap
+
 
 class BaseAirplane:
     """Base Class for Airplane and Missiles 
 
+    Object keeps only its center and heading. Points are made from
+    a shape template that is shared by every object of the same size,
+    and they are calculated only when something asks for them.
+
     Attributes:
         size (int): size of an object
         center (Tuple[int | float, int | float]): center of an object
         speed (int | float): speed of object
-        point (List[Tuple[int | float, int | float]]): point of object that 
-                                                       can draw in polygon
+        heading (float): angle of nose vector in radians
+        point (List[Tuple[int | float, int | float]] | None): cached point of
+                                                              object that can
+                                                              draw in polygon
+        box (Tuple[float, float, float, float] | None): cached bounding box
         is_alive (bool): check this object still alive
+        SHAPE (Tuple[Tuple[float, float], ...]): points of size 1 object
+                                                 when nose point up
 
     Medthods:
-        rotation_points(): rotate all point
+        get_shape(): get shape template of size
+        rotation_points(): rotate object
         bouncing_box(): create box for cheking collding
         is_colliding(): check this object is collding with other object or not
         set_is_alive(): set is_alive attribute
         get_point(): get point of this object use for draw polygon
+        transform_points(): get point of this object at other place
+        get_interpolated_points(): get point between two ticks
         get_vector(): calculate and return vector use for calculate
+        get_heading(): get heading of this object
         get_center(): get center of this object
+        get_size(): get size of this object
         get_speed(): get speed of this object
         get_alive(): get that object this still alive 
     """
 
+    # Top, Bottom Left, Bottom, Bottom Right
+    SHAPE = (
+        (0.0, -1.0),
+        (-1.0, 1.0),
+        (0.0, 0.3),
+        (1.0, 1.0)
+    )
+    NOSE_UP = -math.pi / 2
+
+    # shape template of every size that is used
+    _SHAPES: Dict[int, Tuple[Tuple[float, float], ...]] = {}
+
+    # no __dict__ on every object, see benchmark.bench_memory()
+    __slots__ = ("_size", "_center", "_heading", "_point", "_box",
+                 "_speed", "_is_alive")
+
     def __init__(self,
                  size: int,
                  center: Tuple[int | float, int | float],
@@ -46,27 +78,35 @@ class BaseAirplane:
 
         self._size = size
         self._center = center
-        self._point = [
-            # Top vertex
-            (self._center[0], self._center[1] - self._size),
+        self._heading = self.NOSE_UP
+        self._point = None
+        self._box = None
 
-            # Bottom Left
-            (self._center[0] - self._size,
-             self._center[1] + self._size),
+        self._speed = speed
+        self._is_alive = True
 
-            # Bottom
-            (self._center[0], self._center[1] + self._size*0.3),
+    @classmethod
+    def get_shape(cls, size: int) -> Tuple[Tuple[float, float], ...]:
+        """get shape template of size, every object of the same size
+        share the same template
 
-            # Bottom Right
-            (self._center[0] + self._size,
-             self._center[1] + self._size)
-        ]
+        Args:
+            size (int): size of an object
 
-        self._speed = speed
-        self._is_alive = True
+        Returns:
+            Tuple[Tuple[float, float], ...]: points around (0, 0)
+                                             when nose point up
+        """
+        shape = cls._SHAPES.get(size)
+
+        if shape is None:
+            shape = tuple((x * size, y * size) for x, y in cls.SHAPE)
+            cls._SHAPES[size] = shape
+
+        return shape
 
     def rotation_points(self, angle: int | float) -> None:
-        """rotate points of airplnae from input angle 
+        """rotate airplnae from input angle 
 
         Args:
             angle (int | float): angle that wants Object to rotate in degrees
@@ -77,37 +117,13 @@ class BaseAirplane:
         assert isinstance(angle, (int, float)), \
             f"angle should be float or int, but got {type(angle)}"
 
-        # get all data
-        cx, cy = self.get_center()
-        all_points = self.get_points()
-        new_points = []
-
-        # Change theta_1 to radians
-        # and intialize rotate matrix
-        theta_1 = math.radians(angle)
-        rotate_matrix = [
-            [math.cos(theta_1), -math.sin(theta_1)],
-            [math.sin(theta_1), math.cos(theta_1)]
-        ]
-
-        # Update all points
-        for x, y in all_points:
-            v_center_xy = [x - cx, y - cy]
-            new_xy = []
-
-            # rotate all points by Matrix multiplication
-            for i in range(2):
-                res = 0
-                for j in range(2):
-                    res += rotate_matrix[i][j] * v_center_xy[j]
-                new_xy.append(res)
-
-            new_xy[0] += cx
-            new_xy[1] += cy
-            new_points.append(tuple(new_xy))
-
-        # Update latest point after rotate
-        self._point = new_points
+        # keep heading in range [-pi, pi)
+        heading = self._heading + math.radians(angle)
+        self._heading = (heading + math.pi) % (2 * math.pi) - math.pi
+
+        # points are calculated again when it is needed
+        self._point = None
+        self._box = None
 
     def bouncing_box(self) -> Tuple[float, float, float, float]:
         """Get the (Axis-Aligned Bounding Box) for object
@@ -119,21 +135,24 @@ class BaseAirplane:
                                                         min_y, max_y
                                                         respectively
         """
-        points = self.get_points()
-
-        min_x = min(map(lambda x: x[0], points))
-        max_x = max(map(lambda x: x[0], points))
-        min_y = min(map(lambda y: y[1], points))
-        max_y = max(map(lambda y: y[1], points))
+        # kept until this object moves or rotates
+        if self._box is None:
+            self._box = bounding_box(self.get_points())
 
-        return min_x, max_x, min_y, max_y
+        return self._box
 
-    def is_colliding(self, other: Union["Airplane", "Missile"]) -> bool:
+    def is_colliding(self,
+                     other: Union["Airplane", "Missile"],
+                     stats: CollisionStats | None = None) -> bool:
         """check is colision 
 
+        Bounding boxes reject most pairs, only when they intercept
+        the real shapes are tested with separating axis test.
+
         Args:
             other (Airplane | Missile): Other Object to check that it collide 
                                         with `this` object or not
+            stats (CollisionStats | None): counts pairs of every stage
 
         Returns:
             bool: return `True` when it is collide and `False` when it doesn't
@@ -142,12 +161,17 @@ class BaseAirplane:
         min_x2, max_x2, min_y2, max_y2 = other.bouncing_box()
 
         # Check that is it intercept each other or not
-        if max_x1 < min_x2 or max_x2 < min_x1:
-            return False
-        if max_y1 < min_y2 or max_y2 < min_y1:
+        if max_x1 < min_x2 or max_x2 < min_x1 or \
+                max_y1 < min_y2 or max_y2 < min_y1:
+            if stats is not None:
+                stats.add(1, 0, 0)
             return False
 
-        return True
+        hit = shapes_overlap(self.get_points(), other.get_points())
+        if stats is not None:
+            stats.add(1, 1, int(hit))
+
+        return hit
 
     # Acess data part
     def set_is_alive(self, state: bool) -> None:
@@ -164,11 +188,65 @@ class BaseAirplane:
     def get_points(self) -> List[Tuple[float, float]]:
         """ Return point of object
 
+        Points are rotated from shape template by heading and moved to
+        center, and kept until this object moves or rotates.
+
         Returns:
             List[Tuple[float,float]]: list of points of this object
         """
+        if self._point is None:
+            self._point = self.transform_points(self._center, self._heading)
+
         return self._point
 
+    def transform_points(self,
+                         center: Tuple[float, float],
+                         heading: float) -> List[Tuple[float, float]]:
+        """Return points that this object would have at center and heading
+
+        Args:
+            center (Tuple[float, float]): center of object
+            heading (float): angle of nose vector in radians
+
+        Returns:
+            List[Tuple[float,float]]: list of points at that place
+        """
+        cx, cy = center
+
+        # angle from nose up to heading
+        theta = heading - self.NOSE_UP
+        cos_t = math.cos(theta)
+        sin_t = math.sin(theta)
+
+        return [(cx + x * cos_t - y * sin_t,
+                 cy + x * sin_t + y * cos_t)
+                for x, y in self.get_shape(self.get_size())]
+
+    def get_interpolated_points(self,
+                                prev_center: Tuple[float, float],
+                                prev_heading: float,
+                                alpha: float) -> List[Tuple[float, float]]:
+        """Return points between previous place and current place
+
+        Args:
+            prev_center (Tuple[float, float]): center at previous tick
+            prev_heading (float): heading at previous tick
+            alpha (float): 0 is previous place and 1 is current place
+
+        Returns:
+            List[Tuple[float,float]]: list of points between two ticks
+        """
+        cx, cy = self._center
+        px, py = prev_center
+
+        # turn the shortest way from previous heading
+        diff = (self._heading - prev_heading + math.pi) % (2 * math.pi) \
+            - math.pi
+
+        return self.transform_points((px + (cx - px) * alpha,
+                                      py + (cy - py) * alpha),
+                                     prev_heading + diff * alpha)
+
     def get_vector(self) -> List[float]:
         """Return vector of obeject
 
@@ -178,10 +256,16 @@ class BaseAirplane:
             List[float]: Reuturn vector of object such that tail is at center 
                          and nose is at top of this object
         """
-        cx, cy = self._center
-        nose_x, nose_y = self._point[0]
-        v_center_nose = [nose_x - cx, nose_y - cy]
-        return v_center_nose
+        return [self._size * math.cos(self._heading),
+                self._size * math.sin(self._heading)]
+
+    def get_heading(self) -> float:
+        """Get heading of an object
+
+        Returns:
+            float: angle of nose vector in radians
+        """
+        return self._heading
 
     def get_center(self) -> Tuple[float, float]:
         """Get center of an object
@@ -191,6 +275,14 @@ class BaseAirplane:
         """
         return self._center
 
+    def get_size(self) -> int:
+        """Get size of an object
+
+        Returns:
+            int: size of Object
+        """
+        return self._size
+
     def get_speed(self) -> float:
         """Get speed of an object
 
@@ -217,49 +309,40 @@ class Airplane(BaseAirplane):
         speed (int | float): speed of this object
 
     Medthods:
-        move_forward(): move all point of this object forward by speed
+        move_forward(): move this object forward by speed
     """
 
+    __slots__ = ()
+
     def __init__(self,
                  size: int,
                  center: Tuple[int | float, int | float],
                  speed: int | float) -> None:
         super().__init__(size=size, center=center, speed=speed)
 
-    def move_forward(self) -> None:
+    def move_forward(self, scale: float = 1.0) -> None:
         """ Move this plane forward the top nose of it 
 
+        Args:
+            scale (float): part of speed to move, speed is distance per
+                           tick at 60 ticks per second
+
         Returns:
             None: Moving an object forward that nose it to
         """
 
         # Get nessary Data
         cx, cy = self.get_center()
-        v_center_nose = self.get_vector()
-        speed = self.get_speed()
-        all_points = self.get_points()
-
-        # List of new points
-        new_points = []
+        speed = self.get_speed() * scale
 
-        # Calculate what direction of this vector and update it
-        # calculating angle of vector using arctan(y/x)
-        # and updating form formula
-        # angle is in raidus
+        # Move center along heading
         #   x = rcos(angle)
         #   y = rsin(angle)
-        angle = math.atan2(v_center_nose[1], v_center_nose[0])
-        move_x = speed * math.cos(angle)
-        move_y = speed * math.sin(angle)
-
-        # Update all point of airplane
-        self._center = (cx + move_x, cy + move_y)
-        for x, y in all_points:
-            new_x = x + move_x
-            new_y = y + move_y
-
-            new_points.append(tuple([new_x, new_y]))
-        self._point = new_points
+        # points are calculated again when it is needed
+        self._center = (cx + speed * math.cos(self._heading),
+                        cy + speed * math.sin(self._heading))
+        self._point = None
+        self._box = None
 
 
 class Missile(BaseAirplane):
@@ -275,13 +358,15 @@ class Missile(BaseAirplane):
         max_speed (int | float): max_speed that missile can reach
 
     Medthods:
-        update(): update all point and speed by dt
+        update(): update center and speed by dt
         rotation_to_target(): rotate missile to target
         get_acceleration(): get acceleration of this object
         get_max_speed(): get max_speed of this object
         get_max_turn_rate(): get max_turn_rate of this object 
     """
 
+    __slots__ = ("__acceleration", "__max_speed", "__max_turn_rate")
+
     def __init__(self,
                  size: int,
                  center: Tuple[float, float],
@@ -307,9 +392,9 @@ class Missile(BaseAirplane):
         self.__max_turn_rate = max_turn_rate
 
     def update(self, dt: int | float) -> None:
-        """Update point with acceleration and delta time
+        """Update center with acceleration and delta time
 
-        Update all points and speed with acceleration 
+        Update center and speed with acceleration 
         and limit speed by max_speed
 
         Args:
@@ -323,22 +408,16 @@ class Missile(BaseAirplane):
             f"dt should be int or float, but got {type(dt)}"
 
         # get data
-        v_missile = self.get_vector()
         acceleration = self.get_acceleration()
         current_speed = self.get_speed()
         max_speed = self.get_max_speed()
         center = self.get_center()
-        all_points = self.get_points()
-        new_points = []
 
         # Check that speed is equal to max_speed that means missiles
         # Out of fuel
         if current_speed == max_speed:
             self._is_alive = False
 
-        # Calculate angle of missiles from vector
-        missile_angle = math.atan2(v_missile[1], v_missile[0])
-
         # Calculate new speed + accelerate
         self._speed += acceleration * dt
 
@@ -349,17 +428,13 @@ class Missile(BaseAirplane):
 
         # find delta_x, delta_y
         # How many that x and y should move
-        move_x = new_speed * math.cos(missile_angle)
-        move_y = new_speed * math.sin(missile_angle)
+        move_x = new_speed * math.cos(self._heading)
+        move_y = new_speed * math.sin(self._heading)
 
-        # Update all point
+        # Update center, points are calculated again when it is needed
         self._center = (center[0] + move_x, center[1] + move_y)
-        for x, y in all_points:
-            new_x = x + move_x
-            new_y = y + move_y
-            new_points.append(tuple([new_x, new_y]))
-
-        self._point = new_points
+        self._point = None
+        self._box = None
 
     def rotation_to_target(self, target: Airplane) -> None:
         """Rotate face to target
@@ -368,14 +443,13 @@ class Missile(BaseAirplane):
             target (Airplane): Object that wants missile to rotate to
 
         Returns:
-            None: Just rotating all points
+            None: Just rotating this object
         """
 
         assert isinstance(target, Airplane), \
             f"target should be Airplane, but got {type(target)}"
 
         # Get all data
-        v_missile = self.get_vector()
         center_missile = self.get_center()
         center_target = target.get_center()
         max_turn_rate = math.radians(self.get_max_turn_rate())
@@ -385,7 +459,7 @@ class Missile(BaseAirplane):
                   center_target[1] - center_missile[1]]
 
         # get angle of vector of missile and target
-        missile_angle = math.atan2(v_missile[1], v_missile[0])
+        missile_angle = self.get_heading()
         target_angle = math.atan2(v_m1_t[1], v_m1_t[0])
 
         # find how different between missile and target
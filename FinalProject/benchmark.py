@@ -0,0 +1,744 @@
+"""
+    Module that contains benchmarks of hot paths in game
+
+    Every case is run for every entity count, results are saved as JSON
+    and can be compared with a stored baseline to find regressions.
+
+    Run:
+        python benchmark.py run --output results.json
+        python benchmark.py compare baseline.json results.json
+        python benchmark.py collision
+        python benchmark.py memory
+        python benchmark.py snapshot
+        python benchmark.py startup --budget 1.0
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from baseairplane import Airplane, Missile
+from coin import CoinFactory
+from simulation import Simulation, INPUT_START
+from snapshot import SnapshotDecoder, SnapshotEncoder
+from swarm import MissileSwarm
+from spatialhash import SpatialHash
+from collision import CollisionStats, narrow_phase
+
+MISSILE_SIZE = 5
+
+# missiles per pixel, about 100 missiles on 800x600 screen
+MISSILE_DENSITY = 100 / (800 * 600)
+
+DEFAULT_COUNTS = [10, 100, 1000, 10000, 100000]
+DEFAULT_REPEAT = 5
+
+# slower than baseline by more than this is a regression
+DEFAULT_THRESHOLD = 0.25
+
+# modules that tools use without the game window, they must import
+# without pygame
+SIMULATION_MODULES = ["baseairplane", "coin", "collision", "swarm",
+                      "spatialhash", "simulation", "replay", "montecarlo",
+                      "scorelog", "snapshot", "vecenv", "trajectory"]
+
+# seconds from start of imports to first frame on the screen
+DEFAULT_STARTUP_BUDGET = 1.0
+
+
+def timeit(func: Callable[[], object],
+           repeat: int = DEFAULT_REPEAT,
+           setup: Callable[[], object] | None = None) -> List[float]:
+    """Run func many times and return every time in seconds
+
+    Args:
+        func (Callable[[], object]): function that is measured
+        repeat (int): number of runs
+        setup (Callable[[], object] | None): called before every run
+                                             and not measured
+
+    Returns:
+        List[float]: time of every run
+    """
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def make_swarm(count: int, seed: int = 0) -> MissileSwarm:
+    """Create swarm that spread missiles with the same density
+    whatever count is, so the work per missile stays the same
+
+    Args:
+        count (int): number of missiles
+        seed (int): seed of random
+
+    Returns:
+        MissileSwarm: swarm of missiles at random position and heading
+    """
+    rng = random.Random(seed)
+    side = (count / MISSILE_DENSITY) ** 0.5
+    swarm = MissileSwarm(count)
+
+    for _ in range(count):
+        swarm.spawn(size=MISSILE_SIZE,
+                    center=(rng.uniform(0, side), rng.uniform(0, side)),
+                    speed=6,
+                    max_turn_rate=3.5,
+                    acceleration=0.1,
+                    max_speed=6.5,
+                    heading=rng.uniform(-np.pi, np.pi))
+    return swarm
+
+
+def collide_grid(swarm: MissileSwarm,
+                 grid: SpatialHash,
+                 stats: CollisionStats | None = None) -> int:
+    """Missile vs missile check of Game.check_colision
+
+    Returns:
+        int: number of colliding pairs
+    """
+    # points and boxes are cached in swarm, forget them to measure them
+    swarm.invalidate()
+    points = swarm.get_points()
+    boxes = swarm.get_bounding_boxes()
+    grid.build(swarm.get_centers())
+    first, second = grid.candidate_pairs()
+    return len(narrow_phase(points[first], boxes[first],
+                            points[second], boxes[second], stats))
+
+
+def collide_brute(missiles: List) -> int:
+    """Missile vs missile check with a nested loop over every pair
+
+    Returns:
+        int: number of colliding pairs
+    """
+    hits = 0
+    for i in range(len(missiles)):
+        for j in range(i+1, len(missiles)):
+            if missiles[i].is_colliding(missiles[j]):
+                hits += 1
+    return hits
+
+
+def bench_missile_collision(counts: List[int], brute_limit: int = 300) -> None:
+    """Print time of missile vs missile collision for every count
+
+    Args:
+        counts (List[int]): number of missiles for each run
+        brute_limit (int): largest count that also run the nested loop
+    """
+    grid = SpatialHash(MISSILE_SIZE * 3)
+
+    print(f"{'missiles':>10} {'pairs':>8} {'box rej':>8} {'sat rej':>8} "
+          f"{'grid ms':>10} {'us/missile':>11} {'nested ms':>10}")
+
+    for count in counts:
+        swarm = make_swarm(count)
+        stats = CollisionStats()
+        hits = collide_grid(swarm, grid, stats)
+        grid_time = min(timeit(lambda: collide_grid(swarm, grid)))
+
+        brute = "-"
+        if count <= brute_limit:
+            missiles = swarm.get_missiles()
+            assert collide_brute(missiles) == hits, \
+                "grid and nested loop should find the same pairs"
+            brute_time = min(timeit(lambda: collide_brute(missiles), 1))
+            brute = f"{brute_time * 1e3:.2f}"
+
+        print(f"{count:>10} {hits:>8} {stats.box_rejected:>8} "
+              f"{stats.sat_rejected:>8} {grid_time * 1e3:>10.3f} "
+              f"{grid_time / count * 1e6:>11.3f} {brute:>10}")
+
+
+def measure_memory(make: Callable[[int], object], count: int) -> float:
+    """Create count objects and return traced bytes per object
+
+    Args:
+        make (Callable[[int], object]): function that creates object i
+        count (int): number of objects
+
+    Returns:
+        float: bytes per object, list that holds them is not counted
+    """
+    gc.collect()
+    tracemalloc.start()
+    objects = [make(i) for i in range(count)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (current - sys.getsizeof(objects)) / count
+
+
+class DictEntity:
+    """Object with a `__dict__`, it holds the same attributes as an
+    entity with `__slots__` to measure what the slots save"""
+
+
+def with_dict(entity: object) -> DictEntity:
+    """Copy every slot of entity into a DictEntity
+
+    Args:
+        entity (object): object of a class with __slots__
+
+    Returns:
+        DictEntity: same attribute values in a __dict__
+    """
+    copy = DictEntity()
+
+    for cls in type(entity).__mro__:
+        for name in getattr(cls, "__slots__", ()):
+            # private slots are stored with name of their class
+            if name.startswith("__"):
+                name = f"_{cls.__name__.lstrip('_')}{name}"
+            if hasattr(entity, name):
+                setattr(copy, name, getattr(entity, name))
+
+    return copy
+
+
+def bench_memory(count: int = 100_000) -> None:
+    """Print memory of every entity with `__slots__` and the same
+    attributes in a `__dict__`, measured on count entities
+
+    Args:
+        count (int): number of entities for each measurement
+    """
+    factory = CoinFactory()
+
+    def missile(i: int) -> Missile:
+        return Missile(size=MISSILE_SIZE, center=(float(i), 1.0), speed=6,
+                       max_turn_rate=3.5, acceleration=0.1, max_speed=6.5)
+
+    def missile_with_points(i: int) -> Missile:
+        missile_i = missile(i)
+        missile_i.get_points()
+        return missile_i
+
+    def coin(i: int) -> object:
+        return factory.create_coin("invincible", (i, 1), 5, 15)
+
+    def swarm(with_views: bool) -> float:
+        gc.collect()
+        tracemalloc.start()
+        missiles = make_swarm(count)
+        if not with_views:
+            missiles.get_missiles().clear()
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return current / count
+
+    # (__dict__, __slots__), a swarm row has no __dict__ version
+    results = {}
+    for name, make in (("Missile", missile),
+                       ("Missile with points", missile_with_points),
+                       ("InvincibleCoin", coin)):
+        results[name] = (
+            measure_memory(lambda i, make=make: with_dict(make(i)), count),
+            measure_memory(make, count))
+    results["MissileSwarm row"] = (None, swarm(False))
+    results["MissileSwarm row + view"] = (None, swarm(True))
+
+    print(f"{'entity':>24} {'dict B':>8} {'slots B':>8} {f'MB / {count}':>12}")
+    for name, (dict_size, size) in results.items():
+        dict_text = "-" if dict_size is None else f"{dict_size:.0f}"
+        print(f"{name:>24} {dict_text:>8} {size:>8.0f} "
+              f"{size * count / 1e6:>12.1f}")
+
+
+def snapshot_json(sim: Simulation, tick: int) -> bytes:
+    """Pack state of a simulation as plain JSON, the size to beat"""
+    x, y = sim.player.get_center()
+    return json.dumps({
+        "tick": tick,
+        "state": sim.state,
+        "score": sim.score,
+        "high_score": sim.high_score,
+        "effect": sim.player_effect,
+        "player": [x, y, sim.player.get_heading(), sim.player.get_alive()],
+        "missiles": [[m.get_center()[0], m.get_center()[1],
+                      m.get_heading(), m.get_alive()] for m in sim.missiles],
+        "coins": [[c.get_center()[0], c.get_center()[1], type(c).__name__,
+                   c.get_collected()] for c in sim.coin]
+    }).encode()
+
+
+def bench_snapshot(counts: List[int], ticks: int = 120) -> None:
+    """Print size and speed of binary snapshots against JSON
+
+    Args:
+        counts (List[int]): number of missiles for each run
+        ticks (int): frames that are packed for each count
+    """
+    print(f"{'missiles':>10} {'json B':>10} {'key B':>10} {'delta B':>10} "
+          f"{'ratio':>7} {'json us':>9} {'enc us':>9} {'dec us':>9}")
+
+    for count in counts:
+        sim = make_simulation(count)
+        sim.step(INPUT_START, sim.tick_dt)
+
+        # player never dies, so missiles keep moving every tick
+        sim.player_effect = "invincible"
+
+        encoder = SnapshotEncoder(keyframe_interval=ticks)
+        frames = []
+        json_size = 0
+        json_time = 0.0
+        encode_time = 0.0
+
+        for tick in range(ticks):
+            sim.step(0, sim.tick_dt)
+
+            start = time.perf_counter()
+            frames.append(encoder.encode(sim, tick))
+            encode_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            json_size += len(snapshot_json(sim, tick))
+            json_time += time.perf_counter() - start
+
+        decoder = SnapshotDecoder()
+        start = time.perf_counter()
+        for frame in frames:
+            decoder.decode(frame)
+        decode_time = time.perf_counter() - start
+
+        size = sum(map(len, frames))
+        key = len(frames[0])
+        delta = (size - key) / (ticks - 1)
+
+        print(f"{count:>10} {json_size / ticks:>10.0f} {key:>10} "
+              f"{delta:>10.0f} {json_size / size:>6.1f}x "
+              f"{json_time / ticks * 1e6:>9.1f} "
+              f"{encode_time / ticks * 1e6:>9.1f} "
+              f"{decode_time / ticks * 1e6:>9.1f}")
+
+
+# measured in a new process, so nothing is imported or cached yet
+IMPORT_SCRIPT = """
+import sys, time
+if {block_pygame}:
+    sys.modules["pygame"] = None
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+FIRST_FRAME_SCRIPT = """
+import time
+start = time.perf_counter()
+import pygame
+from main import Game
+imported = time.perf_counter()
+pygame.display.init()
+game = Game()
+game.present(game.render())
+print(imported - start, time.perf_counter() - imported)
+"""
+
+
+def run_script(script: str) -> List[float]:
+    """Run script in a new interpreter with offscreen display
+
+    Args:
+        script (str): Python code that prints numbers on one line
+
+    Returns:
+        List[float]: numbers that script printed
+    """
+    env = dict(os.environ, SDL_VIDEODRIVER=os.environ.get(
+        "SDL_VIDEODRIVER", "dummy"), PYGAME_HIDE_SUPPORT_PROMPT="1")
+
+    result = subprocess.run([sys.executable, "-c", script],
+                            cwd=os.path.dirname(os.path.abspath(__file__)),
+                            env=env, capture_output=True, text=True,
+                            check=True)
+    return [float(v) for v in result.stdout.split()]
+
+
+def bench_startup(budget: float = DEFAULT_STARTUP_BUDGET,
+                  repeat: int = DEFAULT_REPEAT) -> int:
+    """Print import time of every module and time to the first frame,
+    every run is a new process so it is a cold start of Python code
+
+    Args:
+        budget (float): longest time to first frame in seconds
+        repeat (int): runs of every measurement, median is shown
+
+    Returns:
+        int: number of failures, a module that needs pygame or
+             a first frame that is over budget
+    """
+    failures = 0
+
+    print(f"{'module':>14} {'import ms':>10} {'no pygame':>10}")
+    for module in SIMULATION_MODULES + ["main"]:
+        times = [run_script(IMPORT_SCRIPT.format(module=module,
+                                                 block_pygame=False))[0]
+                 for _ in range(repeat)]
+
+        pure = "-"
+        if module in SIMULATION_MODULES:
+            try:
+                run_script(IMPORT_SCRIPT.format(module=module,
+                                                block_pygame=True))
+                pure = "ok"
+            except subprocess.CalledProcessError:
+                pure = "FAIL"
+                failures += 1
+
+        print(f"{module:>14} {statistics.median(times) * 1e3:>10.1f} "
+              f"{pure:>10}")
+
+    runs = [run_script(FIRST_FRAME_SCRIPT) for _ in range(repeat)]
+    imported = statistics.median(run[0] for run in runs)
+    frame = statistics.median(run[1] for run in runs)
+    total = statistics.median(run[0] + run[1] for run in runs)
+
+    status = "ok" if total <= budget else "OVER BUDGET"
+    failures += total > budget
+    print(f"first frame: import {imported * 1e3:.1f} ms + window and "
+          f"frame {frame * 1e3:.1f} ms = {total * 1e3:.1f} ms, "
+          f"budget {budget * 1e3:.0f} ms {status}")
+
+    return failures
+
+
+# Cases of the suite
+# every case gets entity count and returns (setup, run),
+# setup is called before every run and is not measured
+Case = Callable[[int], Tuple[Callable[[], object] | None, Callable[[], object]]]
+
+
+def make_missiles(count: int, seed: int = 0) -> List[Missile]:
+    """Create standalone missiles at random position"""
+    rng = random.Random(seed)
+    return [Missile(size=MISSILE_SIZE,
+                    center=(rng.uniform(0, 800), rng.uniform(0, 600)),
+                    speed=6, max_turn_rate=3.5, acceleration=0.1,
+                    max_speed=6.5)
+            for _ in range(count)]
+
+
+def make_simulation(count: int, seed: int = 0) -> Simulation:
+    """Create simulation with count missiles and count / 10 coins
+    around player in the middle of the arena"""
+    rng = random.Random(seed)
+    side = (count / MISSILE_DENSITY) ** 0.5
+
+    sim = Simulation()
+    sim.set_player(Airplane(size=sim.AIRPLANE_SIZE,
+                            center=(side / 2, side / 2),
+                            speed=sim.AIRPLANE_SPEED))
+
+    for _ in range(count):
+        sim.swarm.spawn(size=MISSILE_SIZE,
+                        center=(rng.uniform(0, side), rng.uniform(0, side)),
+                        speed=sim.MISSILE_SPEED,
+                        max_turn_rate=sim.MISSLIE_MAX_TURN_RATE,
+                        acceleration=sim.MISSILE_ACCELERATION,
+                        max_speed=sim.MISSILE_MAX_SPEED,
+                        heading=rng.uniform(-np.pi, np.pi))
+
+    factory = CoinFactory()
+    sim.set_coin([factory.create_coin(
+        coin_type="normal",
+        center=(rng.randint(0, int(side)), rng.randint(0, int(side))),
+        score=sim.COIN_SCORE,
+        radius=sim.COIN_RADIUS) for _ in range(max(count // 10, 1))])
+    return sim
+
+
+def case_rotation_points(count: int):
+    """BaseAirplane.rotation_points on count airplanes"""
+    planes = [Airplane(size=8, center=(float(i), 0.0), speed=6)
+              for i in range(count)]
+
+    def run():
+        for p in planes:
+            p.rotation_points(7)
+            p.get_points()
+    return None, run
+
+
+def case_missile_update(count: int):
+    """Missile.rotation_to_target and Missile.update on count missiles"""
+    missiles = make_missiles(count)
+    target = Airplane(size=8, center=(400.0, 300.0), speed=6)
+
+    def run():
+        for m in missiles:
+            m.rotation_to_target(target)
+            m.update(1 / 60)
+    return None, run
+
+
+def case_update_positions(count: int):
+    """Game.update_positions with count missiles in the swarm"""
+    sim = make_simulation(count)
+    return None, lambda: sim.update_positions(1 / 60)
+
+
+def case_check_colision(count: int):
+    """Game.check_colision with count missiles and count / 10 coins"""
+    state = {}
+
+    def setup():
+        state["sim"] = make_simulation(count)
+    return setup, lambda: state["sim"].check_colision()
+
+
+def case_coin_is_colliding(count: int):
+    """Coin.is_colliding of count coins with the player"""
+    sim = make_simulation(0)
+    factory = CoinFactory()
+    rng = random.Random(0)
+    coins = [factory.create_coin("normal",
+                                 (rng.randint(0, 800), rng.randint(0, 600)),
+                                 5, 15)
+             for _ in range(count)]
+
+    def run():
+        for c in coins:
+            c.is_colliding(sim.player)
+    return None, run
+
+
+def case_coin_pickup(count: int):
+    """Game.coin_grid.query around the player with count coins,
+    what check_colision does for coins every tick"""
+    sim = Simulation()
+    factory = CoinFactory()
+    rng = random.Random(0)
+    centers = [(rng.randint(0, 800), rng.randint(0, 600))
+               for _ in range(count)]
+    sim.set_coin([factory.create_coin("normal", center, 5, 15)
+                  for center in centers])
+    return None, lambda: sim.coin_grid.query((400.0, 300.0))
+
+
+def case_create_coin(count: int):
+    """CoinFactory.create_coin called count times"""
+    factory = CoinFactory()
+    types = ["normal", "invincible", "delete_missile"]
+
+    def run():
+        for i in range(count):
+            factory.create_coin(types[i % 3], (i % 800, i % 600), 5, 15)
+    return None, run
+
+
+def make_game(count: int):
+    """Create Game on an offscreen surface with the entities of
+    make_simulation(count), missiles and coins are in the world"""
+    # offscreen surface, no window is needed
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame  # pylint: disable=import-outside-toplevel
+    from main import Game  # pylint: disable=import-outside-toplevel
+
+    pygame.font.init()
+    game = Game(screen=pygame.Surface(Game.DISPLAY_SIZE))
+    sim = make_simulation(count)
+    game.set_player(sim.player)
+    game.swarm.set_missiles(sim.missiles)
+    game.set_coin(sim.coin)
+    return game
+
+
+def case_draw(count: int):
+    """Game.draw of count missiles and count / 10 coins that are
+    all in view"""
+    game = make_game(count)
+
+    # squeeze every object into the window and put camera on it
+    side = (count / MISSILE_DENSITY) ** 0.5
+    scale = np.array(game.DISPLAY_SIZE) / max(side, 1)
+    game.swarm.get_centers()[:] *= scale
+    game.swarm.invalidate()
+    game.set_coin([type(c)(tuple(int(v) for v in c.get_center() * scale),
+                           c.get_score(), c.get_radius())
+                   for c in game.coin])
+    game.set_player(Airplane(size=game.AIRPLANE_SIZE,
+                             center=(game.SCREEN_WIDTH / 2,
+                                     game.SCREEN_HEIGHT / 2),
+                             speed=game.AIRPLANE_SPEED))
+    return None, game.draw
+
+
+def case_draw_culled(count: int):
+    """Game.draw of count missiles and count / 10 coins spread on
+    a world as large as they need, camera sees only a window of it"""
+    return None, make_game(count).draw
+
+
+CASES: Dict[str, Case] = {
+    "rotation_points": case_rotation_points,
+    "missile_update": case_missile_update,
+    "update_positions": case_update_positions,
+    "check_colision": case_check_colision,
+    "coin_is_colliding": case_coin_is_colliding,
+    "coin_pickup": case_coin_pickup,
+    "create_coin": case_create_coin,
+    "draw": case_draw,
+    "draw_culled": case_draw_culled
+}
+
+
+def run_suite(cases: List[str], counts: List[int], repeat: int) -> dict:
+    """Run every case for every count
+
+    Args:
+        cases (List[str]): names of cases in CASES
+        counts (List[int]): number of entities
+        repeat (int): runs of every case and count
+
+    Returns:
+        dict: result that can be saved as JSON
+    """
+    results = []
+
+    for name in cases:
+        for count in counts:
+            # same random objects every time
+            random.seed(0)
+            setup, run = CASES[name](count)
+            times = timeit(run, repeat=repeat, setup=setup)
+            results.append({
+                "case": name,
+                "count": count,
+                "best": min(times),
+                "median": statistics.median(times),
+                "repeat": repeat
+            })
+            print(f"{name:>18} {count:>8} {min(times) * 1e3:>10.3f} ms")
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S")
+        },
+        "results": results
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> int:
+    """Print change of every case and count against baseline
+
+    Args:
+        baseline (dict): result of `run_suite()` that is stored
+        current (dict): result of `run_suite()` that is checked
+        threshold (float): ratio of slowdown that is a regression
+
+    Returns:
+        int: number of regressions
+    """
+    old = {(r["case"], r["count"]): r["best"] for r in baseline["results"]}
+    regressions = 0
+
+    print(f"{'case':>18} {'count':>8} {'baseline ms':>12} "
+          f"{'current ms':>11} {'change':>8}")
+
+    for r in current["results"]:
+        key = (r["case"], r["count"])
+        if key not in old:
+            continue
+
+        change = r["best"] / old[key] - 1
+        flag = ""
+        if change > threshold:
+            flag = "REGRESSION"
+            regressions += 1
+
+        print(f"{r['case']:>18} {r['count']:>8} {old[key] * 1e3:>12.3f} "
+              f"{r['best'] * 1e3:>11.3f} {change:>+8.0%} {flag}")
+
+    return regressions
+
+
+def main() -> int:
+    """Command line of benchmark
+
+    Returns:
+        int: exit code, 1 when compare finds a regression
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run benchmark suite")
+    run.add_argument("--output", default="benchmark_results.json")
+    run.add_argument("--cases", nargs="+", choices=list(CASES),
+                     default=list(CASES))
+    run.add_argument("--counts", nargs="+", type=int, default=DEFAULT_COUNTS)
+    run.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+
+    cmp = commands.add_parser("compare", help="compare result to baseline")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+
+    commands.add_parser("collision", help="missile collision scaling")
+    commands.add_parser("memory", help="memory per entity")
+    commands.add_parser("snapshot", help="size and speed of snapshots")
+
+    startup = commands.add_parser("startup",
+                                  help="import time and time to first frame")
+    startup.add_argument("--budget", type=float,
+                         default=DEFAULT_STARTUP_BUDGET,
+                         help="seconds to first frame, more is a failure")
+    startup.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        result = run_suite(args.cases, args.counts, args.repeat)
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(result, file, indent=2)
+        print(f"saved to {args.output}")
+
+    elif args.command == "compare":
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+        with open(args.current, "r", encoding="utf-8") as file:
+            current = json.load(file)
+
+        regressions = compare(baseline, current, args.threshold)
+        print(f"{regressions} regression(s)")
+        return 1 if regressions else 0
+
+    elif args.command == "collision":
+        bench_missile_collision([100, 300, 1000, 3000, 10000, 30000, 100000])
+
+    elif args.command == "memory":
+        bench_memory()
+
+    elif args.command == "snapshot":
+        bench_snapshot([0, 10, 100, 1000, 10000])
+
+    elif args.command == "startup":
+        return 1 if bench_startup(args.budget, args.repeat) else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
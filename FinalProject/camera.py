@@ -0,0 +1,125 @@
+"""
+    Module that contains Camera, it follows the player in a world
+    that is larger than the window and tells what can be seen
+"""
+from typing import Tuple
+
+import numpy as np
+
+
+class Camera:
+    """View of the window onto the world
+
+    Camera keeps the followed point in the middle of the window, but
+    never shows outside of the world. When world is smaller than the
+    window it is shown in the middle.
+
+    Attributes:
+        world_size (Tuple[int, int]): width and height of the world
+        view_size (Tuple[int, int]): width and height of the window
+
+    Medthods:
+        follow(): move camera so a point is in the middle
+        to_screen(): move world points to window coordinates
+        visible(): check many bounding boxes with the view
+        is_visible(): check one bounding box with the view
+        get_offset(): get world position of top left of the window
+        get_view(): get bounding box of the view in the world
+    """
+
+    def __init__(self,
+                 world_size: Tuple[int, int],
+                 view_size: Tuple[int, int]) -> None:
+
+        assert isinstance(world_size, tuple) and len(world_size) == 2, \
+            f"world_size should be Tuple[int, int], but got {type(world_size)}"
+
+        assert isinstance(view_size, tuple) and len(view_size) == 2, \
+            f"view_size should be Tuple[int, int], but got {type(view_size)}"
+
+        self.__world_size = world_size
+        self.__view_size = view_size
+        self.__offset = (0.0, 0.0)
+        self.follow((world_size[0] / 2, world_size[1] / 2))
+
+    def follow(self, center: Tuple[float, float]) -> None:
+        """Move camera so center is in the middle of the window
+
+        Args:
+            center (Tuple[float, float]): world position to follow
+        """
+        offset = []
+
+        for c, world, view in zip(center, self.__world_size, self.__view_size):
+            if world <= view:
+                offset.append((world - view) / 2)
+            else:
+                # stop at the edge of the world
+                offset.append(min(max(c - view / 2, 0), world - view))
+
+        self.__offset = (offset[0], offset[1])
+
+    def to_screen(self, points: np.ndarray) -> np.ndarray:
+        """Move world points to window coordinates
+
+        Args:
+            points (np.ndarray): (..., 2) points in the world
+
+        Returns:
+            np.ndarray: (..., 2) points in the window
+        """
+        return points - self.__offset
+
+    def visible(self, boxes: np.ndarray, margin: float = 0.0) -> np.ndarray:
+        """Check many bounding boxes with the view
+
+        Args:
+            boxes (np.ndarray): (n, 4) boxes in order min_x, max_x, min_y, max_y
+            margin (float): extra distance around the view that counts
+                            as visible, for objects that are drawn
+                            a bit away from their box
+
+        Returns:
+            np.ndarray: (n,) `True` where a box is in the view
+        """
+        min_x, max_x, min_y, max_y = self.get_view()
+
+        return ~((boxes[:, 1] < min_x - margin)
+                 | (boxes[:, 0] > max_x + margin)
+                 | (boxes[:, 3] < min_y - margin)
+                 | (boxes[:, 2] > max_y + margin))
+
+    def is_visible(self,
+                   box: Tuple[float, float, float, float],
+                   margin: float = 0.0) -> bool:
+        """Check one bounding box with the view
+
+        Args:
+            box (Tuple[float, float, float, float]): min_x, max_x, min_y, max_y
+            margin (float): extra distance around the view
+
+        Returns:
+            bool: `True` when box is in the view
+        """
+        min_x, max_x, min_y, max_y = self.get_view()
+
+        return not (box[1] < min_x - margin or box[0] > max_x + margin
+                    or box[3] < min_y - margin or box[2] > max_y + margin)
+
+    # Access data part
+    def get_offset(self) -> Tuple[float, float]:
+        """Get world position of top left of the window
+
+        Returns:
+            Tuple[float, float]: x and y of the offset
+        """
+        return self.__offset
+
+    def get_view(self) -> Tuple[float, float, float, float]:
+        """Get part of the world that the window shows
+
+        Returns:
+            Tuple[float, float, float, float]: min_x, max_x, min_y, max_y
+        """
+        x, y = self.__offset
+        return (x, x + self.__view_size[0], y, y + self.__view_size[1])
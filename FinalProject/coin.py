@@ -3,7 +3,7 @@
 import math
 
 from abc import ABC, abstractmethod
-from typing import Tuple
+from typing import Dict, List, Tuple
 from baseairplane import Airplane
 
 
@@ -15,6 +15,9 @@ class InterfaceCoin(ABC):
     Medthods:
         get_color(): Abstract medthod that shoud return color of that object
     """
+
+    __slots__ = ()
+
     @abstractmethod
     def get_color(self) -> Tuple[int, int, int]:
         """should get color of object"""
@@ -31,6 +34,7 @@ class Coin():
         _is_collected (bool): Whether the coin has been collected by the player.
 
     Methods:
+        reset(center, score, radius): Use this coin again as a new coin.
         is_colliding(other): Checks if this coin is colliding with another object.
         set_collected(): set attributes is_collected
         get_center(): get the center coordinates of the coin.
@@ -39,10 +43,27 @@ class Coin():
         get_collected(): Checks if the coin has been collected.
     """
 
+    # no __dict__ on every coin, see benchmark.bench_memory()
+    __slots__ = ("__center", "__score", "__radius", "_is_collected")
+
     def __init__(self,
                  center: Tuple[int | float, int | float],
                  score: int,
                  radius: int | float) -> None:
+        self.reset(center, score, radius)
+
+    def reset(self,
+              center: Tuple[int | float, int | float],
+              score: int,
+              radius: int | float) -> None:
+        """Set every attribute again, so a collected coin can be
+        used as a new coin without creating an object
+
+        Args:
+            center (Tuple[int | float, int | float]): center of coin
+            score (int): score of this coin
+            radius (int | float): radius of coin
+        """
         assert isinstance(center, tuple) \
                 and len(center) == 2 \
                 and all(isinstance(c, (int, float)) for c in center), \
@@ -131,6 +152,8 @@ class NormalCoin(Coin, InterfaceCoin):
     """
     YELLOW = (255, 222, 33)
 
+    __slots__ = ()
+
     def get_color(self) -> Tuple[int, int, int]:
         """get color
 
@@ -152,6 +175,8 @@ class InvincibleCoin(Coin, InterfaceCoin):
     """
     BLUE = (8, 143, 143)
 
+    __slots__ = ("effect",)
+
     def __init__(self, center, score, radius):
         super().__init__(center, score, radius)
         self.effect = "invincible"
@@ -185,6 +210,8 @@ class DeleteAllMissileCoin(Coin, InterfaceCoin):
     """
     RED = (250, 128, 114)
 
+    __slots__ = ("effect",)
+
     def __init__(self, center, score, radius):
         super().__init__(center, score, radius)
         self.effect = "BOOM"
@@ -209,10 +236,30 @@ class DeleteAllMissileCoin(Coin, InterfaceCoin):
 class CoinFactory:
     """Using Factory Pattern design to create different type of Coin
 
+    Coins that are given back with `release()` are kept by type
+    and reset for the next `create_coin()` of that type, a coin of
+    another class is only dropped.
+
+    Attributes:
+        COIN_TYPES (Dict[str, type]): class of every coin type
+
     Medthods:
         create_coin(): Create object coin in different type
+        release(): Keep a coin that is not used anymore
     """
 
+    COIN_TYPES = {
+        'normal': NormalCoin,
+        'invincible': InvincibleCoin,
+        'delete_missile': DeleteAllMissileCoin
+    }
+
+    def __init__(self) -> None:
+        # free coins of every class
+        self.__free: Dict[type, List[Coin]] = {
+            cls: [] for cls in self.COIN_TYPES.values()
+        }
+
     def create_coin(self,
                     coin_type: str,
                     center: Tuple[int, int],
@@ -238,13 +285,30 @@ class CoinFactory:
                 and all(isinstance(c, int) for c in center), \
                     f"center should be Tuple[int, int], but got {type(center)}"
 
-        coin_types = {
-            'normal': NormalCoin,
-            'invincible': InvincibleCoin,
-            'delete_missile': DeleteAllMissileCoin
-        }
-
-        if coin_type not in coin_types:
+        if coin_type not in self.COIN_TYPES:
             raise ValueError(f"Invalid coin type: {coin_type}")
 
-        return coin_types[coin_type](center, score, radius)
+        cls = self.COIN_TYPES[coin_type]
+        free = self.__free[cls]
+
+        if free:
+            coin = free.pop()
+            coin.reset(center, score, radius)
+            return coin
+
+        return cls(center, score, radius)
+
+    def release(self, coin: Coin) -> None:
+        """Keep a coin that is collected or removed, so the next
+        coin of its type reuses it. It must not be used after this
+
+        Args:
+            coin (Coin): coin that is not in the game anymore
+        """
+        assert isinstance(coin, Coin), \
+            f"coin should be Coin, but got {type(coin)}"
+
+        # only classes that create_coin() makes are used again
+        free = self.__free.get(type(coin))
+        if free is not None:
+            free.append(coin)
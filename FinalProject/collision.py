@@ -0,0 +1,470 @@
+"""
+    Module that contains the exact collision test of airplanes and
+    missiles, a separating axis test on their convex parts, a swept
+    test that finds when two moving shapes first touch in a tick, and
+    CollisionStats that counts how many pairs every stage rejects
+
+    numpy is imported only by the tests of many pairs, so airplanes
+    and coins can be imported without it.
+"""
+import math
+from typing import Dict, List, Sequence, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+# Shape of BaseAirplane is concave at its bottom point,
+# so it is split into two convex triangles of its points
+# Top, Bottom Left, Bottom  and  Top, Bottom, Bottom Right
+PARTS = ((0, 1, 2), (0, 2, 3))
+
+Point = Tuple[float, float]
+
+# Swept test takes samples so that no point of one shape moves more
+# than SWEEP_STEP * size of the smaller shape between two samples,
+# but at most MAX_SWEEP_SAMPLES, then finds time of impact between
+# the last two samples with at least BISECT_STEPS halvings,
+# SWEEP_BATCH samples of every pair are tested in one call
+SWEEP_STEP = 0.5
+MAX_SWEEP_SAMPLES = 32
+SWEEP_BATCH = 8
+BISECT_STEPS = 8
+
+
+class CollisionStats:
+    """Count pairs that every stage of collision test sees
+
+    A pair is first tested with bounding boxes, and only pairs whose
+    boxes overlap are tested with the separating axis test.
+
+    Attributes:
+        pairs (int): pairs that are tested
+        box_rejected (int): pairs that bounding boxes rejected
+        sat_rejected (int): pairs with overlapping boxes that
+                            separating axis test rejected
+        hits (int): pairs that collide
+
+    Medthods:
+        add(): count pairs of one test
+        reset(): set every counter to 0
+        get_stats(): get every counter
+    """
+
+    __slots__ = ("pairs", "box_rejected", "sat_rejected", "hits")
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def add(self, pairs: int, box_hits: int, hits: int) -> None:
+        """Count pairs of one test
+
+        Args:
+            pairs (int): pairs that are tested
+            box_hits (int): pairs whose bounding boxes overlap
+            hits (int): pairs that collide
+        """
+        self.pairs += pairs
+        self.box_rejected += pairs - box_hits
+        self.sat_rejected += box_hits - hits
+        self.hits += hits
+
+    def reset(self) -> None:
+        """Set every counter to 0"""
+        self.pairs = 0
+        self.box_rejected = 0
+        self.sat_rejected = 0
+        self.hits = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get every counter
+
+        Returns:
+            Dict[str, int]: pairs, box_rejected, sat_rejected and hits
+        """
+        return {
+            "pairs": self.pairs,
+            "box_rejected": self.box_rejected,
+            "sat_rejected": self.sat_rejected,
+            "hits": self.hits
+        }
+
+
+def convex_overlap(poly_a: Sequence[Point], poly_b: Sequence[Point]) -> bool:
+    """Separating axis test of two convex polygons
+
+    Two convex polygons do not touch only when there is an edge normal
+    of one of them where their projections do not overlap.
+
+    Args:
+        poly_a (Sequence[Point]): points of first polygon in order
+        poly_b (Sequence[Point]): points of second polygon in order
+
+    Returns:
+        bool: `True` when polygons overlap or touch
+    """
+    for poly in (poly_a, poly_b):
+        for i, (x1, y1) in enumerate(poly):
+            x2, y2 = poly[(i + 1) % len(poly)]
+
+            # normal of edge
+            ax = y1 - y2
+            ay = x2 - x1
+
+            proj_a = [x * ax + y * ay for x, y in poly_a]
+            proj_b = [x * ax + y * ay for x, y in poly_b]
+
+            if max(proj_a) < min(proj_b) or max(proj_b) < min(proj_a):
+                return False
+
+    return True
+
+
+def shapes_overlap(points_a: Sequence[Point],
+                   points_b: Sequence[Point]) -> bool:
+    """Exact test of two airplane shapes from `BaseAirplane.get_points()`
+
+    Args:
+        points_a (Sequence[Point]): 4 points of first shape
+        points_b (Sequence[Point]): 4 points of second shape
+
+    Returns:
+        bool: `True` when shapes overlap or touch
+    """
+    parts_a = [[points_a[i] for i in part] for part in PARTS]
+    parts_b = [[points_b[i] for i in part] for part in PARTS]
+
+    return any(convex_overlap(a, b) for a in parts_a for b in parts_b)
+
+
+def convex_overlap_many(polys_a: "np.ndarray",
+                        polys_b: "np.ndarray") -> "np.ndarray":
+    """Separating axis test of many pairs of convex polygons at once
+
+    Args:
+        polys_a (np.ndarray): (n, k, 2) first polygon of every pair
+        polys_b (np.ndarray): (n, m, 2) or (m, 2) second polygon
+
+    Returns:
+        np.ndarray: (n,) `True` where the pair overlaps or touches
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    polys_b = np.broadcast_to(polys_b, (len(polys_a),) + polys_b.shape[-2:])
+
+    # normal of every edge of both polygons
+    axes = []
+    for poly in (polys_a, polys_b):
+        edges = np.roll(poly, -1, axis=1) - poly
+        axes.append(np.stack((-edges[..., 1], edges[..., 0]), axis=-1))
+    axes = np.concatenate(axes, axis=1)
+
+    # (n, points, axes) projection of every point on every axis
+    proj_a = np.einsum("npd,nad->npa", polys_a, axes)
+    proj_b = np.einsum("npd,nad->npa", polys_b, axes)
+
+    separated = (proj_a.max(axis=1) < proj_b.min(axis=1)) \
+        | (proj_b.max(axis=1) < proj_a.min(axis=1))
+    return ~separated.any(axis=1)
+
+
+def shapes_overlap_many(points_a: "np.ndarray",
+                        points_b: "np.ndarray") -> "np.ndarray":
+    """Exact test of many pairs of airplane shapes at once
+
+    Args:
+        points_a (np.ndarray): (n, 4, 2) points of first shape of every pair
+        points_b (np.ndarray): (n, 4, 2) or (4, 2) points of second shape
+
+    Returns:
+        np.ndarray: (n,) `True` where the shapes overlap or touch
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    hit = np.zeros(len(points_a), dtype=bool)
+
+    for part_a in PARTS:
+        for part_b in PARTS:
+            # only pairs that are not found yet
+            todo = np.flatnonzero(~hit)
+            if len(todo) == 0:
+                return hit
+
+            b = points_b[todo][:, part_b] if points_b.ndim == 3 \
+                else points_b[list(part_b)]
+            hit[todo] = convex_overlap_many(points_a[todo][:, part_a], b)
+
+    return hit
+
+
+def narrow_phase(points_a: "np.ndarray",
+                 boxes_a: "np.ndarray",
+                 points_b: "np.ndarray",
+                 boxes_b: "np.ndarray",
+                 stats: CollisionStats | None = None) -> "np.ndarray":
+    """Test pairs with bounding boxes, then exact shapes only for pairs
+    whose boxes overlap
+
+    Args:
+        points_a (np.ndarray): (n, 4, 2) points of first shape of every pair
+        boxes_a (np.ndarray): (n, 4) bounding box of first shape
+        points_b (np.ndarray): (n, 4, 2) or (4, 2) points of second shape
+        boxes_b (np.ndarray): (n, 4) or (4,) bounding box of second shape
+        stats (CollisionStats | None): counts pairs of every stage
+
+    Returns:
+        np.ndarray: (n,) index of pairs that collide
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    # bounding boxes are cheap, they reject most pairs
+    box_hit = np.flatnonzero(boxes_overlap(boxes_a, boxes_b))
+
+    if points_b.ndim == 3:
+        points_b = points_b[box_hit]
+    hit = box_hit[shapes_overlap_many(points_a[box_hit], points_b)]
+
+    if stats is not None:
+        stats.add(len(boxes_a), len(box_hit), len(hit))
+
+    return hit
+
+
+def boxes_overlap(boxes_a: "np.ndarray",
+                  boxes_b: "np.ndarray") -> "np.ndarray":
+    """Check many bounding boxes at once, the first stage of
+    `BaseAirplane.is_colliding()`
+
+    Args:
+        boxes_a (np.ndarray): (n, 4) boxes in order min_x, max_x, min_y, max_y
+        boxes_b (np.ndarray): (n, 4) or (4,) boxes to check with boxes_a
+
+    Returns:
+        np.ndarray: (n,) `True` where the two boxes intercept each other
+    """
+    return ~((boxes_a[..., 1] < boxes_b[..., 0])
+             | (boxes_b[..., 1] < boxes_a[..., 0])
+             | (boxes_a[..., 3] < boxes_b[..., 2])
+             | (boxes_b[..., 3] < boxes_a[..., 2]))
+
+
+def transform_shapes(shape: "np.ndarray",
+                     centers: "np.ndarray",
+                     turns: "np.ndarray",
+                     sizes: "np.ndarray") -> "np.ndarray":
+    """Get points of many shapes that are turned and moved from a template
+
+    Args:
+        shape (np.ndarray): (k, 2) points of size 1 template
+        centers (np.ndarray): (n, 2) center of every shape
+        turns (np.ndarray): (n,) angle in radian from the template
+        sizes (np.ndarray): (n,) size of every shape
+
+    Returns:
+        np.ndarray: (n, k, 2) points of every shape
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    cos_t = np.cos(turns)[:, None]
+    sin_t = np.sin(turns)[:, None]
+
+    local_x = shape[None, :, 0] * sizes[:, None]
+    local_y = shape[None, :, 1] * sizes[:, None]
+
+    points = np.empty((len(centers), len(shape), 2))
+    points[:, :, 0] = local_x * cos_t - local_y * sin_t + centers[:, 0, None]
+    points[:, :, 1] = local_x * sin_t + local_y * cos_t + centers[:, 1, None]
+    return points
+
+
+def swept_narrow_phase(shape: "np.ndarray",
+                       start_a: Tuple["np.ndarray", "np.ndarray"],
+                       end_a: Tuple["np.ndarray", "np.ndarray"],
+                       sizes_a: "np.ndarray",
+                       start_b: Tuple["np.ndarray", "np.ndarray"],
+                       end_b: Tuple["np.ndarray", "np.ndarray"],
+                       sizes_b: "np.ndarray | float",
+                       stats: CollisionStats | None = None
+                       ) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Test pairs of shapes that move and turn during one tick, and get
+    the first time in the tick that each pair touches
+
+    Every shape moves in a straight line and turns the shortest way
+    from its start to its end. A pair is first tested with circles
+    around the shapes, they are swept exactly and give the part of the
+    tick where the shapes can touch. Only in that part the real shapes
+    are tested at samples that are close enough that a point does not
+    jump over a shape, so fast objects cannot pass through each other.
+
+    Args:
+        shape (np.ndarray): (k, 2) points of size 1 template
+        start_a (Tuple[np.ndarray, np.ndarray]): (n, 2) centers and (n,)
+                                                 turns from template of
+                                                 first shapes at start
+        end_a (Tuple[np.ndarray, np.ndarray]): same at end of tick
+        sizes_a (np.ndarray): (n,) size of first shapes
+        start_b (Tuple[np.ndarray, np.ndarray]): (n, 2) and (n,), or (2,)
+                                                 and one turn for one
+                                                 shape against every
+                                                 first shape
+        end_b (Tuple[np.ndarray, np.ndarray]): same at end of tick
+        sizes_b (np.ndarray | float): (n,) or one size of second shapes
+        stats (CollisionStats | None): counts pairs of every stage,
+                                       circles are the box stage
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: index of pairs that collide and
+                                       time of impact of each, 0 is
+                                       start and 1 is end of the tick
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    n = len(sizes_a)
+    move_a = end_a[0] - start_a[0]
+    move_b = end_b[0] - start_b[0]
+
+    # circle around a shape holds it in every heading
+    reach = float(np.hypot(shape[:, 0], shape[:, 1]).max())
+
+    # |gap + motion * t| = radius, for t in [0, 1],
+    # one second shape is broadcast against every first shape
+    gap = start_a[0] - start_b[0]
+    motion = move_a - move_b
+    a = (motion * motion).sum(axis=1)
+    b = 2 * (gap * motion).sum(axis=1)
+    c = (gap * gap).sum(axis=1) - (reach * (sizes_a + sizes_b)) ** 2
+    disc = b * b - 4 * a * c
+
+    moving = a > 0
+    root = np.sqrt(np.maximum(disc, 0))
+    double_a = np.where(moving, 2 * a, 1)
+    enter = np.where(c <= 0, 0, (-b - root) / double_a)
+    leave = np.where(moving, (-b + root) / double_a, 1)
+
+    touch = (c <= 0) | (moving & (disc >= 0) & (enter <= 1) & (leave >= 0))
+    candidates = np.flatnonzero(touch)
+
+    # circles reject almost every pair
+    if len(candidates) == 0:
+        if stats is not None:
+            stats.add(n, 0, 0)
+        return candidates, np.empty(0)
+
+    # from here only candidates are kept, row i is candidates[i]
+    def take(values: "np.ndarray", shape_of_row: tuple) -> "np.ndarray":
+        """Get rows of candidates, one second shape is repeated"""
+        return np.broadcast_to(values, (n,) + shape_of_row)[candidates]
+
+    centers_a, turns_a = take(start_a[0], (2,)), take(start_a[1], ())
+    centers_b, turns_b = take(start_b[0], (2,)), take(start_b[1], ())
+    move_a, move_b = take(move_a, (2,)), take(move_b, (2,))
+    spin_a = _shortest_turn(take(end_a[1], ()) - turns_a)
+    spin_b = _shortest_turn(take(end_b[1], ()) - turns_b)
+    sizes_a, sizes_b = take(sizes_a, ()), take(sizes_b, ())
+
+    def overlap(rows: "np.ndarray", t: "np.ndarray") -> "np.ndarray":
+        """Test real shapes of pairs at time t, boxes first"""
+        points_a = transform_shapes(
+            shape, centers_a[rows] + move_a[rows] * t[:, None],
+            turns_a[rows] + spin_a[rows] * t, sizes_a[rows])
+        points_b = transform_shapes(
+            shape, centers_b[rows] + move_b[rows] * t[:, None],
+            turns_b[rows] + spin_b[rows] * t, sizes_b[rows])
+
+        hit = boxes_overlap(_boxes(points_a), _boxes(points_b))
+        box_hit = np.flatnonzero(hit)
+        hit[box_hit] = shapes_overlap_many(points_a[box_hit],
+                                           points_b[box_hit])
+        return hit
+
+    # most that a point of one shape moves against the other in a tick
+    travel = np.sqrt(a[candidates]) \
+        + (np.abs(spin_a) * sizes_a + np.abs(spin_b) * sizes_b) * reach
+
+    start = np.clip(enter[candidates], 0, 1)
+    span = np.clip(leave[candidates], 0, 1) - start
+    step = SWEEP_STEP * np.minimum(sizes_a, sizes_b)
+    samples = np.clip(np.ceil(span * travel / step),
+                      1, MAX_SWEEP_SAMPLES).astype(np.intp)
+
+    # first sample of every pair that touches, -1 is not found yet
+    first = np.full(len(candidates), -1)
+    offsets = np.arange(SWEEP_BATCH)
+    for i in range(0, int(samples.max(initial=0)) + 1, SWEEP_BATCH):
+        todo = np.flatnonzero((first < 0) & (samples >= i))
+        if len(todo) == 0:
+            break
+
+        rows = np.repeat(todo, SWEEP_BATCH)
+        index = np.tile(offsets + i, len(todo))
+        keep = index <= samples[rows]
+        rows, index = rows[keep], index[keep]
+
+        t = start[rows] + span[rows] * (index / samples[rows])
+        hit = overlap(rows, t)
+
+        # rows are in order of pair and sample, so the first row
+        # of a pair that hits is its first sample that touches
+        pairs, at = np.unique(rows[hit], return_index=True)
+        first[pairs] = index[hit][at]
+
+    found = np.flatnonzero(first >= 0)
+
+    # time of impact is between last sample that misses and first hit
+    high = start[found] + span[found] * (first[found] / samples[found])
+    low = start[found] + span[found] * (np.maximum(first[found] - 1, 0)
+                                        / samples[found])
+    bisect = np.flatnonzero(first[found] > 0)
+
+    # every round cuts the range in SWEEP_BATCH parts and tests every
+    # cut in one call, it is log2(SWEEP_BATCH) halvings in one round
+    cuts = np.tile(offsets[1:], len(bisect))
+    pair = np.repeat(np.arange(len(bisect)), SWEEP_BATCH - 1)
+    rounds = math.ceil(BISECT_STEPS / math.log2(SWEEP_BATCH)) \
+        if len(bisect) else 0
+
+    for _ in range(rounds):
+        width = (high[bisect] - low[bisect]) / SWEEP_BATCH
+        t = low[bisect][pair] + width[pair] * cuts
+        hit = overlap(found[bisect][pair], t)
+
+        # first cut that touches, or the end when no cut touches
+        cut = np.full(len(bisect), SWEEP_BATCH)
+        touched, at = np.unique(pair[hit], return_index=True)
+        cut[touched] = cuts[hit][at]
+
+        high[bisect] = low[bisect] + width * cut
+        low[bisect] += width * (cut - 1)
+
+    if stats is not None:
+        stats.add(n, len(candidates), len(found))
+
+    return candidates[found], high
+
+
+def _boxes(points: "np.ndarray") -> "np.ndarray":
+    """Get (n, 4) bounding boxes of (n, k, 2) points"""
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    low = points.min(axis=1)
+    high = points.max(axis=1)
+    return np.stack((low[:, 0], high[:, 0], low[:, 1], high[:, 1]), axis=1)
+
+
+def _shortest_turn(turn: "np.ndarray") -> "np.ndarray":
+    """Get same turn in range [-pi, pi)"""
+    return (turn + math.pi) % (2 * math.pi) - math.pi
+
+
+def bounding_box(points: List[Point]) -> Tuple[float, float, float, float]:
+    """Get bounding box of points
+
+    Args:
+        points (List[Point]): points of a shape
+
+    Returns:
+        Tuple[float, float, float, float]: min_x, max_x, min_y, max_y
+    """
+    xs = [x for x, _ in points]
+    ys = [y for _, y in points]
+    return min(xs), max(xs), min(ys), max(ys)
@@ -1,6 +1,7 @@
 """ modules that cotains All of interface in game """
 
-from typing import Tuple
+from collections import OrderedDict
+from typing import Dict, Tuple
 
 import pygame
 
@@ -10,14 +11,25 @@ class UserInterface:
 
     Attributes:
         screen (pygame.Surface): Surface of pygame
-        title_font: font size 74 use for title
-        menu_font: font size 48 use for menu
-        hud_font: font size 36 use for othertext
+        FONT_SIZES (Dict[str, int]): font size of every style,
+                                     title 74, menu 48, hud 36 for
+                                     othertext and small 22 for debug overlay
+        CACHE_SIZE (int): max number of rendered texts that are kept
 
     Medthods:
         draw_text(): draw a text
+        get_cache_stats(): get hits and misses of text cache
+        clear_cache(): remove every rendered text from cache
     """
 
+    FONT_SIZES = {
+        "title": 74,
+        "menu": 48,
+        "hud": 36,
+        "small": 22
+    }
+    CACHE_SIZE = 128
+
     def __init__(self, screen: pygame.Surface) -> None:
 
         assert isinstance(screen, pygame.Surface), \
@@ -25,32 +37,67 @@ class UserInterface:
 
         self.__screen = screen
 
-        pygame.font.init()
-        self.__title_font = pygame.font.Font(None, 74)
-        self.__menu_font = pygame.font.Font(None, 48)
-        self.__hud_font = pygame.font.Font(None, 36)
+        # font is loaded when its style is drawn the first time,
+        # so game does not wait for fonts that it does not show yet
+        self.__fonts: Dict[str, pygame.font.Font] = {}
+
+        # rendered text surface by (text, style, text_col, antialias)
+        # most recently used is at the end
+        self.__cache = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
 
     def draw_text(self,
                   text: str,
                   style: str,
                   text_col: Tuple[int, int, int],
-                  pos: Tuple[float | int, float | int]) -> None:
+                  pos: Tuple[float | int, float | int],
+                  antialias: bool = True) -> pygame.Rect | None:
         """draw a text on screen
 
+        Text is rendered only the first time, after that the surface
+        is taken from cache and just blit on screen.
+
         Args:
             text (str): string that want to draw
             style (str): choose size of font according to attributes
             text_col (Tuple[int, int, int]): color of text in rgb
             pos (Tuple[float | int, float | int]): position of text
+            antialias (bool): draw smooth edge of text
 
         Returns:
-            None: nothing
+            pygame.Rect | None: area that text is drawn,
+                                `None` when it cannot draw
         """
+        key = (text, style, text_col, antialias)
+
+        try:
+            img = self.__cache.get(key)
+
+            if img is None:
+                img = self.__render(text, style, text_col, antialias)
+            else:
+                self.__hits += 1
+                self.__cache.move_to_end(key)
+
+            return self.__screen.blit(img, pos)
+        except Exception as e:
+            print(f"Error to draw Text: {e}")
+            return None
+
+    def __render(self,
+                 text: str,
+                 style: str,
+                 text_col: Tuple[int, int, int],
+                 antialias: bool) -> pygame.Surface:
+        """render text and keep it in cache, drop the least recently
+        used one when cache is full"""
         assert isinstance(text, str), f"text should be str, but got {
             type(text)}"
 
-        assert isinstance(style, str) and style in ["menu", "title", "hud"], \
-            f"style should be str and Must be menu, titile or hud, but got {type(style)}"
+        assert isinstance(style, str) and style in self.FONT_SIZES, \
+            f"style should be str and Must be menu, titile, hud or small, " \
+            f"but got {type(style)}"
 
         assert isinstance(text_col, tuple) and \
             len(text_col) == 3 and \
@@ -58,16 +105,30 @@ class UserInterface:
             f"text_col should be Tuple[int, int, int], but got {
                 type(text_col)}"
 
-        font = None
-        if style == "menu":
-            font = self.__menu_font
-        elif style == "title":
-            font = self.__title_font
-        elif style == "hud":
-            font = self.__hud_font
+        font = self.__fonts.get(style)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = self.__fonts[style] = pygame.font.Font(
+                None, self.FONT_SIZES[style])
 
-        try:
-            img = font.render(text, True, text_col)
-            self.__screen.blit(img, pos)
-        except Exception as e:
-            print(f"Error to draw Text: {e}")
+        img = font.render(text, antialias, text_col)
+        self.__misses += 1
+
+        self.__cache[(text, style, text_col, antialias)] = img
+        if len(self.__cache) > self.CACHE_SIZE:
+            self.__cache.popitem(last=False)
+
+        return img
+
+    def get_cache_stats(self) -> Tuple[int, int]:
+        """get how many times text was found in cache
+
+        Returns:
+            Tuple[int, int]: hits and misses of cache
+        """
+        return self.__hits, self.__misses
+
+    def clear_cache(self) -> None:
+        """remove every rendered text from cache"""
+        self.__cache.clear()
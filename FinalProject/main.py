@@ -1,100 +1,92 @@
 """Final project -> intro_to_python 2"""
 
-import random
+import argparse
 import json
 import os
 from typing import List
 
+import numpy as np
 import pygame
 from baseairplane import Airplane, Missile
+from camera import Camera
 from interface import UserInterface
-from coin import Coin, CoinFactory
+from simulation import (Simulation, INPUT_LEFT, INPUT_RIGHT,
+                        INPUT_START, INPUT_RESTART)
+from profiler import FrameProfiler, PHASES, PHASE_DRAW, PHASE_PRESENT
+from replay import ReplayWriter, new_seed
+from scorelog import ScoreLog
+from sprites import SpriteCache
 
 
-class Game:
-    """The Game is the main loop of game. it contains a lot of logical of 
-    this game behind of it
+class Game(Simulation):
+    """The Game is the main loop of game. The logic of this game is in
+    Simulation, Game adds display, input and text on top of it
 
     Attributes:
         WHITE, BLUE, RED, BLACK, YELLOW (tuple): Color constants for drawing.
 
-        SCREEN_WIDTH (int): Width of the game screen.
-
-        SCREEN_HEIGHT (int): Height of the game screen.
-
         DISPLAY_SIZE (tuple): Screen dimensions as a tuple of width and height.
 
-        MISSILE_SPAWN_TIME (int): Time interval (in seconds) 
-                                  between missile spawns.
-
-        MAX_MISSILES (int): Maximum number of missiles allowed on screen.
+        MAX_DIRTY_RECTS (int): Above this number of changed areas
+                               the whole window is presented instead.
 
-        SPAWN_POSITION (list of tuples): Predefined missile spawn positions 
-                                         around the screen.
+        FRAME_RATE (int): Most frames drawn per second, 0 is no limit.
+                          Game runs at TICK_RATE whatever this is.
 
-        AIRPLANE_SIZE (int): Size of the player's airplane.
+        MAX_FRAME_TIME (float): Longest frame time (in seconds) that is
+                                simulated, like after window was dragged.
 
-        AIRPLANE_SPEED (int): Speed of the airplane.
+        PROFILE_REFRESH (int): Frames between updates of profile overlay.
 
-        AIRPLANE_ROTATION_ANGLE (int): Angle (in degrees) the airplane 
-                                       rotates per input.
+        PROFILE_PATH (str): File name without extension that F4 saves
+                            frame timing to, as .csv and .json.
 
-        AIRPLANE_EFFECT_TIME (int): Duration for which temporary 
-                                    effects last on the airplane.
+        SCORE_LOG_PATH (str): File that every finished run is appended to.
 
-        MISSILE_SIZE (int): Size of each missile.
+        CULL_MARGIN (int): Distance around the window where objects are
+                           still drawn, they are culled with the box of
+                           current tick but drawn between two ticks.
 
-        MISSILE_SPEED (int): Starting speed of missiles.
+        camera (Camera): Part of the world that the window shows,
+                         it follows the player.
 
-        MISSILE_ACCELERATION (float): Rate at which missile speed increases.
+        screen (pygame.Surface | None): Surface that game draws on,
+                                        `None` until the window is opened.
 
-        MISSILE_MAX_SPEED (float): Maximum speed a missile can achieve.
+        ui (UserInterface | None): Text drawing, fonts load on first use.
 
-        MISSLIE_MAX_TURN_RATE (int): Maximum rate (in degrees) 
-                                     at which a missile can turn.
+        sprites (SpriteCache | None): Pre-rendered missiles and coins.
 
-        COIN_SPAWN_TIME (int): Time interval (in seconds) between coin spawns.
-
-        COIN_SCORE (int): Score increment for collecting a coin.
-
-        COIN_RADIUS (int): Radius of each coin.
+        score_log (ScoreLog | None): History of finished runs, it is
+                                     opened when main loop starts.
 
     Methods:
-        set_player(player): Sets the player (Airplane) object.
-
-        set_missiles(missiles): Sets the list of missiles in the game.
-
-        set_coin(coin): Sets the list of coins in the game.
+        init_display(): Opens the window, text UI and sprites on first use.
 
         run_main(): Runs the main game loop, updating the screen 
                     and handling inputs.
 
-        reset(): Resets the game state after the player dies, 
-                 preparing for a new session.
+        read_inputs(): Packs pressed keys into inputs of Simulation.step().
 
-        update_positions(dt): Updates the positions of player and missiles 
-                              based on elapsed time.
+        render(): Erases last frame and draws texts and objects
+                  of the current state.
 
-        draw(): Draws the player, missiles, and coins onto the screen.
+        present(rects): Shows only changed areas of the screen.
 
-        check_collision(): Checks for collisions between the player, 
-                           missiles, and coins.
+        toggle_profiler(): Starts or stops frame timing and its overlay (F3).
 
-        spwan_missiles(): Spawns new missiles at random positions 
-                          if the spawn interval has passed.
+        dump_profile(): Saves frame timing as CSV and JSON (F4).
 
-        increase_score_misslie(): Increases the score based on 
-                                  missile count changes.
+        draw_profile(): Draws time of every phase at top right.
 
-        spawn_coin(): Spawns a coin of a random type at a random position 
-                      if the spawn interval has passed.
+        draw(): Draws the player, missiles, and coins onto the screen.
 
         save_high_score(): Saves the current high score to a JSON file.
 
-        load_high_score(): Loads the high score from a JSON file.
+        load_high_score(): Loads the high score from a JSON file
+                           and the score log.
 
-        reset_effect_time(): Resets temporary player effects 
-                             if the effect duration has ended.
+        log_run(): Adds a finished run to the score log once.
     """
 
     # Color
@@ -105,108 +97,84 @@ class Game:
     YELLOW = (255, 222, 33)
 
     # Constant value
-    SCREEN_WIDTH = 800
-    SCREEN_HEIGHT = 600
-    DISPLAY_SIZE = (SCREEN_WIDTH, SCREEN_HEIGHT)
-
-    # Constant for Airplane
-    AIRPLANE_SIZE = 8
-    AIRPLANE_SPEED = 6
-    AIRPLANE_ROTATION_ANGLE = 7  # degrees per second
-    AIRPLANE_EFFECT_TIME = 3
-
-    # Constant for Missile
-    MISSILE_SIZE = 5
-    MISSILE_SPEED = 6
-    MISSILE_ACCELERATION = 0.1
-    MISSILE_MAX_SPEED = 6.5
-    MISSLIE_MAX_TURN_RATE = 3.5  # degrees per second
-
-    # Constant for Coin
-    COIN_SPAWN_TIME = 4
-    COIN_SCORE = 5
-    COIN_RADIUS = 15
-
-    # Missile generation constant
-    MISSILE_SPAWN_TIME = 3.5  # Seconds between spawns
-    MAX_MISSILES = 4
-    SPAWN_POSITION = [
-        (0, 0),
-        (SCREEN_WIDTH, 0),
-        (0, SCREEN_HEIGHT),
-        (SCREEN_WIDTH, SCREEN_HEIGHT),
-        (SCREEN_WIDTH/2, 0),
-        (SCREEN_WIDTH/2, SCREEN_HEIGHT),
-        (0, SCREEN_HEIGHT/2),
-        (SCREEN_WIDTH, SCREEN_HEIGHT/2)
-    ]
-
-    def __init__(self) -> None:
+    DISPLAY_SIZE = (Simulation.SCREEN_WIDTH, Simulation.SCREEN_HEIGHT)
+    MAX_DIRTY_RECTS = 256
+    FRAME_RATE = 144
+    MAX_FRAME_TIME = 0.25
+    PROFILE_REFRESH = 30
+    PROFILE_PATH = "./frame_profile"
+    CULL_MARGIN = 16
+    SCORE_LOG_PATH = "./scores.log"
+
+    def __init__(self,
+                 screen: pygame.Surface | None = None,
+                 tick_rate: int | float = Simulation.TICK_RATE,
+                 seed: int | None = None) -> None:
+        # simulation time moves by fixed ticks, not by real time
+        super().__init__(tick_rate=tick_rate, seed=seed)
+
         # Game setup
-        self.screen = pygame.display.set_mode(self.DISPLAY_SIZE)
-        self.clock = pygame.time.Clock()
-
-        # Main object
-        self.missiles = []
-        self.player = None
-        self.coin = []
-
-        # Factory
-        self.coin_factory = CoinFactory()
-
-        # State
-        self.last_spawn_missile = 0
-        self.last_spawn_coin = 0
-        self.last_num = 0
-        self.high_score = 0
-        self.score = 0
-        self.state = "menu"
+        # screen can be given to draw on an offscreen surface,
+        # otherwise window is opened by init_display() on first frame
+        self.screen = screen
+        self.clock_fps = pygame.time.Clock()
         self.running = True
-        self.player_effect = ""
-        self.effect_time_start = 0
 
-        # Simple Text UI
-        self.ui = UserInterface(self.screen)
+        # Dirty rectangles
+        # areas that were drawn last frame, they are erased next frame
+        self.prev_rects = []
+        self.drawn_state = None
+        self.full_redraw = True
 
-    # Set data
-    def set_player(self, player: Airplane) -> None:
-        """set player of this game
+        # Frame timing, it is recorded only after F3 is pressed
+        self.frame_profiler = FrameProfiler()
+        self.profile_lines = []
+        self.profile_frame = 0
 
-        Args:
-            player (Airplane): The airplane object representing the player
-        """
-        assert isinstance(player, Airplane), \
-            f"player should be Airplane, but got {type(player)}"
+        # Simple Text UI and sprites of missiles and coins,
+        # they need the screen so they are made with it
+        self.ui = None
+        self.sprites = None
 
-        self.player = player
+        # Score history, finished run is logged once when player died
+        self.score_log = None
+        self.run_logged = False
 
-    def set_missiles(self, missiles: List[Missile]) -> None:
-        """
-        Sets the list of missiles in the game.
+        # World is larger than window, only what camera sees is drawn
+        self.camera = Camera((self.WORLD_WIDTH, self.WORLD_HEIGHT),
+                             self.DISPLAY_SIZE)
 
-        Args:
-            missiles (List[Missile]): A list of Missile objects in the game.
-        """
-        assert isinstance(missiles, list) and \
-            all(isinstance(m, Missile) for m in missiles), \
-            f"missiles should be List[Missile], but got {type(missiles)}"
-        self.missiles = missiles
+        if screen is not None:
+            self.init_display()
 
-    def set_coin(self, coins: List[Coin]) -> None:
-        """Sets the list of coins in the game.
+    def init_display(self) -> pygame.Surface:
+        """Open the window, text UI and sprite cache if they are not yet
 
-        Args:
-            coin (List[Coin]): A list of Coin objects in the game.
+        Nothing is opened in __init__, so a Game that is only stepped
+        never waits for the window and the first frame does it once.
+
+        Returns:
+            pygame.Surface: surface that game draws on
         """
-        assert isinstance(coins, list) and \
-            all(isinstance(c, Coin) for c in coins), \
-            f"Coin should be List[Coin], but got {type(coins)}"
-        self.coin = coins
+        if self.screen is None:
+            if not pygame.display.get_init():
+                pygame.display.init()
+            self.screen = pygame.display.set_mode(self.DISPLAY_SIZE)
+
+        if self.ui is None:
+            self.ui = UserInterface(self.screen)
+
+            # Missiles and coins are blit from sprites that are rendered once
+            self.sprites = SpriteCache(self.screen)
+
+        return self.screen
 
     def run_main(self) -> None:
         """Run main game loop"""
+        self.init_display()
 
         # Load Latest high_score
+        self.score_log = ScoreLog(self.SCORE_LOG_PATH)
         self.load_high_score()
 
         while self.running:
@@ -215,301 +183,324 @@ class Game:
                 if event.type == pygame.QUIT:
                     self.running = False
 
+                # window was covered, we have to show everything again
+                elif event.type == pygame.VIDEOEXPOSE:
+                    self.full_redraw = True
+
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_F3:
+                        self.toggle_profiler()
+                    elif event.key == pygame.K_F4:
+                        self.dump_profile()
+
             # get different in frame
-            dt = self.clock.tick(60) / 1000.0  # 60 FPS
+            frame_time = self.clock_fps.tick(self.FRAME_RATE) / 1000.0
+            frame_time = min(frame_time, self.MAX_FRAME_TIME)
+
+            prof = self.profiler
+            if prof is not None:
+                prof.begin_frame()
+
+            # run fixed ticks with key of player
+            alpha = self.advance_frame(frame_time, self.read_inputs())
+
+            # replay is over, keep its last frame
+            if self.replay is not None and self.replay.is_finished():
+                self.running = False
+
+            self.log_run()
+
+            # draw between last two ticks and update display
+            # only where it changed
+            if prof is not None:
+                prof.start()
+
+            rects = self.render(alpha)
+            if prof is not None:
+                prof.lap(PHASE_DRAW)
+
+            self.present(rects)
+            if prof is not None:
+                prof.lap(PHASE_PRESENT)
+                prof.end_frame()
+
+        # Save_score before quit, a replay is not a new score
+        if self.recorder is not None:
+            self.recorder.close(self.score)
+        if self.replay is None:
+            self.save_high_score()
+        self.score_log.close()
+        pygame.quit()
+
+    def log_run(self) -> None:
+        """Add the run to score log once when player died,
+        it does not wait for the disk"""
+        if self.state != "died":
+            self.run_logged = False
+            return
+
+        if self.run_logged or self.replay is not None:
+            return
+
+        self.score_log.add(self.score, self.coins_collected,
+                           self.missiles_dodged)
+        self.run_logged = True
+
+    def read_inputs(self) -> int:
+        """Read pressed keys and pack them for Simulation.step()
+
+        Returns:
+            int: pressed keys packed in bits
+        """
+        key = pygame.key.get_pressed()
+        inputs = 0
+
+        if key[pygame.K_a]:
+            inputs |= INPUT_LEFT
+        if key[pygame.K_d]:
+            inputs |= INPUT_RIGHT
+        if key[pygame.K_p]:
+            inputs |= INPUT_START
+        if key[pygame.K_r]:
+            inputs |= INPUT_RESTART
+
+        return inputs
 
+    def render(self, alpha: float = 1.0) -> List[pygame.Rect]:
+        """Erase last frame and draw the current state
+
+        Only areas that were drawn last frame are filled with background,
+        unless the state changes then whole screen is cleared.
+
+        Args:
+            alpha (float): how far between last two ticks to draw
+
+        Returns:
+            List[pygame.Rect]: areas that are drawn in this frame
+        """
+        self.init_display()
+
+        if self.state != self.drawn_state:
             self.screen.fill(self.WHITE)
+            self.drawn_state = self.state
+            self.full_redraw = True
+        else:
+            for rect in self.prev_rects:
+                self.screen.fill(self.WHITE, rect)
 
-            # get key from player
-            key = pygame.key.get_pressed()
+        rects = []
 
-            # if player died always change state to died
-            if not self.player.get_alive():
-                self.state = "died"
-
-            # State menu
-            if self.state == "menu":
-
-                # draw text
-                self.ui.draw_text("Airplane",
-                                  "title",
-                                  self.BLACK,
-                                  (self.SCREEN_WIDTH/2 - 100, self.SCREEN_HEIGHT/5))
-
-                self.ui.draw_text("Press P to start",
-                                  "menu",
-                                  self.BLACK,
-                                  (self.SCREEN_WIDTH/2 - 125, self.SCREEN_HEIGHT/2 + 100))
-
-                # When player press P and change to new state
-                if key[pygame.K_p]:
-                    self.state = "playing"
-
-                    # set time
-                    self.last_spawn_missile = pygame.time.get_ticks() / 1000
-                    self.last_spawn_coin = pygame.time.get_ticks() / 1000
-
-            # playing state
-            elif self.state == "playing":
-
-                # chceck input whether a or d
-                if key[pygame.K_d]:
-                    self.player.rotation_points(self.AIRPLANE_ROTATION_ANGLE)
-                elif key[pygame.K_a]:
-                    self.player.rotation_points(-self.AIRPLANE_ROTATION_ANGLE)
-
-                self.ui.draw_text(f"score: {self.score}",
-                                  "hud",
-                                  self.BLACK,
-                                  (0, 0))
-
-                # update all of object in game
-                self.spwan_missiles()
-                self.spawn_coin()
-                self.update_positions(dt)
-                self.check_colision()
-                self.increase_score_misslie()
-                self.draw()
-
-            # State Died
-            elif self.state == "died":
-
-                # Draw texts
-                self.ui.draw_text("You died!", "title", self.RED,
-                                  (self.SCREEN_WIDTH/2 - 125, 100))
-
-                self.ui.draw_text(f"Your score is: {max(self.score - 1, 0)}",
-                                  "hud",
-                                  self.BLACK,
-                                  (self.SCREEN_WIDTH/2 - 100, self.SCREEN_HEIGHT/2))
-
-                self.ui.draw_text(f"Your high score is: {self.high_score}",
-                                  "hud",
-                                  self.BLACK,
-                                  (self.SCREEN_WIDTH/2 - 125, self.SCREEN_HEIGHT/2 + 50))
-
-                self.ui.draw_text("Press R to restart",
-                                  "hud",
-                                  self.BLACK,
-                                  (self.SCREEN_WIDTH/2 - 100, self.SCREEN_HEIGHT/2 + 100))
-
-                self.high_score = max(self.high_score, self.score, 0)
-
-                # Check player preesed R
-                if key[pygame.K_r]:
-                    self.reset()
-
-            # Update display
-            pygame.display.update()
+        # State menu
+        if self.state == "menu":
 
-        # Save_score before quit
-        self.save_high_score()
-        pygame.quit()
+            # draw text
+            rects.append(self.ui.draw_text(
+                "Airplane", "title", self.BLACK,
+                (self.SCREEN_WIDTH/2 - 100, self.SCREEN_HEIGHT/5)))
+
+            rects.append(self.ui.draw_text(
+                "Press P to start", "menu", self.BLACK,
+                (self.SCREEN_WIDTH/2 - 125, self.SCREEN_HEIGHT/2 + 100)))
+
+        # playing state
+        elif self.state == "playing":
 
-    def reset(self) -> None:
-        """Resets the game state after the player dies."""
-        self.state = "menu"
-        self.player.set_is_alive(True)
-        self.score = 0
+            rects.append(self.ui.draw_text(f"score: {self.score}",
+                                           "hud",
+                                           self.BLACK,
+                                           (0, 0)))
 
-        self.set_missiles([])
-        self.set_coin([])
-        self.set_player(Airplane(
-                        size=self.AIRPLANE_SIZE,
-                        center=(self.SCREEN_WIDTH/2, self.SCREEN_HEIGHT/2),
-                        speed=self.AIRPLANE_SPEED))
+            rects.extend(self.draw(alpha))
 
-        # set new time
-        self.last_num = 0
-        self.last_spawn_missile = pygame.time.get_ticks() / 1000
-        self.last_spawn_coin = pygame.time.get_ticks() / 1000
+        # State Died
+        elif self.state == "died":
 
-    def update_positions(self, dt: float) -> None:
-        """Updates the positions of the player and missiles based on 
-        the elapsed time since the last frame.
+            # Draw texts
+            rects.append(self.ui.draw_text("You died!", "title", self.RED,
+                                           (self.SCREEN_WIDTH/2 - 125, 100)))
+
+            rects.append(self.ui.draw_text(
+                f"Your score is: {max(self.score - 1, 0)}", "hud", self.BLACK,
+                (self.SCREEN_WIDTH/2 - 100, self.SCREEN_HEIGHT/2)))
+
+            rects.append(self.ui.draw_text(
+                f"Your high score is: {self.high_score}", "hud", self.BLACK,
+                (self.SCREEN_WIDTH/2 - 125, self.SCREEN_HEIGHT/2 + 50)))
+
+            rects.append(self.ui.draw_text(
+                "Press R to restart", "hud", self.BLACK,
+                (self.SCREEN_WIDTH/2 - 100, self.SCREEN_HEIGHT/2 + 100)))
+
+        if self.profiler is not None:
+            rects.extend(self.draw_profile())
+
+        # text that failed to draw has no area
+        return [r for r in rects if r is not None]
+
+    def present(self, rects: List[pygame.Rect]) -> None:
+        """Update display once, only areas that were erased or drawn
 
         Args:
-            dt (float): The delta time (in seconds) since the last frame update.
+            rects (List[pygame.Rect]): areas that are drawn in this frame
         """
-        assert isinstance(dt, float), f"dt should be float, but got {type(dt)}"
+        dirty = self.prev_rects + rects
 
-        # cannot find object player
-        if not self.player:
-            return
+        if self.full_redraw or len(dirty) > self.MAX_DIRTY_RECTS:
+            pygame.display.update()
+        else:
+            pygame.display.update(dirty)
 
-        # Player need no argument
-        self.player.move_forward()
+        self.prev_rects = rects
+        self.full_redraw = False
 
-        # Update every missiles need dt for acceleration
-        for m in self.missiles:
-            try:
-                m.rotation_to_target(self.player)
-                m.update(dt)
-            except Exception as e:
-                print(f"Error updating missile: {e}")
+    def toggle_profiler(self) -> None:
+        """Start or stop recording frame timing and showing its overlay"""
+        if self.profiler is None:
+            self.set_profiler(self.frame_profiler)
+        else:
+            self.set_profiler(None)
 
-    def draw(self) -> None:
-        """Draws the player, missiles, and coins onto the screen"""
+            # overlay area has to be cleared
+            self.full_redraw = True
+            self.drawn_state = None
+
+    def dump_profile(self) -> None:
+        """Save recorded frame timing as CSV and JSON"""
+        self.frame_profiler.dump_csv(self.PROFILE_PATH + ".csv")
+        self.frame_profiler.dump_json(self.PROFILE_PATH + ".json")
+
+    def draw_profile(self) -> List[pygame.Rect]:
+        """Draw last time and p95 of every phase at top right
+
+        Text is updated only every PROFILE_REFRESH frames, so it can
+        be read and most of it comes from text cache.
+
+        Returns:
+            List[pygame.Rect]: areas that are drawn
+        """
+        if self.profile_frame % self.PROFILE_REFRESH == 0:
+            last = self.frame_profiler.get_last()
+            percentiles = self.frame_profiler.get_percentiles()
+            self.profile_lines = [
+                f"{name} {last[name] * 1000:.2f} / p95 "
+                f"{percentiles[name]['p95']:.2f} ms"
+                for name in PHASES
+            ]
+        self.profile_frame += 1
+
+        rects = []
+        for i, line in enumerate(self.profile_lines):
+            position = (self.SCREEN_WIDTH - 290, 5 + i * 18)
+            rects.append(self.ui.draw_text(line, "small", self.BLACK,
+                                           position))
+        return rects
+
+    def draw(self, alpha: float = 1.0) -> List[pygame.Rect]:
+        """Draws the player, missiles, and coins that camera can see
+        onto the screen
+
+        Args:
+            alpha (float): 0 draws objects at previous tick, 1 draws them
+                           at current tick and between is interpolated
+
+        Returns:
+            List[pygame.Rect]: areas that are drawn
+        """
+        rects = []
         if not self.player:
-            return
+            return rects
+
+        player_points = self.player.get_points()
+        player_center = self.player.get_center()
+        if alpha != 1.0 and self.prev_player is not None:
+            player_points = self.player.get_interpolated_points(
+                *self.prev_player, alpha)
+            (px, py), (cx, cy) = self.prev_player[0], player_center
+            player_center = (px + (cx - px) * alpha, py + (cy - py) * alpha)
+
+        # camera follows player where it is drawn, so it is as smooth
+        self.camera.follow(player_center)
+        ox, oy = self.camera.get_offset()
+        player_points = [(x - ox, y - oy) for x, y in player_points]
 
         # Draw player
         try:
             if not self.player.get_alive():
-                return
+                return rects
 
             if self.player_effect == "invincible":
-                pygame.draw.polygon(self.screen,
-                                    self.YELLOW,
-                                    self.player.get_points())
+                rects.append(pygame.draw.polygon(self.screen,
+                                                 self.YELLOW,
+                                                 player_points))
 
             else:
-                pygame.draw.polygon(self.screen,
-                                    self.BLUE,
-                                    self.player.get_points())
+                rects.append(pygame.draw.polygon(self.screen,
+                                                 self.BLUE,
+                                                 player_points))
         except Exception as e:
             print(f"Error drwing player: {e}")
 
+        # missiles and coins are put in one list and blit at once
+        blits = []
+
         # Draw missiles
-        for m in self.missiles:
-            try:
-                if not m.get_alive():
-                    continue
+        # only alive missiles in view, their poses are got at once
+        seen = self.camera.visible(self.swarm.get_bounding_boxes(),
+                                   self.CULL_MARGIN)
+        rows = np.flatnonzero(seen & self.swarm.get_alive())
+        centers, headings = self.swarm.get_poses(alpha, rows)
+        centers = self.camera.to_screen(centers)
+        buckets = self.sprites.buckets(headings)
+        sizes = self.swarm.get_sizes()[rows]
 
-                pygame.draw.polygon(self.screen, self.RED,  m.get_points())
-            except Exception as e:
-                print(f"Error drawing missile: {e}")
+        try:
+            # every size has its own sprites, usually there is only one
+            for size in np.unique(sizes).tolist():
+                sprites = self.sprites.missile(size, self.RED)
+                half = self.sprites.get_half(sprites[0])
+                same = sizes == size
+
+                tops = np.rint(centers[same] - half).astype(int).tolist()
+                blits.extend(zip(map(sprites.__getitem__,
+                                     buckets[same].tolist()), tops))
+        except Exception as e:
+            print(f"Error drawing missile: {e}")
 
         # Draw Coin
-        for c in self.coin:
+        # coin grid gives only coins in cells that the view covers,
+        # sprite and its offset are looked up once per kind of coin
+        coin_sprites = {}
+        for c in self.coin_grid.query_box(self.camera.get_view()):
             try:
                 if c.get_collected():
                     continue
 
-                pygame.draw.circle(self.screen,
-                                   c.get_color(),
-                                   c.get_center(),
-                                   c.get_radius())
+                key = (c.get_radius(), c.get_color())
+                found = coin_sprites.get(key)
+                if found is None:
+                    sprite = self.sprites.coin(*key)
+                    half = self.sprites.get_half(sprite)
+                    found = coin_sprites[key] = (sprite, ox + half, oy + half)
+
+                sprite, left, top = found
+                x, y = c.get_center()
+                blits.append((sprite, (round(x - left), round(y - top))))
 
             except Exception as e:
                 print(f"Error drawing coin: {e}")
 
-        pygame.display.update()
-
-    def check_colision(self) -> None:
-        """Checks for collisions between the player, missiles, and coins."""
-        if not self.player:
-            return
-
-        # Checking for missiles collding to player
-        for m in self.missiles:
+        try:
+            # too many areas to update one by one, whole screen is
+            # updated anyway so do not make a rect for every sprite
+            if len(blits) > self.MAX_DIRTY_RECTS:
+                self.screen.blits(blits, doreturn=False)
+                rects.append(self.screen.get_rect())
+            else:
+                rects.extend(self.screen.blits(blits, doreturn=True))
+        except Exception as e:
+            print(f"Error drawing sprites: {e}")
 
-            # Player is invincing. So, missiles can go through player
-            if self.player_effect == "invincible":
-                self.reset_effect_time()
-                continue
-
-            if self.player.is_colliding(m):
-                self.player.set_is_alive(False)
-                m.set_is_alive(False)
-
-        # Checking for missile collding to themself
-        for i in range(len(self.missiles)):
-            for j in range(i+1, len(self.missiles)):
-                if self.missiles[i].is_colliding(self.missiles[j]):
-                    self.missiles[i].set_is_alive(False)
-                    self.missiles[j].set_is_alive(False)
-
-        # Checking that coin collding to player
-        # We can't check player.is_collding(coin)
-        # Because Coin is circle and bound box is different from Airplane
-        for c in self.coin:
-            if c.is_colliding(self.player):
-                c.set_is_collected(True)
-                self.score += c.get_score()
-
-                # Check that coin is not a normal coin
-                if hasattr(c, "get_effect"):
-                    effect = c.get_effect()
-
-                    if effect == "invincible":
-                        self.player_effect = effect
-                        self.effect_time_start = pygame.time.get_ticks() / 1000
-
-                    elif effect == "BOOM":
-                        self.set_missiles([])
-
-        # Update current missiles and coin
-        self.missiles = [m for m in self.missiles if m.get_alive()]
-        self.coin = [c for c in self.coin if not c.get_collected()]
-
-    def spwan_missiles(self) -> None:
-        """Spawns new missiles at random positions"""
-        current_time = pygame.time.get_ticks() / 1000  # Convert ms to s
-
-        if current_time - self.last_spawn_missile >= self.MISSILE_SPAWN_TIME:
-
-            num_new_missiles = random.randint(2, self.MAX_MISSILES)
-
-            spawn_postions = random.sample(self.SPAWN_POSITION,
-                                           num_new_missiles)
-
-            for pos in spawn_postions:
-                new_missile = Missile(
-                    size=self.MISSILE_SIZE,
-                    center=pos,
-                    speed=self.MISSILE_SPEED,
-                    acceleration=self.MISSILE_ACCELERATION,
-                    max_speed=self.MISSILE_MAX_SPEED,
-                    max_turn_rate=self.MISSLIE_MAX_TURN_RATE
-                )
-                self.missiles.append(new_missile)
-
-            # Update number of new_missies and last_spawn time
-            self.last_num = num_new_missiles
-            self.last_spawn_missile = current_time
-
-    def increase_score_misslie(self) -> None:
-        """Increases the score based on changes in the missile count"""
-        current_num = len(self.missiles)
-
-        # Because we have case that missiles run out of fuel
-        # So we have to check that number of
-        # current missiles is different from last time
-        if current_num < self.last_num:
-            self.score += self.last_num - len(self.missiles)
-            self.last_num = current_num
-
-    def spawn_coin(self) -> None:
-        """Increases the score based on changes in the missile count"""
-        current_time = pygame.time.get_ticks() / 1000  # Convert ms to s
-
-        all_type = ["normal", "invincible", "delete_missile"]
-        weight = [0.6, 0.3, 0.1]
-
-        if current_time - self.last_spawn_coin >= self.COIN_SPAWN_TIME:
-
-            spawn_area = (
-                (50, 50),
-                (self.SCREEN_WIDTH - 50, self.SCREEN_HEIGHT - 50)
-            )
-
-            # random, (x,y)
-            # random type get only one choices with rate
-            # k means we want only one sample and choices return in List
-            rand_type = random.choices(all_type, weights=weight, k=1)[0]
-            rand_x = random.randint(spawn_area[0][0], spawn_area[1][0])
-            rand_y = random.randint(spawn_area[0][1], spawn_area[1][1])
-
-            # Use Factory pattern to create differnet type of coin
-            new_coin = self.coin_factory.create_coin(coin_type=rand_type,
-                                                     center=(rand_x, rand_y),
-                                                     score=self.COIN_SCORE,
-                                                     radius=self.COIN_RADIUS)
-
-            # Update
-            self.coin.append(new_coin)
-            self.last_spawn_coin = current_time
+        return rects
 
     def save_high_score(self) -> None:
         """Saves the current high score to a JSON file."""
@@ -521,7 +512,7 @@ class Game:
             json.dump(data, file)
 
     def load_high_score(self) -> None:
-        """Loads the high score from a JSON file"""
+        """Loads the high score from a JSON file and the score log"""
 
         file_path = "./score.json"
         data = {}
@@ -532,37 +523,49 @@ class Game:
 
             self.high_score = data["high_score"]
 
-    def reset_effect_time(self) -> None:
-        """Resets any temporary effects on the player"""
-        current_time = pygame.time.get_ticks() / 1000
-
-        if current_time - self.effect_time_start >= self.AIRPLANE_EFFECT_TIME:
-            self.player_effect = ""
-            self.effect_time_start = current_time
+        if self.score_log is not None:
+            self.high_score = max(self.high_score,
+                                  self.score_log.get_high_score())
 
 
 # main function
 if __name__ == "__main__":
 
-    pygame.init()
+    parser = argparse.ArgumentParser(description="Airplane")
+    parser.add_argument("--record", metavar="PATH", default=None,
+                        help="record this game, play it with replay.py")
+    args = parser.parse_args()
+
+    # only display is needed, window itself is opened on first frame
+    pygame.display.init()
     pygame.display.set_caption("Airplane")
-    game = Game()
 
-    # Create player in center of screen
-    airplane = Airplane(size=game.AIRPLANE_SIZE,
-                        center=(game.SCREEN_WIDTH/2, game.SCREEN_HEIGHT/2),
-                        speed=game.AIRPLANE_SPEED)
+    if args.record:
+        # replay starts from a fresh reset with the same seed
+        seed = new_seed()
+        game = Game(seed=seed)
+        game.reset()
+        game.set_recorder(ReplayWriter(args.record, seed, game.TICK_RATE))
+
+    else:
+        game = Game()
+
+        # Create player in center of screen
+        airplane = Airplane(size=game.AIRPLANE_SIZE,
+                            center=(game.WORLD_WIDTH/2, game.WORLD_HEIGHT/2),
+                            speed=game.AIRPLANE_SPEED)
+
+        # Create Test Missile
+        m1 = Missile(size=game.MISSILE_SIZE,
+                     center=(100, 100),
+                     speed=game.MISSILE_SPEED,
+                     acceleration=game.MISSILE_ACCELERATION,
+                     max_speed=game.MISSILE_MAX_SPEED,
+                     max_turn_rate=game.MISSLIE_MAX_TURN_RATE)
 
-    # Create Test Missile
-    m1 = Missile(size=game.MISSILE_SIZE,
-                 center=(100, 100),
-                 speed=game.MISSILE_SPEED,
-                 acceleration=game.MISSILE_ACCELERATION,
-                 max_speed=game.MISSILE_MAX_SPEED,
-                 max_turn_rate=game.MISSLIE_MAX_TURN_RATE)
+        game.set_player(airplane)
 
-    game.set_player(airplane)
+        # for testing
+        game.set_missiles([m1])
 
-    # for testing
-    game.set_missiles([m1])
     game.run_main()
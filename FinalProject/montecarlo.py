@@ -0,0 +1,327 @@
+"""
+    Module that runs many seeded headless episodes of the game
+    on every core and reports how the results are distributed
+
+    Run:
+        python montecarlo.py --episodes 2000 --pilot scripted
+        python montecarlo.py --set MISSILE_SPAWN_TIME=2.5 --output runs.csv
+"""
+import argparse
+import csv
+import math
+import multiprocessing
+import os
+import random
+import statistics
+import time
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from simulation import (Simulation, INPUT_LEFT, INPUT_RIGHT, INPUT_START)
+
+
+# Result of one episode
+FIELDS = ("episode", "seed", "score", "survival_time",
+          "missiles_dodged", "coins_collected")
+
+# Simulation constants that can be changed with --set
+TUNABLE = ("MISSILE_SPAWN_TIME", "MAX_MISSILES", "MISSLIE_MAX_TURN_RATE",
+           "MISSILE_SPEED", "MISSILE_ACCELERATION", "MISSILE_MAX_SPEED",
+           "COIN_SPAWN_TIME", "COIN_SCORE", "COIN_RADIUS",
+           "AIRPLANE_SPEED", "AIRPLANE_ROTATION_ANGLE", "AIRPLANE_EFFECT_TIME")
+
+
+class RandomPilot:
+    """Pilot that keeps turning one way for a while and changes sometimes
+
+    Medthods:
+        choose(): return inputs of this tick
+    """
+
+    # about twice a second at 60 ticks per second
+    CHANGE_RATE = 1 / 30
+
+    def __init__(self, rng: random.Random) -> None:
+        self.__rng = rng
+        self.__turn = 0
+
+    def choose(self, sim: Simulation) -> int:
+        """choose inputs of this tick
+
+        Args:
+            sim (Simulation): game that is played
+
+        Returns:
+            int: packed inputs
+        """
+        assert isinstance(sim, Simulation), \
+            f"sim should be Simulation, but got {type(sim)}"
+
+        if self.__rng.random() < self.CHANGE_RATE:
+            self.__turn = self.__rng.choice((0, INPUT_LEFT, INPUT_RIGHT))
+        return self.__turn
+
+
+class ScriptedPilot:
+    """Pilot that turns away from the nearest missile when it is close,
+    otherwise flies to the nearest coin or back to the middle, way out
+    from a missile is a bit random so seeds do not dodge the same way
+
+    Medthods:
+        choose(): return inputs of this tick
+    """
+
+    DANGER_DISTANCE = 120
+    ESCAPE_SPREAD = math.radians(45)
+
+    def __init__(self, rng: random.Random) -> None:
+        self.__rng = rng
+
+    def choose(self, sim: Simulation) -> int:
+        """choose inputs of this tick
+
+        Args:
+            sim (Simulation): game that is played
+
+        Returns:
+            int: packed inputs
+        """
+        assert isinstance(sim, Simulation), \
+            f"sim should be Simulation, but got {type(sim)}"
+
+        px, py = sim.player.get_center()
+        target = None
+        away = False
+
+        centers = sim.swarm.get_centers()
+        if len(centers) > 0:
+            distance = np.hypot(centers[:, 0] - px, centers[:, 1] - py)
+            nearest = int(np.argmin(distance))
+            if distance[nearest] < self.DANGER_DISTANCE:
+                target = centers[nearest]
+                away = True
+
+        if target is None and sim.coin:
+            target = min((c.get_center() for c in sim.coin),
+                         key=lambda c: (c[0] - px) ** 2 + (c[1] - py) ** 2)
+
+        if target is None:
+            target = (sim.WORLD_WIDTH / 2, sim.WORLD_HEIGHT / 2)
+
+        angle = math.atan2(target[1] - py, target[0] - px)
+        if away:
+            angle += math.pi + self.__rng.uniform(-self.ESCAPE_SPREAD,
+                                                  self.ESCAPE_SPREAD)
+
+        # shortest turn from heading to angle
+        diff = (angle - sim.player.get_heading() + math.pi) % (2 * math.pi) \
+            - math.pi
+        if abs(diff) < math.radians(sim.AIRPLANE_ROTATION_ANGLE) / 2:
+            return 0
+        return INPUT_RIGHT if diff > 0 else INPUT_LEFT
+
+
+PILOTS = {
+    "random": RandomPilot,
+    "scripted": ScriptedPilot
+}
+
+
+def run_episode(seed: int,
+                pilot: str,
+                params: Dict[str, float],
+                max_time: float) -> Dict[str, float]:
+    """Play one headless episode until player dies or time is up
+
+    Args:
+        seed (int): seed of simulation and pilot
+        pilot (str): name of pilot in PILOTS
+        params (Dict[str, float]): constants of Simulation to change
+        max_time (float): longest game time in seconds
+
+    Returns:
+        Dict[str, float]: score, survival_time, missiles_dodged
+                          and coins_collected
+    """
+    sim = Simulation(seed=seed)
+    for name, value in params.items():
+        setattr(sim, name, value)
+
+    # pilot has its own random so it does not change spawns
+    driver = PILOTS[pilot](random.Random(seed ^ 0x5EED))
+    sim.reset()
+    sim.step(INPUT_START, sim.tick_dt)
+    start = sim.get_time()
+    max_ticks = int(max_time / sim.tick_dt)
+
+    for _ in range(max_ticks):
+        if not sim.player.get_alive():
+            break
+        sim.step(driver.choose(sim), sim.tick_dt)
+
+    return {
+        "seed": seed,
+        "score": sim.score,
+        "survival_time": sim.get_time() - start,
+        "missiles_dodged": sim.missiles_dodged,
+        "coins_collected": sim.coins_collected
+    }
+
+
+# Setting of worker process, it is sent once when the process starts
+_WORKER = {}
+
+
+def _init_worker(pilot: str, params: Dict[str, float], max_time: float) -> None:
+    """Keep setting in worker so every task sends only its seed"""
+    _WORKER["pilot"] = pilot
+    _WORKER["params"] = params
+    _WORKER["max_time"] = max_time
+
+
+def _run_task(task: Tuple[int, int]) -> Dict[str, float]:
+    """Run one episode in worker process"""
+    episode, seed = task
+    result = run_episode(seed, _WORKER["pilot"], _WORKER["params"],
+                         _WORKER["max_time"])
+    result["episode"] = episode
+    return result
+
+
+def run_episodes(episodes: int,
+                 seed: int = 0,
+                 pilot: str = "scripted",
+                 params: Dict[str, float] | None = None,
+                 max_time: float = 120.0,
+                 processes: int | None = None) -> Iterator[Dict[str, float]]:
+    """Run episodes on a process pool and yield every result
+    as soon as it is finished
+
+    Args:
+        episodes (int): number of episodes
+        seed (int): seed of the whole run, episode i uses seed + i
+        pilot (str): name of pilot in PILOTS
+        params (Dict[str, float] | None): constants of Simulation to change
+        max_time (float): longest game time of one episode in seconds
+        processes (int | None): number of processes, default every core
+
+    Yields:
+        Dict[str, float]: result of one episode, not in episode order
+    """
+    assert pilot in PILOTS, f"pilot should be one of {list(PILOTS)}"
+
+    params = params or {}
+    processes = processes or os.cpu_count() or 1
+    tasks = [(i, seed + i) for i in range(episodes)]
+
+    # a few chunks per process keeps every core busy until the end
+    chunksize = max(1, episodes // (processes * 8))
+
+    with multiprocessing.Pool(processes,
+                              initializer=_init_worker,
+                              initargs=(pilot, params, max_time)) as pool:
+        yield from pool.imap_unordered(_run_task, tasks, chunksize=chunksize)
+
+
+def summarize(results: List[Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    """Get distribution of every field of results
+
+    Args:
+        results (List[Dict[str, float]]): result of every episode
+
+    Returns:
+        Dict[str, Dict[str, float]]: mean, stdev, min, p5, p50, p95 and max
+                                     by field
+    """
+    summary = {}
+
+    for field in FIELDS[2:]:
+        values = np.array([r[field] for r in results], dtype=float)
+        p5, p50, p95 = np.percentile(values, [5, 50, 95])
+        summary[field] = {
+            "mean": float(values.mean()),
+            "stdev": statistics.stdev(values) if len(values) > 1 else 0.0,
+            "min": float(values.min()),
+            "p5": float(p5),
+            "p50": float(p50),
+            "p95": float(p95),
+            "max": float(values.max())
+        }
+
+    return summary
+
+
+def parse_params(items: List[str]) -> Dict[str, float]:
+    """Parse NAME=VALUE items of --set
+
+    Args:
+        items (List[str]): items from command line
+
+    Returns:
+        Dict[str, float]: value by constant name
+    """
+    params = {}
+
+    for item in items:
+        name, _, value = item.partition("=")
+        if name not in TUNABLE:
+            raise ValueError(f"Invalid constant: {name}")
+
+        number = float(value)
+        params[name] = int(number) if number.is_integer() and \
+            isinstance(getattr(Simulation, name), int) else number
+
+    return params
+
+
+def main() -> None:
+    """Command line of Monte Carlo runner"""
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("--episodes", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pilot", choices=list(PILOTS), default="scripted")
+    parser.add_argument("--max-time", type=float, default=120.0)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--set", nargs="*", default=[], metavar="NAME=VALUE",
+                        help=f"change constant, one of {', '.join(TUNABLE)}")
+    parser.add_argument("--output", default=None,
+                        help="save result of every episode as CSV")
+    args = parser.parse_args()
+
+    params = parse_params(args.set)
+    results = []
+    start = time.perf_counter()
+
+    file = open(args.output, "w", newline="", encoding="utf-8") \
+        if args.output else None
+
+    try:
+        writer = csv.DictWriter(file, fieldnames=FIELDS) if file else None
+        if writer:
+            writer.writeheader()
+
+        # results are streamed back, write them while others still run
+        for result in run_episodes(args.episodes, args.seed, args.pilot,
+                                   params, args.max_time, args.processes):
+            results.append(result)
+            if writer:
+                writer.writerow(result)
+    finally:
+        if file:
+            file.close()
+
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(results)} episodes in {elapsed:.1f}s "
+          f"({len(results) / elapsed:.1f} episodes/s), "
+          f"pilot {args.pilot}, {params or 'default constants'}")
+    print(f"{'':>16} {'mean':>8} {'stdev':>8} {'min':>8} {'p5':>8} "
+          f"{'p50':>8} {'p95':>8} {'max':>8}")
+
+    for field, stats in summarize(results).items():
+        print(f"{field:>16} " + " ".join(f"{v:>8.2f}" for v in stats.values()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+    Module that contains FrameProfiler, it records how long every
+    phase of a frame takes into a ring buffer
+"""
+import csv
+import json
+import time
+from typing import Dict, List
+
+import numpy as np
+
+
+# Phases of one frame, index is the column in ring buffer
+PHASE_EVENTS = 0
+PHASE_UPDATE_POSITIONS = 1
+PHASE_CHECK_COLISION = 2
+PHASE_INCREASE_SCORE = 3
+PHASE_DRAW = 4
+PHASE_PRESENT = 5
+PHASE_FRAME = 6
+
+PHASES = ("events", "update_positions", "check_colision",
+          "increase_score_misslie", "draw", "present", "frame")
+
+
+class FrameProfiler:
+    """Record time of every phase of the last frames
+
+    Every frame is one row of a fixed size array, so recording never
+    allocates. When the buffer is full the oldest frame is overwritten.
+    A frame that runs many ticks adds time of every tick to its row.
+
+    Usage:
+        profiler.begin_frame()
+        profiler.start()
+        scheduler.run_due()
+        profiler.lap(PHASE_EVENTS)
+        ...
+        profiler.end_frame()
+
+    Attributes:
+        size (int): number of frames that are kept
+
+    Medthods:
+        begin_frame(): start a new row
+        start(): start measuring the next phase from now
+        lap(): add time since last start or lap to a phase
+        end_frame(): finish the row with total time of frame
+        get_frames(): get every recorded frame from oldest to newest
+        get_last(): get the newest frame
+        get_percentiles(): get p50, p95 and p99 of every phase
+        dump_csv(): save every frame as CSV
+        dump_json(): save percentiles and every frame as JSON
+    """
+
+    def __init__(self, size: int = 600) -> None:
+
+        assert isinstance(size, int) and size > 0, \
+            f"size should be positive int, but got {size}"
+
+        self.__size = size
+        self.__frames = np.zeros((size, len(PHASES)))
+        self.__index = 0
+        self.__count = 0
+        self.__frame_start = 0.0
+        self.__last = 0.0
+
+    def begin_frame(self) -> None:
+        """Start a new row for this frame"""
+        self.__frames[self.__index] = 0.0
+        self.__frame_start = self.__last = time.perf_counter()
+
+    def start(self) -> None:
+        """Start measuring the next phase from now"""
+        self.__last = time.perf_counter()
+
+    def lap(self, phase: int) -> None:
+        """Add time since last `start()` or `lap()` to phase
+
+        Args:
+            phase (int): one of PHASE_* constants
+        """
+        now = time.perf_counter()
+        self.__frames[self.__index, phase] += now - self.__last
+        self.__last = now
+
+    def end_frame(self) -> None:
+        """Finish this frame with the total time since `begin_frame()`"""
+        self.__frames[self.__index, PHASE_FRAME] = \
+            time.perf_counter() - self.__frame_start
+
+        self.__index = (self.__index + 1) % self.__size
+        self.__count = min(self.__count + 1, self.__size)
+
+    # Access data part
+    def get_frames(self) -> np.ndarray:
+        """Get every recorded frame
+
+        Returns:
+            np.ndarray: (frames, phases) time in seconds,
+                        oldest frame first
+        """
+        if self.__count < self.__size:
+            return self.__frames[:self.__count].copy()
+
+        return np.roll(self.__frames, -self.__index, axis=0)
+
+    def get_last(self) -> Dict[str, float]:
+        """Get time of every phase in the newest frame
+
+        Returns:
+            Dict[str, float]: time in seconds by phase name
+        """
+        if self.__count == 0:
+            return dict.fromkeys(PHASES, 0.0)
+
+        row = self.__frames[(self.__index - 1) % self.__size]
+        return dict(zip(PHASES, row.tolist()))
+
+    def get_percentiles(self) -> Dict[str, Dict[str, float]]:
+        """Get p50, p95 and p99 of every phase
+
+        Returns:
+            Dict[str, Dict[str, float]]: time in milliseconds
+                                         by phase name and percentile
+        """
+        frames = self.get_frames() * 1000
+
+        if len(frames) == 0:
+            return {name: {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+                    for name in PHASES}
+
+        p50, p95, p99 = np.percentile(frames, [50, 95, 99], axis=0)
+        return {name: {"p50": float(p50[i]),
+                       "p95": float(p95[i]),
+                       "p99": float(p99[i])}
+                for i, name in enumerate(PHASES)}
+
+    def dump_csv(self, path: str) -> None:
+        """Save every frame as CSV, one row per frame in milliseconds
+
+        Args:
+            path (str): file that is written
+        """
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(PHASES)
+            writer.writerows((self.get_frames() * 1000).tolist())
+
+    def dump_json(self, path: str) -> None:
+        """Save percentiles and every frame as JSON in milliseconds
+
+        Args:
+            path (str): file that is written
+        """
+        frames: List[List[float]] = (self.get_frames() * 1000).tolist()
+
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({
+                "phases": PHASES,
+                "percentiles": self.get_percentiles(),
+                "frames": frames
+            }, file, indent=2)
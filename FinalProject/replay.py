@@ -0,0 +1,363 @@
+"""
+    Module that records a game as its seed and the inputs of every tick,
+    and plays it back by running the same simulation again
+
+    File layout (little endian):
+        header   magic "ARPL", version u8, tick rate f64, seed i64
+        runs     varint (length << 4 | inputs) for every run of ticks
+                 with the same inputs, a varint 0 ends the runs
+        footer   ticks u64, final score i64
+
+    A file without footer (game crashed) can still be played,
+    it only cannot be verified.
+
+    Run:
+        python replay.py last.rpl              # as fast as possible
+        python replay.py last.rpl --realtime   # watch it in the window
+"""
+import argparse
+import random
+import struct
+import time
+from typing import Tuple
+
+from simulation import Simulation
+
+
+# Inputs are 4 bits: INPUT_LEFT, INPUT_RIGHT, INPUT_START, INPUT_RESTART
+INPUT_BITS = 4
+INPUT_MASK = (1 << INPUT_BITS) - 1
+
+HEADER = struct.Struct("<4sBdq")
+FOOTER = struct.Struct("<Qq")
+MAGIC = b"ARPL"
+VERSION = 1
+
+# Size of file buffer, runs are written and read in blocks of this size
+BUFFER_SIZE = 64 * 1024
+
+
+def new_seed() -> int:
+    """Get a random seed for a game that is recorded
+
+    Returns:
+        int: seed that fits in the header
+    """
+    return random.randrange(1 << 63)
+
+
+class ReplayWriter:
+    """Write inputs of every tick to a replay file while game runs
+
+    Ticks with the same inputs are counted and written as one run,
+    so holding a key or doing nothing costs one or two bytes.
+    Runs go through a file buffer, the disk is touched only when
+    the buffer is full or the replay is closed.
+
+    Attributes:
+        path (str): file that is written
+        seed (int): seed of simulation
+        tick_rate (float): ticks per second of simulation
+
+    Medthods:
+        record(): add inputs of one tick
+        close(): write last run and final score
+        get_ticks(): get number of recorded ticks
+    """
+
+    def __init__(self, path: str, seed: int, tick_rate: int | float) -> None:
+
+        assert isinstance(seed, int), \
+            f"seed should be int, but got {type(seed)}"
+
+        assert isinstance(tick_rate, (int, float)) and tick_rate > 0, \
+            f"tick_rate should be positive int or float, but got {tick_rate}"
+
+        self.__file = open(path, "wb", buffering=BUFFER_SIZE)
+        self.__file.write(HEADER.pack(MAGIC, VERSION, float(tick_rate), seed))
+
+        self.__inputs = 0
+        self.__length = 0
+        self.__ticks = 0
+
+    def record(self, inputs: int) -> None:
+        """Add inputs of one tick
+
+        Args:
+            inputs (int): packed inputs that the tick ran with
+        """
+        inputs &= INPUT_MASK
+        self.__ticks += 1
+
+        if inputs == self.__inputs:
+            self.__length += 1
+            return
+
+        self.__write_run()
+        self.__inputs = inputs
+        self.__length = 1
+
+    def close(self, score: int) -> None:
+        """Write the last run and final score, then close the file
+
+        Args:
+            score (int): score of simulation after the last tick
+        """
+        if self.__file.closed:
+            return
+
+        self.__write_run()
+        self.__file.write(_encode_varint(0))
+        self.__file.write(FOOTER.pack(self.__ticks, score))
+        self.__file.close()
+
+    def __write_run(self) -> None:
+        """Write the run that is counted now"""
+        if self.__length > 0:
+            self.__file.write(
+                _encode_varint(self.__length << INPUT_BITS | self.__inputs))
+
+    # Access data part
+    def get_ticks(self) -> int:
+        """Get number of recorded ticks
+
+        Returns:
+            int: ticks since the file was opened
+        """
+        return self.__ticks
+
+
+class ReplayReader:
+    """Read a replay file back one tick at a time
+
+    Only the header is read when it is opened, runs are decoded
+    while they are played.
+
+    Attributes:
+        path (str): file that is read
+
+    Medthods:
+        next_inputs(): get inputs of the next tick
+        is_finished(): check that every tick is played
+        get_seed(): get seed of simulation
+        get_tick_rate(): get ticks per second
+        get_ticks(): get number of ticks in the footer
+        get_score(): get final score in the footer
+    """
+
+    def __init__(self, path: str) -> None:
+        self.__file = open(path, "rb", buffering=BUFFER_SIZE)
+
+        # file is closed when it is not a replay
+        header = self.__file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            self.__file.close()
+            raise ValueError(f"Invalid replay: {path}")
+
+        magic, version, self.__tick_rate, self.__seed = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            self.__file.close()
+            raise ValueError(f"Invalid replay: {path}")
+
+        self.__inputs = 0
+        self.__length = 0
+        self.__ended = False
+        self.__ticks = None
+        self.__score = None
+
+    def next_inputs(self) -> int:
+        """Get inputs of the next tick
+
+        Returns:
+            int: packed inputs, 0 when every tick is played
+        """
+        if self.__length == 0 and not self.__next_run():
+            return 0
+
+        self.__length -= 1
+        return self.__inputs
+
+    def is_finished(self) -> bool:
+        """Check that every tick is played
+
+        Returns:
+            bool: `True` when there is no tick left
+        """
+        return self.__length == 0 and not self.__next_run()
+
+    def __next_run(self) -> bool:
+        """Decode the next run, read footer after the last one
+
+        Returns:
+            bool: `False` when there is no run left
+        """
+        if self.__ended:
+            return False
+
+        value = self.__read_varint()
+
+        if value is None or value == 0:
+            self.__ended = True
+
+            footer = self.__file.read(FOOTER.size) if value == 0 else b""
+            if len(footer) == FOOTER.size:
+                self.__ticks, self.__score = FOOTER.unpack(footer)
+
+            self.__file.close()
+            return False
+
+        self.__inputs = value & INPUT_MASK
+        self.__length = value >> INPUT_BITS
+        return True
+
+    def __read_varint(self) -> int | None:
+        """Read one varint from file
+
+        Returns:
+            int | None: value or `None` when the file ends
+        """
+        value = 0
+        shift = 0
+
+        while True:
+            byte = self.__file.read(1)
+            if not byte:
+                return None
+
+            value |= (byte[0] & 0x7F) << shift
+            if byte[0] < 0x80:
+                return value
+            shift += 7
+
+    # Access data part
+    def get_seed(self) -> int:
+        """Get seed of recorded simulation
+
+        Returns:
+            int: seed
+        """
+        return self.__seed
+
+    def get_tick_rate(self) -> float:
+        """Get ticks per second of recorded simulation
+
+        Returns:
+            float: tick rate
+        """
+        return self.__tick_rate
+
+    def get_ticks(self) -> int | None:
+        """Get number of ticks in the footer, known after the last tick
+
+        Returns:
+            int | None: `None` when file has no footer or is not played yet
+        """
+        return self.__ticks
+
+    def get_score(self) -> int | None:
+        """Get final score in the footer, known after the last tick
+
+        Returns:
+            int | None: `None` when file has no footer or is not played yet
+        """
+        return self.__score
+
+
+def _encode_varint(value: int) -> bytes:
+    """Encode value in 7 bits per byte, high bit means more bytes"""
+    out = bytearray()
+
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+    return bytes(out)
+
+
+def play(path: str) -> Tuple[Simulation, ReplayReader]:
+    """Play a replay headless as fast as the CPU allows
+
+    Args:
+        path (str): replay file
+
+    Returns:
+        Tuple[Simulation, ReplayReader]: simulation after the last tick
+                                         and reader with its footer
+    """
+    reader = ReplayReader(path)
+    sim = Simulation(tick_rate=reader.get_tick_rate(),
+                     seed=reader.get_seed())
+    sim.reset()
+    sim.set_replay(reader)
+
+    # replay gives the inputs, the ones given here are not used
+    while not reader.is_finished():
+        sim.step(0, sim.tick_dt)
+
+    return sim, reader
+
+
+def play_realtime(path: str) -> Tuple[Simulation, ReplayReader]:
+    """Play a replay in the game window at its tick rate
+
+    Args:
+        path (str): replay file
+
+    Returns:
+        Tuple[Simulation, ReplayReader]: game after the last tick
+                                         and reader with its footer
+    """
+    # pygame is needed only to watch
+    import pygame
+    from main import Game
+
+    reader = ReplayReader(path)
+
+    pygame.display.init()
+    pygame.display.set_caption("Airplane replay")
+    game = Game(tick_rate=reader.get_tick_rate(), seed=reader.get_seed())
+    game.reset()
+    game.set_replay(reader)
+    game.run_main()
+
+    return game, reader
+
+
+def main() -> None:
+    """Command line of replay player"""
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip(),
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path")
+    parser.add_argument("--realtime", action="store_true",
+                        help="watch replay in the window instead")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.realtime:
+        sim, reader = play_realtime(args.path)
+    else:
+        sim, reader = play(args.path)
+    elapsed = time.perf_counter() - start
+
+    ticks = reader.get_ticks()
+    score = reader.get_score()
+
+    if score is None:
+        print(f"replay has no footer, final score {sim.score} "
+              f"cannot be verified")
+        return
+
+    print(f"{ticks} ticks ({ticks * sim.tick_dt:.0f}s of game) "
+          f"in {elapsed:.2f}s")
+
+    if reader.is_finished() and sim.score == score:
+        print(f"ok, final score {score}")
+    else:
+        print(f"mismatch, recorded score {score} but got {sim.score}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+    Module that contains Scheduler, a queue of timed events that run
+    at a simulation time, so nothing has to check its own timer
+    every tick
+"""
+from typing import Callable, List, Tuple
+import heapq
+
+
+class Event:
+    """Handle of a scheduled callback, it is used to cancel it
+
+    Attributes:
+        time (float): simulation time when callback runs
+        callback (Callable[[], object]): function that is called
+        pending (bool): `False` when it has run or is cancelled
+    """
+
+    __slots__ = ("time", "callback", "pending")
+
+    def __init__(self, time: float, callback: Callable[[], object]) -> None:
+        self.time = time
+        self.callback = callback
+        self.pending = True
+
+
+class Scheduler:
+    """Run callbacks when simulation time reaches them
+
+    Events are kept in a heap by time, so a tick where nothing is due
+    only looks at the top of it and a due event costs O(log n).
+    Events of the same time run in the order they were scheduled.
+    A cancelled event stays in the heap and is dropped when it
+    comes to the top.
+
+    Attributes:
+        time_source (Callable[[], float]): gives current simulation time
+
+    Medthods:
+        schedule(): run a callback after a delay
+        schedule_at(): run a callback at a time
+        cancel(): remove a scheduled event
+        run_due(): run every event whose time has come
+        clear(): remove every event
+        get_next_time(): get time of the next event
+        get_count(): get number of events that are waiting
+    """
+
+    def __init__(self, time_source: Callable[[], float]) -> None:
+
+        assert callable(time_source), \
+            f"time_source should be callable, but got {type(time_source)}"
+
+        self.__time = time_source
+
+        # (time, order, event), order keeps events of same time in order
+        self.__heap: List[Tuple[float, int, Event]] = []
+        self.__order = 0
+        self.__cancelled = 0
+
+        # events that are scheduled while run_due() runs, they wait
+        # for the next call so a zero delay cannot loop forever
+        self.__running = False
+        self.__incoming: List[Tuple[float, int, Event]] = []
+
+    def schedule(self, delay: float, callback: Callable[[], object]) -> Event:
+        """Run callback after delay of simulation time
+
+        Args:
+            delay (float): seconds from now
+            callback (Callable[[], object]): function without argument
+
+        Returns:
+            Event: handle that can be cancelled
+        """
+        return self.schedule_at(self.__time() + delay, callback)
+
+    def schedule_at(self,
+                    time: float,
+                    callback: Callable[[], object]) -> Event:
+        """Run callback when simulation time reaches time
+
+        Args:
+            time (float): simulation time in seconds
+            callback (Callable[[], object]): function without argument
+
+        Returns:
+            Event: handle that can be cancelled
+        """
+        assert callable(callback), \
+            f"callback should be callable, but got {type(callback)}"
+
+        event = Event(time, callback)
+        entry = (time, self.__order, event)
+        self.__order += 1
+
+        if self.__running:
+            self.__incoming.append(entry)
+        else:
+            heapq.heappush(self.__heap, entry)
+
+        return event
+
+    def cancel(self, event: Event | None) -> None:
+        """Remove a scheduled event, nothing happens when it has run
+
+        Args:
+            event (Event | None): handle from schedule()
+        """
+        if event is None or not event.pending:
+            return
+
+        event.pending = False
+        self.__cancelled += 1
+
+        # too many dead entries, build heap again without them
+        if not self.__running and self.__cancelled > 64 \
+                and self.__cancelled > len(self.__heap) // 2:
+            self.__heap = [e for e in self.__heap if e[2].pending]
+            heapq.heapify(self.__heap)
+            self.__incoming = [e for e in self.__incoming if e[2].pending]
+            self.__cancelled = 0
+
+    def run_due(self) -> int:
+        """Run every event whose time has come, earliest first
+
+        Returns:
+            int: number of callbacks that ran
+        """
+        now = self.__time()
+        heap = self.__heap
+        ran = 0
+
+        self.__running = True
+        try:
+            while heap and heap[0][0] <= now:
+                event = heapq.heappop(heap)[2]
+
+                if not event.pending:
+                    self.__cancelled -= 1
+                    continue
+
+                event.pending = False
+                event.callback()
+                ran += 1
+        finally:
+            self.__running = False
+
+            for entry in self.__incoming:
+                heapq.heappush(heap, entry)
+            self.__incoming.clear()
+
+        return ran
+
+    def clear(self) -> None:
+        """Remove every event"""
+        for _, _, event in self.__heap + self.__incoming:
+            event.pending = False
+
+        self.__heap.clear()
+        self.__incoming.clear()
+        self.__cancelled = 0
+
+    # Access data part
+    def get_next_time(self) -> float | None:
+        """Get time of the next event that is waiting
+
+        Returns:
+            float | None: simulation time, `None` when there is no event
+        """
+        waiting = [e for e in self.__heap + self.__incoming if e[2].pending]
+        return min(waiting)[0] if waiting else None
+
+    def get_count(self) -> int:
+        """Get number of events that are waiting
+
+        Returns:
+            int: events that are not run or cancelled
+        """
+        return len(self.__heap) + len(self.__incoming) - self.__cancelled
@@ -0,0 +1,344 @@
+"""
+    Module that contains ScoreLog, an append-only history of every
+    finished run with a small index for the leaderboard
+
+    The log is never rewritten, a record is only added at its end.
+    Every record has a checksum, a record with wrong checksum is
+    skipped and a record that was cut by a crash at the end is dropped
+    when the log is opened again. The index keeps
+    the best runs and the best score of every day, it is replaced
+    atomically and tells how much of the log it covers, so opening
+    reads only the index and the few records after it.
+"""
+import json
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from typing import Dict, List, Tuple
+
+
+# time, score, coins collected, missiles dodged, checksum
+RECORD = struct.Struct("<diiiI")
+
+
+class ScoreLog:
+    """History of every finished run
+
+    `add()` only puts the run in a queue, a background thread writes
+    queued runs in one batch with one fsync, so the game loop never
+    waits for the disk. A batch that cannot be written, like on a
+    full disk, is cut from the log and written again with the next one.
+
+    Attributes:
+        TOP_SIZE (int): number of best runs that the index keeps
+        FLUSH_INTERVAL (float): seconds that writer waits for more runs
+                                before it writes a batch
+        RETRY_INTERVAL (float): seconds before runs that failed are
+                                written again when no new run comes
+        path (str): file of the log, the index is path + ".idx"
+
+    Medthods:
+        add(): add a finished run
+        flush(): wait until every added run is on disk
+        close(): write every run and stop the writer
+        top(): get best runs
+        best_of_day(): get best score of a day
+        get_high_score(): get best score of every run
+        get_count(): get number of runs
+    """
+
+    TOP_SIZE = 100
+    FLUSH_INTERVAL = 0.5
+    RETRY_INTERVAL = 5.0
+
+    def __init__(self, path: str = "./scores.log") -> None:
+        self.__path = path
+        self.__index_path = path + ".idx"
+
+        # index, only changed while holding the lock
+        self.__lock = threading.Lock()
+        self.__top: List[Tuple[int, float]] = []
+        self.__days: Dict[str, int] = {}
+        self.__count = 0
+        self.__log_size = 0
+
+        self.__load()
+
+        self.__queue = queue.Queue()
+        self.__thread = threading.Thread(target=self.__write_loop,
+                                         name="ScoreLog", daemon=True)
+        self.__thread.start()
+
+    def add(self,
+            score: int,
+            coins_collected: int = 0,
+            missiles_dodged: int = 0,
+            when: float | None = None) -> None:
+        """Add a finished run, it is written by the background thread
+
+        Args:
+            score (int): final score of the run
+            coins_collected (int): coins collected in the run
+            missiles_dodged (int): missiles dodged in the run
+            when (float | None): unix time of the run, default is now
+        """
+        assert isinstance(score, int), \
+            f"score should be int, but got {type(score)}"
+
+        when = time.time() if when is None else when
+        self.__queue.put((when, score, coins_collected, missiles_dodged))
+
+    def flush(self) -> None:
+        """Wait until every added run is written and synced, or its
+        write failed and it waits for the next batch"""
+        self.__queue.join()
+
+    def close(self) -> None:
+        """Write every added run and stop the writer thread"""
+        if self.__thread.is_alive():
+            self.__queue.put(None)
+            self.__thread.join()
+
+    def __write_loop(self) -> None:
+        """Write queued runs in batches until close() is called"""
+        # no buffer, a failed write cannot be written again by itself
+        with open(self.__path, "ab", buffering=0) as file:
+            running = True
+
+            # runs of a batch that failed, they go before the next runs
+            pending: List[Tuple] = []
+
+            while running:
+                batch = []
+                try:
+                    batch.append(self.__queue.get(
+                        timeout=self.RETRY_INTERVAL if pending else None))
+                except queue.Empty:
+                    pass
+
+                # runs that come soon after are written with this one
+                deadline = time.monotonic() + self.FLUSH_INTERVAL
+                while batch and batch[-1] is not None:
+                    try:
+                        batch.append(self.__queue.get(
+                            timeout=max(deadline - time.monotonic(), 0)))
+                    except queue.Empty:
+                        break
+
+                if batch and batch[-1] is None:
+                    running = False
+                    batch.pop()
+
+                runs = pending + batch
+                try:
+                    if runs:
+                        self.__write_batch(file, runs)
+                    pending = []
+                except OSError as e:
+                    print(f"Error writing score log: {e}")
+                    pending = runs
+                finally:
+                    for _ in range(len(batch) + (not running)):
+                        self.__queue.task_done()
+
+    def __write_batch(self, file, batch: List[Tuple]) -> None:
+        """Append a batch to the log with one fsync, then save the index
+
+        Raises:
+            OSError: batch is not in the log, the log is cut back to
+                     the records that the index covers
+        """
+        data = b"".join(self._pack(*run) for run in batch)
+
+        try:
+            # part of a batch that failed can be left when cutting failed
+            if os.fstat(file.fileno()).st_size != self.__log_size:
+                file.truncate(self.__log_size)
+
+            view = memoryview(data)
+            while view:
+                view = view[file.write(view):]
+            os.fsync(file.fileno())
+        except OSError:
+            # later records would not be aligned after a part of a batch
+            try:
+                file.truncate(self.__log_size)
+            except OSError:
+                pass
+            raise
+
+        with self.__lock:
+            for when, score, _, _ in batch:
+                self.__index_run(when, score)
+            self.__log_size += len(data)
+            index = self.__dump_index()
+
+        # runs are in the log, next batch or next open fixes the index
+        try:
+            self.__save_index(index)
+        except OSError as e:
+            print(f"Error saving score log index: {e}")
+
+    @staticmethod
+    def _pack(when: float, score: int, coins: int, dodged: int) -> bytes:
+        """Pack one run with checksum of its fields"""
+        fields = RECORD.pack(when, score, coins, dodged, 0)[:-4]
+        return fields + struct.pack("<I", zlib.crc32(fields))
+
+    @staticmethod
+    def _unpack(record: bytes) -> Tuple[float, int, int, int] | None:
+        """Unpack one run, `None` when checksum is wrong"""
+        when, score, coins, dodged, crc = RECORD.unpack(record)
+        if zlib.crc32(record[:-4]) != crc:
+            return None
+        return when, score, coins, dodged
+
+    def __index_run(self, when: float, score: int) -> None:
+        """Put one run into top runs and best of its day"""
+        self.__count += 1
+
+        day = time.strftime("%Y-%m-%d", time.localtime(when))
+        if day not in self.__days or score > self.__days[day]:
+            self.__days[day] = score
+
+        # top is sorted, best first
+        if len(self.__top) < self.TOP_SIZE or score > self.__top[-1][0]:
+            i = len(self.__top)
+            while i > 0 and self.__top[i - 1][0] < score:
+                i -= 1
+            self.__top.insert(i, (score, when))
+            del self.__top[self.TOP_SIZE:]
+
+    def __load(self) -> None:
+        """Read index, then only records that index does not cover"""
+        try:
+            with open(self.__index_path, "r", encoding="utf-8") as file:
+                index = json.load(file)
+
+            self.__top = [tuple(run) for run in index["top"]]
+            self.__days = index["days"]
+            self.__count = index["count"]
+            self.__log_size = index["log_size"]
+        except (OSError, ValueError, KeyError):
+            # no index or it is broken, read the whole log
+            self.__top, self.__days = [], {}
+            self.__count = self.__log_size = 0
+
+        if not os.path.exists(self.__path):
+            if self.__count:
+                self.__top, self.__days = [], {}
+                self.__count = self.__log_size = 0
+            return
+
+        with open(self.__path, "r+b") as file:
+            size = file.seek(0, os.SEEK_END)
+
+            # log is shorter than index, index is not of this log
+            if size < self.__log_size:
+                self.__top, self.__days = [], {}
+                self.__count = self.__log_size = 0
+
+            file.seek(self.__log_size)
+            good = self.__log_size
+
+            while True:
+                record = file.read(RECORD.size)
+                if len(record) < RECORD.size:
+                    break
+
+                # a broken record is skipped, records are all the same
+                # size so the next ones are still aligned
+                good += RECORD.size
+                run = self._unpack(record)
+                if run is not None:
+                    self.__index_run(run[0], run[1])
+
+            # only a record cut by a crash at the end is dropped,
+            # so the next record is appended aligned
+            if good < size:
+                file.truncate(good)
+
+        if good != self.__log_size:
+            self.__log_size = good
+            self.__save_index(self.__dump_index())
+
+    def __dump_index(self) -> str:
+        """Get index as JSON text"""
+        return json.dumps({
+            "count": self.__count,
+            "log_size": self.__log_size,
+            "top": self.__top,
+            "days": self.__days
+        })
+
+    def __save_index(self, index: str) -> None:
+        """Replace index file atomically, it is either old or new"""
+        temp = self.__index_path + ".tmp"
+
+        with open(temp, "w", encoding="utf-8") as file:
+            file.write(index)
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temp, self.__index_path)
+        _fsync_directory(os.path.dirname(os.path.abspath(self.__index_path)))
+
+    # Access data part
+    def top(self, k: int = 10) -> List[Tuple[int, float]]:
+        """Get best runs
+
+        Args:
+            k (int): number of runs, at most TOP_SIZE
+
+        Returns:
+            List[Tuple[int, float]]: score and unix time, best first
+        """
+        with self.__lock:
+            return self.__top[:k]
+
+    def best_of_day(self, day: str) -> int | None:
+        """Get best score of a day
+
+        Args:
+            day (str): local date like "2024-12-31"
+
+        Returns:
+            int | None: best score, `None` when no run on that day
+        """
+        with self.__lock:
+            return self.__days.get(day)
+
+    def get_high_score(self) -> int:
+        """Get best score of every run
+
+        Returns:
+            int: best score, 0 when there is no run
+        """
+        with self.__lock:
+            return self.__top[0][0] if self.__top else 0
+
+    def get_count(self) -> int:
+        """Get number of runs that are written
+
+        Returns:
+            int: number of runs in the log
+        """
+        with self.__lock:
+            return self.__count
+
+
+def _fsync_directory(path: str) -> None:
+    """Sync a directory, a rename in it is durable only after this.
+    Some systems cannot open a directory, there it is skipped"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
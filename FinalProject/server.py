@@ -0,0 +1,532 @@
+"""
+    Module that contains GameServer, an asyncio server that runs many
+    headless games at once and sends the world of every game to its
+    client after every tick
+
+    Server is authoritative, a client only sends its inputs. Every
+    connection is one session with its own seeded Simulation, and one
+    tick loop steps every session, so hundreds of games share one
+    process and one core.
+
+    Protocol over TCP (little endian):
+        server -> client   HELLO once, then a snapshot frame after every
+                           tick, see snapshot.py; first frame is a
+                           keyframe, the next ones are deltas
+        client -> server   one byte of packed inputs when they change,
+                           the last byte is used until the next one
+
+    Run:
+        python server.py --port 8765                  # serve clients
+        python server.py --load 300 --seconds 10      # local clients
+        python server.py --bench 500                  # sessions per core
+"""
+import argparse
+import asyncio
+import random
+import struct
+import time
+from typing import Dict, List
+
+from montecarlo import ScriptedPilot
+from simulation import Simulation, INPUT_RESTART, INPUT_START
+from snapshot import HEADER, SnapshotEncoder
+
+
+# magic "ARSV", version, tick rate, seed, session id
+HELLO = struct.Struct("<4sBdqI")
+MAGIC = b"ARSV"
+VERSION = 2
+
+
+class Session:
+    """One game of one client
+
+    Attributes:
+        session_id (int): number of session in the server
+        sim (Simulation): game of this session
+        writer (asyncio.StreamWriter | None): connection to client,
+                                              `None` for a local session
+        encoder (SnapshotEncoder): packs world of the game, its last
+                                   frame is the last one that is sent
+        inputs (int): last inputs that client sent
+        ticks (int): ticks that this game ran
+        dropped (int): frames that are not sent because client
+                       does not read them fast enough
+        step_time (float): time of the last step in seconds
+        debt (float): step time above its fair share that the session
+                      has not paid back by waiting, in seconds
+    """
+
+    __slots__ = ("session_id", "sim", "writer", "encoder", "inputs",
+                 "ticks", "dropped", "step_time", "debt")
+
+    def __init__(self,
+                 session_id: int,
+                 sim: Simulation,
+                 writer: asyncio.StreamWriter | None = None) -> None:
+        self.session_id = session_id
+        self.sim = sim
+        self.writer = writer
+        self.encoder = SnapshotEncoder()
+        self.inputs = 0
+        self.ticks = 0
+        self.dropped = 0
+        self.step_time = 0.0
+        self.debt = 0.0
+
+    def pack_state(self) -> bytes:
+        """Pack world of the game after the last tick, a frame that is
+        packed is a delta to this one so it should be sent
+
+        Returns:
+            bytes: snapshot frame with player, missiles and coins
+        """
+        return self.encoder.encode(self.sim, self.ticks)
+
+
+class GameServer:
+    """Run many sessions on one tick loop
+
+    Every tick steps sessions one after another until TICK_BUDGET of
+    the tick is used. Sessions that are not reached run first on the
+    next tick. A session whose step takes longer than its fair share
+    of the budget skips ticks until the others had the same time, so
+    one slow game runs slower but the others keep the tick rate. Share
+    is the whole budget until a tick runs out of time, then it is
+    budget / sessions.
+    Frames are written without waiting; a client whose buffer is
+    full loses frames instead of blocking the loop. A frame that is
+    dropped is not packed, so the next delta is based on the last
+    frame that the client has.
+
+    Attributes:
+        TICK_BUDGET (float): part of a tick that stepping can use
+        MAX_BUFFER (int): bytes waiting for a client before its frames
+                          are dropped
+        MAX_LATE_TICKS (int): ticks that loop can be late before it
+                              stops catching up
+        BACKLOG (int): connections that can wait to be accepted,
+                       hundreds of clients connect at once
+        tick_rate (float): ticks per second of every session
+        seed (int): seed of session 0, session i uses seed + i
+
+    Medthods:
+        start(): listen for clients
+        run(): run tick loop until stop() is called
+        stop(): stop tick loop and close every session
+        tick(): step and broadcast once
+        add_session(): add a session without a connection
+        remove_session(): close and remove a session
+        get_sessions(): get every session
+        get_stats(): get counters of the server
+    """
+
+    TICK_BUDGET = 0.8
+    MAX_BUFFER = 64 * 1024
+    MAX_LATE_TICKS = 5
+    BACKLOG = 1024
+
+    def __init__(self,
+                 tick_rate: int | float = Simulation.TICK_RATE,
+                 seed: int = 0) -> None:
+
+        assert isinstance(tick_rate, (int, float)) and tick_rate > 0, \
+            f"tick_rate should be positive int or float, but got {tick_rate}"
+
+        self.__tick_rate = tick_rate
+        self.__tick_dt = 1 / tick_rate
+        self.__seed = seed
+
+        self.__sessions: Dict[int, Session] = {}
+        self.__next_id = 0
+
+        # first session of the next tick, it moves on when a tick
+        # runs out of budget so every session gets its turn
+        self.__cursor = 0
+        self.__overloaded = False
+
+        self.__server = None
+        self.__running = False
+
+        # Statistic
+        self.__ticks = 0
+        self.__late_ticks = 0
+        self.__deferred = 0
+        self.__throttled = 0
+        self.__tick_time = 0.0
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Listen for clients
+
+        Args:
+            host (str): address to listen on
+            port (int): port, 0 chooses a free one
+
+        Returns:
+            int: port that server listens on
+        """
+        self.__server = await asyncio.start_server(self.__handle, host, port,
+                                                   backlog=self.BACKLOG)
+        return self.__server.sockets[0].getsockname()[1]
+
+    async def run(self) -> None:
+        """Run tick loop at tick_rate until stop() is called"""
+        self.__running = True
+        deadline = time.perf_counter()
+
+        while self.__running:
+            self.tick()
+
+            deadline += self.__tick_dt
+            delay = deadline - time.perf_counter()
+
+            # too far behind, drop the lost ticks instead of
+            # running them all at once
+            if delay < -self.MAX_LATE_TICKS * self.__tick_dt:
+                self.__late_ticks += 1
+                deadline = time.perf_counter()
+                delay = 0
+
+            # sleep also lets connections read inputs and send frames
+            await asyncio.sleep(max(delay, 0))
+
+    async def stop(self) -> None:
+        """Stop tick loop and close every session"""
+        self.__running = False
+
+        if self.__server is not None:
+            self.__server.close()
+            await self.__server.wait_closed()
+            self.__server = None
+
+        for session_id in list(self.__sessions):
+            self.remove_session(session_id)
+
+    def tick(self) -> int:
+        """Step sessions until budget of this tick is used, then send
+        the new world to their clients
+
+        Returns:
+            int: number of sessions that are stepped
+        """
+        start = time.perf_counter()
+        budget = self.__tick_dt * self.TICK_BUDGET
+
+        sessions = list(self.__sessions.values())
+        count = len(sessions)
+        # while every session fits, only one that is slower than the
+        # whole budget is held back, otherwise every one gets its share
+        fair = budget / count if self.__overloaded and count else budget
+        visited = 0
+        stepped = 0
+
+        while visited < count and time.perf_counter() - start < budget:
+            session = sessions[(self.__cursor + visited) % count]
+            visited += 1
+
+            # session that used more than its share waits until
+            # the others have had the same time
+            if session.debt > 0:
+                session.debt -= fair
+                self.__throttled += 1
+                continue
+
+            step_start = time.perf_counter()
+            try:
+                session.sim.step(session.inputs, self.__tick_dt)
+                session.ticks += 1
+                self.__send(session)
+            except Exception as e:
+                print(f"Error in session {session.session_id}: {e}")
+                self.remove_session(session.session_id)
+
+            session.step_time = time.perf_counter() - step_start
+            session.debt = max(session.step_time - fair, 0.0)
+            stepped += 1
+
+        self.__overloaded = time.perf_counter() - start >= budget
+        self.__deferred += count - visited
+        self.__cursor = (self.__cursor + visited) % count if count else 0
+
+        self.__ticks += 1
+        self.__tick_time += time.perf_counter() - start
+        return stepped
+
+    def add_session(self,
+                    writer: asyncio.StreamWriter | None = None) -> Session:
+        """Add a session, it is stepped from the next tick
+
+        Args:
+            writer (asyncio.StreamWriter | None): connection of client
+
+        Returns:
+            Session: new session
+        """
+        session_id = self.__next_id
+        self.__next_id += 1
+
+        sim = Simulation(tick_rate=self.__tick_rate,
+                         seed=self.__seed + session_id)
+        sim.reset()
+
+        session = Session(session_id, sim, writer)
+        self.__sessions[session_id] = session
+        return session
+
+    def remove_session(self, session_id: int) -> None:
+        """Close and remove a session, nothing happens when it is gone
+
+        Args:
+            session_id (int): number of session
+        """
+        session = self.__sessions.pop(session_id, None)
+
+        if session is not None and session.writer is not None:
+            session.writer.close()
+
+    def __send(self, session: Session) -> None:
+        """Write frame of session without waiting for the client"""
+        writer = session.writer
+        if writer is None:
+            return
+
+        if writer.is_closing():
+            self.remove_session(session.session_id)
+        elif writer.transport.get_write_buffer_size() > self.MAX_BUFFER:
+            session.dropped += 1
+        else:
+            writer.write(session.pack_state())
+
+    async def __handle(self,
+                       reader: asyncio.StreamReader,
+                       writer: asyncio.StreamWriter) -> None:
+        """Serve one client, read its inputs until it disconnects"""
+        session = self.add_session(writer)
+        writer.write(HELLO.pack(MAGIC, VERSION, float(self.__tick_rate),
+                                self.__seed + session.session_id,
+                                session.session_id))
+
+        try:
+            while True:
+                data = await reader.read(256)
+                if not data:
+                    break
+
+                # only the latest inputs matter
+                session.inputs = data[-1]
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.remove_session(session.session_id)
+
+    # Access data part
+    def get_sessions(self) -> List[Session]:
+        """Get every session
+
+        Returns:
+            List[Session]: sessions that are running
+        """
+        return list(self.__sessions.values())
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get counters of the server
+
+        Returns:
+            Dict[str, float]: sessions, ticks, late_ticks, deferred and
+                              throttled steps, dropped frames and
+                              mean tick time in ms
+        """
+        return {
+            "sessions": len(self.__sessions),
+            "ticks": self.__ticks,
+            "late_ticks": self.__late_ticks,
+            "deferred": self.__deferred,
+            "throttled": self.__throttled,
+            "dropped": sum(s.dropped for s in self.__sessions.values()),
+            "tick_ms": self.__tick_time / max(self.__ticks, 1) * 1e3
+        }
+
+
+def bench(sessions: int,
+          ticks: int = 600,
+          seed: int = 0,
+          tick_rate: int | float = Simulation.TICK_RATE) -> float:
+    """Measure how many sessions one core can run at tick rate,
+    sessions have no connection and are played by ScriptedPilot
+
+    Args:
+        sessions (int): number of sessions that are stepped together
+        ticks (int): ticks that are measured
+        seed (int): seed of session 0 and its pilot
+        tick_rate (int | float): ticks per second of every session
+
+    Returns:
+        float: sessions that fit in one tick of one core
+    """
+    server = GameServer(tick_rate, seed)
+    players = []
+    for i in range(sessions):
+        session = server.add_session()
+        players.append((session, ScriptedPilot(random.Random(seed + i))))
+
+    # no budget, every session is stepped every tick
+    server.TICK_BUDGET = float("inf")
+    elapsed = 0.0
+
+    for _ in range(ticks):
+        for session, pilot in players:
+            session.inputs = pilot.choose(session.sim) \
+                | INPUT_START | INPUT_RESTART
+
+        start = time.perf_counter()
+        server.tick()
+        elapsed += time.perf_counter() - start
+
+    per_session = elapsed / ticks / sessions
+    return (1 / tick_rate) / per_session
+
+
+async def read_frame(reader: asyncio.StreamReader) -> bytes:
+    """Read one snapshot frame from the server
+
+    Args:
+        reader (asyncio.StreamReader): connection after HELLO
+
+    Returns:
+        bytes: frame for SnapshotDecoder.decode()
+
+    Raises:
+        asyncio.IncompleteReadError: server closed the connection
+    """
+    head = await reader.readexactly(HEADER.size)
+    size = int.from_bytes(head[:4], "little")
+    return head + await reader.readexactly(size - HEADER.size)
+
+
+async def run_client(host: str,
+                     port: int,
+                     seconds: float,
+                     rng: random.Random,
+                     stalled: bool = False) -> int:
+    """Play on the server with random inputs
+
+    Args:
+        host (str): address of server
+        port (int): port of server
+        seconds (float): how long to play
+        rng (random.Random): random of inputs
+        stalled (bool): never read frames, like a client that hangs
+
+    Returns:
+        int: number of frames that are received
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    await reader.readexactly(HELLO.size)
+
+    received = 0
+    end = time.perf_counter() + seconds
+    writer.write(bytes((INPUT_START,)))
+
+    try:
+        while time.perf_counter() < end:
+            if stalled:
+                await asyncio.sleep(0.1)
+                continue
+
+            await asyncio.wait_for(read_frame(reader),
+                                   timeout=max(end - time.perf_counter(), 0))
+            received += 1
+
+            # change keys about twice a second
+            if rng.random() < 1 / 30:
+                inputs = rng.choice((0, 1, 2)) | INPUT_START | INPUT_RESTART
+                writer.write(bytes((inputs,)))
+    except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+    return received
+
+
+async def load_test(clients: int,
+                    seconds: float,
+                    stalled: int = 0,
+                    tick_rate: int | float = Simulation.TICK_RATE) -> None:
+    """Run server and clients in this process and print tick rate
+    that the server keeps
+
+    Args:
+        clients (int): number of clients
+        seconds (float): how long clients play
+        stalled (int): clients that never read their frames
+        tick_rate (int | float): ticks per second of the server
+    """
+    server = GameServer(tick_rate)
+    port = await server.start()
+    loop = asyncio.create_task(server.run())
+
+    rng = random.Random(0)
+    results = await asyncio.gather(*(
+        run_client("127.0.0.1", port, seconds, random.Random(rng.random()),
+                   stalled=i < stalled)
+        for i in range(clients)))
+
+    stats = server.get_stats()
+    await server.stop()
+    await loop
+
+    playing = [r for i, r in enumerate(results) if i >= stalled]
+    rate = sum(playing) / max(len(playing), 1) / seconds
+    print(f"{clients} clients ({stalled} stalled) for {seconds:.0f}s: "
+          f"{rate:.1f} frames/s per client, tick {stats['tick_ms']:.2f} ms, "
+          f"{stats['late_ticks']} late, {stats['deferred']} deferred and "
+          f"{stats['throttled']} throttled steps, "
+          f"{stats['dropped']} dropped frames")
+
+
+def main() -> None:
+    """Command line of game server"""
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip(),
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tick-rate", type=float, default=Simulation.TICK_RATE,
+                        help="ticks per second, collision is swept so "
+                             "low rates do not miss hits")
+    parser.add_argument("--bench", type=int, metavar="SESSIONS", default=None,
+                        help="measure sessions per core and exit")
+    parser.add_argument("--load", type=int, metavar="CLIENTS", default=None,
+                        help="run local clients against the server and exit")
+    parser.add_argument("--stalled", type=int, default=0,
+                        help="clients of --load that never read")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    if args.bench:
+        per_core = bench(args.bench, seed=args.seed, tick_rate=args.tick_rate)
+        print(f"{args.bench} sessions: {per_core:.0f} sessions per core "
+              f"at {args.tick_rate:g} ticks/s")
+        return
+
+    if args.load:
+        asyncio.run(load_test(args.load, args.seconds, args.stalled,
+                              args.tick_rate))
+        return
+
+    async def serve() -> None:
+        server = GameServer(args.tick_rate, args.seed)
+        port = await server.start(args.host, args.port)
+        print(f"serving on {args.host}:{port}")
+        await server.run()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
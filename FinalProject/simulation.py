@@ -0,0 +1,874 @@
+"""
+    Module that contains the simulation core of the game
+    without display, font or event of pygame
+"""
+
+import random
+from abc import ABC, abstractmethod
+from typing import List, TYPE_CHECKING
+
+import numpy as np
+
+from baseairplane import Airplane, Missile
+from coin import Coin, CoinFactory
+from swarm import MissileSwarm
+from spatialhash import SpatialHash, CoinGrid
+from collision import CollisionStats, narrow_phase, swept_narrow_phase
+from profiler import (FrameProfiler, PHASE_EVENTS, PHASE_UPDATE_POSITIONS,
+                      PHASE_CHECK_COLISION, PHASE_INCREASE_SCORE)
+from scheduler import Scheduler
+
+if TYPE_CHECKING:
+    from replay import ReplayReader, ReplayWriter
+
+
+# Input of one tick packed in bits
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_START = 4
+INPUT_RESTART = 8
+
+# States of the game, messages and snapshots send index of a state
+STATES = ("menu", "playing", "died")
+
+
+class InterfaceClock(ABC):
+    """Interface of clock that tells simulation time
+
+    Medthods:
+        get_time(): Abstract medthod that return current time in seconds
+        advance(): Abstract medthod that is called every step with dt
+    """
+    @abstractmethod
+    def get_time(self) -> float:
+        """should return current time in seconds"""
+
+    @abstractmethod
+    def advance(self, dt: float) -> None:
+        """should be called once every step"""
+
+
+class ManualClock(InterfaceClock):
+    """Clock that moves only when simulation steps
+
+    Attributes:
+        time (float): current time in seconds
+
+    Medthods:
+        get_time(): return current time
+        advance(): move time forward by dt
+    """
+
+    def __init__(self, time: float = 0.0) -> None:
+        self.__time = time
+
+    def get_time(self) -> float:
+        """get current time
+
+        Returns:
+            float: current time in seconds
+        """
+        return self.__time
+
+    def advance(self, dt: float) -> None:
+        """move time forward by dt
+
+        Args:
+            dt (float): time in seconds
+        """
+        self.__time += dt
+
+
+class Simulation:
+    """Simulation core of the game. It contains player, missiles, coins,
+    spawning, collision and scoring, but nothing that needs a display.
+    It can be stepped as fast as the CPU allows with a ManualClock.
+
+    Attributes:
+        SCREEN_WIDTH (int): Width of the window.
+
+        SCREEN_HEIGHT (int): Height of the window.
+
+        WORLD_WIDTH (int): Width of the arena, camera scrolls over it.
+
+        WORLD_HEIGHT (int): Height of the arena.
+
+        TICK_RATE (int): Default number of fixed ticks per second.
+
+        BASE_TICK_RATE (int): Tick rate that speeds and turn rates
+                              are tuned for, they are per tick at
+                              this rate and scaled at other rates.
+
+        MAX_SUBSTEPS (int): Most ticks that one frame can run to
+                            catch up when frames are slow.
+
+        MISSILE_SPAWN_TIME (int): Time interval (in seconds)
+                                  between missile spawns.
+
+        MAX_MISSILES (int): Maximum number of missiles allowed on screen.
+
+        SPAWN_POSITION (list of tuples): Predefined missile spawn positions
+                                         around the arena.
+
+        AIRPLANE_SIZE (int): Size of the player's airplane.
+
+        AIRPLANE_SPEED (int): Speed of the airplane.
+
+        AIRPLANE_ROTATION_ANGLE (int): Angle (in degrees) the airplane
+                                       rotates per input.
+
+        AIRPLANE_EFFECT_TIME (int): Duration for which temporary
+                                    effects last on the airplane.
+
+        MISSILE_SIZE (int): Size of each missile.
+
+        MISSILE_SPEED (int): Starting speed of missiles.
+
+        MISSILE_ACCELERATION (float): Rate at which missile speed increases.
+
+        MISSILE_MAX_SPEED (float): Maximum speed a missile can achieve.
+
+        MISSLIE_MAX_TURN_RATE (int): Maximum rate (in degrees)
+                                     at which a missile can turn.
+
+        MISSILE_CELL_SIZE (int): Cell size of spatial hash for missiles,
+                                 large enough that touching missiles
+                                 are always in neighbour cells.
+
+        SWEPT_COLLISION (bool): Test missiles along their whole move
+                                in a tick, so they cannot pass through
+                                each other or the player at low tick
+                                rates. `False` tests only end places.
+
+        COIN_SPAWN_TIME (int): Time interval (in seconds) between coin spawns.
+
+        COIN_SCORE (int): Score increment for collecting a coin.
+
+        COIN_RADIUS (int): Radius of each coin.
+
+        COIN_CELL_SIZE (int): Cell size of the coin grid.
+
+        COIN_TYPES (Tuple[str, ...]): Type of every coin that spawns.
+
+        COIN_WEIGHTS (Tuple[float, ...]): Chance of every coin type.
+
+        COIN_SPAWN_MARGIN (int): Coins spawn at least this far
+                                 from the edge of the arena.
+
+        clock (InterfaceClock): Clock that scheduler reads.
+
+        scheduler (Scheduler): Timed events of the game, missile waves,
+                               coin spawns and end of effects.
+
+        rng (random.Random): Random of every spawn, seeded by seed.
+
+        missiles_dodged (int): Missiles that are gone without hitting
+                               player in this session.
+
+        collision_stats (CollisionStats): Pairs that every stage of
+                                          collision test rejects.
+
+        coins_collected (int): Coins that are collected in this session.
+
+        tick_dt (float): Length of one fixed tick in seconds.
+
+        profiler (FrameProfiler | None): Records time of every phase,
+                                         `None` when it is disabled.
+
+        recorder (ReplayWriter | None): Writes inputs of every tick.
+
+        replay (ReplayReader | None): Gives inputs of every tick
+                                      instead of the player.
+
+    Methods:
+        set_player(player): Sets the player (Airplane) object.
+
+        set_missiles(missiles): Sets the list of missiles in the game.
+
+        set_coin(coin): Sets the list of coins in the game.
+
+        set_profiler(profiler): Enables or disables phase timing.
+
+        set_recorder(recorder): Starts or stops recording inputs.
+
+        set_replay(replay): Plays inputs of a replay instead of the player.
+
+        step(inputs, dt): Runs one tick of the game with packed inputs.
+
+        advance_frame(frame_time, inputs): Runs as many fixed ticks as
+                                           frame_time covers.
+
+        save_previous(): Keeps place of player and missiles before a tick
+                         so they can be drawn between two ticks.
+
+        reset(): Resets the game state after the player dies,
+                 preparing for a new session.
+
+        update_positions(dt): Updates the positions of player and missiles
+                              based on elapsed time.
+
+        check_collision(): Checks for collisions between the player,
+                           missiles, and coins.
+
+        check_discrete_colision(): Checks for collisions of player and
+                                   missiles at their place now.
+
+        check_swept_colision(): Checks for collisions of player and
+                                missiles along their moves in a tick.
+
+        remove_coin(coin): Removes a coin from the list in place.
+
+        start_timers(): Schedules first missile wave and coin spawn.
+
+        spwan_missiles(): Spawns a wave of missiles at random positions
+                          and schedules the next wave.
+
+        increase_score_misslie(): Increases the score based on
+                                  missile count changes.
+
+        spawn_coin(): Spawns a coin of a random type at a random position
+                      and schedules the next coin.
+
+        reset_effect_time(): Ends temporary player effect, it is
+                             scheduled when the effect starts.
+    """
+
+    # Constant value
+    SCREEN_WIDTH = 800
+    SCREEN_HEIGHT = 600
+    WORLD_WIDTH = SCREEN_WIDTH * 2
+    WORLD_HEIGHT = SCREEN_HEIGHT * 2
+
+    # Constant for fixed timestep
+    TICK_RATE = 60
+    BASE_TICK_RATE = 60
+    MAX_SUBSTEPS = 5
+
+    # Constant for Airplane
+    AIRPLANE_SIZE = 8
+    AIRPLANE_SPEED = 6
+    AIRPLANE_ROTATION_ANGLE = 7  # degrees per second
+    AIRPLANE_EFFECT_TIME = 3
+
+    # Constant for Missile
+    MISSILE_SIZE = 5
+    MISSILE_SPEED = 6
+    MISSILE_ACCELERATION = 0.1
+    MISSILE_MAX_SPEED = 6.5
+    MISSLIE_MAX_TURN_RATE = 3.5  # degrees per second
+
+    # Missile box is at most sqrt(2) * size from its center
+    # so two missiles can touch only when centers are < 2.83 * size apart
+    MISSILE_CELL_SIZE = MISSILE_SIZE * 3
+
+    # missile moves 6.5 pixel a tick, more than it is wide,
+    # so end places alone can miss a hit even at 60 ticks
+    SWEPT_COLLISION = True
+
+    # Constant for Coin
+    COIN_SPAWN_TIME = 4
+    COIN_SCORE = 5
+    COIN_RADIUS = 15
+
+    # a pickup looks in at most 2 x 2 cells
+    COIN_CELL_SIZE = COIN_RADIUS * 2
+
+    # type of a new coin is chosen with these weights
+    COIN_TYPES = ("normal", "invincible", "delete_missile")
+    COIN_WEIGHTS = (0.6, 0.3, 0.1)
+    COIN_SPAWN_MARGIN = 50
+
+    # Missile generation constant
+    MISSILE_SPAWN_TIME = 3.5  # Seconds between spawns
+    MAX_MISSILES = 4
+    SPAWN_POSITION = [
+        (0, 0),
+        (WORLD_WIDTH, 0),
+        (0, WORLD_HEIGHT),
+        (WORLD_WIDTH, WORLD_HEIGHT),
+        (WORLD_WIDTH/2, 0),
+        (WORLD_WIDTH/2, WORLD_HEIGHT),
+        (0, WORLD_HEIGHT/2),
+        (WORLD_WIDTH, WORLD_HEIGHT/2)
+    ]
+
+    def __init__(self,
+                 clock: InterfaceClock | None = None,
+                 tick_rate: int | float = TICK_RATE,
+                 seed: int | None = None) -> None:
+
+        assert clock is None or isinstance(clock, InterfaceClock), \
+            f"clock should be InterfaceClock, but got {type(clock)}"
+
+        assert isinstance(tick_rate, (int, float)) and tick_rate > 0, \
+            f"tick_rate should be positive int or float, but got {tick_rate}"
+
+        self.clock = clock if clock is not None else ManualClock()
+
+        # spawns and effects run when their time comes, nothing polls
+        self.scheduler = Scheduler(self.get_time)
+        self.missile_timer = None
+        self.coin_timer = None
+        self.effect_timer = None
+
+        # every random spawn comes from here, same seed is same game
+        self.rng = random.Random(seed)
+
+        # Fixed timestep
+        self.tick_dt = 1 / tick_rate
+        self.accumulator = 0.0
+
+        # Instrumentation, None costs only one check per phase
+        self.profiler = None
+
+        # Replay, inputs of every tick are written or read here
+        self.recorder = None
+        self.replay = None
+
+        # Main object
+        # missiles is a list of views onto rows of the swarm
+        self.swarm = MissileSwarm()
+        self.missiles = self.swarm.get_missiles()
+        self.missile_grid = SpatialHash(self.MISSILE_CELL_SIZE)
+
+        # pairs that boxes and exact test reject, see CollisionStats
+        self.collision_stats = CollisionStats()
+        self.player = None
+        self.prev_player = None
+        self.coin = []
+
+        # coins never move, so they are indexed once when they spawn
+        self.coin_grid = CoinGrid(self.COIN_CELL_SIZE)
+
+        # Factory
+        self.coin_factory = CoinFactory()
+
+        # State
+        self.last_num = 0
+        self.high_score = 0
+        self.score = 0
+        self.state = "menu"
+        self.player_effect = ""
+
+        # Statistic of this session
+        self.missiles_dodged = 0
+        self.coins_collected = 0
+
+    # Set data
+    def set_player(self, player: Airplane) -> None:
+        """set player of this game
+
+        Args:
+            player (Airplane): The airplane object representing the player
+        """
+        assert isinstance(player, Airplane), \
+            f"player should be Airplane, but got {type(player)}"
+
+        self.player = player
+
+    def set_missiles(self, missiles: List[Missile]) -> None:
+        """
+        Sets the list of missiles in the game.
+
+        Missiles are copied into the swarm, so later change is made
+        on `self.missiles` not on the given objects.
+
+        Args:
+            missiles (List[Missile]): A list of Missile objects in the game.
+        """
+        assert isinstance(missiles, list) and \
+            all(isinstance(m, Missile) for m in missiles), \
+            f"missiles should be List[Missile], but got {type(missiles)}"
+        self.swarm.set_missiles(missiles)
+
+    def set_coin(self, coins: List[Coin]) -> None:
+        """Sets the list of coins in the game.
+
+        Args:
+            coin (List[Coin]): A list of Coin objects in the game.
+        """
+        assert isinstance(coins, list) and \
+            all(isinstance(c, Coin) for c in coins), \
+            f"Coin should be List[Coin], but got {type(coins)}"
+        self.coin = coins
+
+        self.coin_grid.clear()
+        for c in coins:
+            if not c.get_collected():
+                self.coin_grid.insert(c)
+
+    def set_profiler(self, profiler: FrameProfiler | None) -> None:
+        """Set profiler that records time of every phase
+
+        Args:
+            profiler (FrameProfiler | None): `None` to disable timing
+        """
+        assert profiler is None or isinstance(profiler, FrameProfiler), \
+            f"profiler should be FrameProfiler or None, " \
+            f"but got {type(profiler)}"
+
+        self.profiler = profiler
+
+    def set_recorder(self, recorder: "ReplayWriter | None") -> None:
+        """Set recorder that writes inputs of every tick
+
+        Args:
+            recorder (ReplayWriter | None): `None` to stop recording
+        """
+        self.recorder = recorder
+
+    def set_replay(self, replay: "ReplayReader | None") -> None:
+        """Set replay that gives inputs of every tick
+
+        Args:
+            replay (ReplayReader | None): `None` to use inputs of player
+        """
+        self.replay = replay
+
+    def get_time(self) -> float:
+        """Get current time of simulation
+
+        Returns:
+            float: time in seconds from the clock
+        """
+        return self.clock.get_time()
+
+    def advance_frame(self, frame_time: float, inputs: int) -> float:
+        """Run fixed ticks for time of one frame
+
+        Time that is less than one tick is kept for the next frame.
+        When frames are too slow only MAX_SUBSTEPS ticks are run and
+        the rest of time is dropped, so game slows down instead of
+        running more and more ticks every frame.
+
+        Args:
+            frame_time (float): time (in seconds) since last frame
+            inputs (int): pressed keys, used for every tick of this frame
+
+        Returns:
+            float: how far current time is between last tick and next tick,
+                   0 is last tick and 1 is next tick
+        """
+        self.accumulator += frame_time
+        ticks = 0
+
+        while self.accumulator >= self.tick_dt and ticks < self.MAX_SUBSTEPS:
+            self.save_previous()
+            self.step(inputs, self.tick_dt)
+            self.accumulator -= self.tick_dt
+            ticks += 1
+
+        # cannot catch up, drop whole ticks that are left
+        if self.accumulator >= self.tick_dt:
+            self.accumulator %= self.tick_dt
+
+        return self.accumulator / self.tick_dt
+
+    def save_previous(self) -> None:
+        """Keep place of player and missiles before the next tick"""
+        if self.player:
+            self.prev_player = (self.player.get_center(),
+                                self.player.get_heading())
+        self.swarm.save_previous()
+
+    def step(self, inputs: int, dt: float) -> None:
+        """Run one tick of the game
+
+        Args:
+            inputs (int): pressed keys packed with INPUT_LEFT, INPUT_RIGHT,
+                          INPUT_START and INPUT_RESTART
+            dt (float): The delta time (in seconds) of this tick
+        """
+        assert isinstance(inputs, int), \
+            f"inputs should be int, but got {type(inputs)}"
+
+        # same seed and same inputs of every tick is same game
+        if self.replay is not None:
+            inputs = self.replay.next_inputs()
+        if self.recorder is not None:
+            self.recorder.record(inputs)
+
+        self.clock.advance(dt)
+
+        # speed and turn rate are per tick at BASE_TICK_RATE
+        scale = dt * self.BASE_TICK_RATE
+
+        # if player died always change state to died
+        if self.player and not self.player.get_alive():
+            self.state = "died"
+
+        # State menu
+        if self.state == "menu":
+
+            # When player press P and change to new state
+            if inputs & INPUT_START:
+                self.state = "playing"
+                self.start_timers()
+
+        # playing state
+        elif self.state == "playing":
+
+            # place before this tick, swept collision starts from it
+            self.save_previous()
+
+            # chceck input whether a or d
+            if inputs & INPUT_RIGHT:
+                self.player.rotation_points(
+                    self.AIRPLANE_ROTATION_ANGLE * scale)
+            elif inputs & INPUT_LEFT:
+                self.player.rotation_points(
+                    -self.AIRPLANE_ROTATION_ANGLE * scale)
+
+            # update all of object in game
+            # and record time of every phase when profiler is set
+            prof = self.profiler
+            if prof is not None:
+                prof.start()
+
+            # only events that are due run, spawns and effect ends
+            self.scheduler.run_due()
+            if prof is not None:
+                prof.lap(PHASE_EVENTS)
+
+            self.update_positions(dt, scale)
+            if prof is not None:
+                prof.lap(PHASE_UPDATE_POSITIONS)
+
+            self.check_colision()
+            if prof is not None:
+                prof.lap(PHASE_CHECK_COLISION)
+
+            self.increase_score_misslie()
+            if prof is not None:
+                prof.lap(PHASE_INCREASE_SCORE)
+
+        # State Died
+        elif self.state == "died":
+
+            self.high_score = max(self.high_score, self.score, 0)
+
+            # Check player preesed R
+            if inputs & INPUT_RESTART:
+                self.reset()
+
+    def reset(self) -> None:
+        """Resets the game state after the player dies."""
+        self.state = "menu"
+        self.score = 0
+        self.player_effect = ""
+        self.missiles_dodged = 0
+        self.coins_collected = 0
+
+        # coins that are left are reused by the next game
+        for c in self.coin:
+            self.coin_factory.release(c)
+
+        self.set_missiles([])
+        self.set_coin([])
+        self.set_player(Airplane(
+                        size=self.AIRPLANE_SIZE,
+                        center=(self.WORLD_WIDTH/2, self.WORLD_HEIGHT/2),
+                        speed=self.AIRPLANE_SPEED))
+
+        # timers start again when game starts
+        self.last_num = 0
+        self.scheduler.clear()
+        self.missile_timer = None
+        self.coin_timer = None
+        self.effect_timer = None
+
+    def update_positions(self, dt: float, scale: float = 1.0) -> None:
+        """Updates the positions of the player and missiles based on
+        the elapsed time since the last frame.
+
+        Args:
+            dt (float): The delta time (in seconds) since the last frame update.
+            scale (float): part of per tick speed and turn rate for this dt
+        """
+        assert isinstance(dt, float), f"dt should be float, but got {type(dt)}"
+
+        # cannot find object player
+        if not self.player:
+            return
+
+        # Player need no dt, only part of speed
+        self.player.move_forward(scale)
+
+        # Steer and update every missiles at once need dt for acceleration
+        self.swarm.step(self.player.get_center(), dt, scale)
+
+    def check_colision(self) -> None:
+        """Checks for collisions between the player, missiles, and coins."""
+        if not self.player:
+            return
+
+        # Checking for missiles collding to player and to themself
+        # with no missile there is nothing to test
+        count = len(self.missiles)
+        if self.SWEPT_COLLISION and count > 0:
+            player_hits = self.check_swept_colision()
+        else:
+            player_hits = self.check_discrete_colision()
+
+        # Checking that coin collding to player
+        # We can't check player.is_collding(coin)
+        # Because Coin is circle and bound box is different from Airplane
+        # grid gives only coins around player instead of every coin
+        for c in self.coin_grid.query(self.player.get_center()):
+            self.coin_grid.remove(c)
+            self.remove_coin(c)
+            c.set_is_collected(True)
+            self.score += c.get_score()
+            self.coins_collected += 1
+
+            # Check that coin is not a normal coin
+            if hasattr(c, "get_effect"):
+                effect = c.get_effect()
+
+                if effect == "invincible":
+                    # new coin gives the whole time again
+                    self.player_effect = effect
+                    self.scheduler.cancel(self.effect_timer)
+                    self.effect_timer = self.scheduler.schedule(
+                        self.AIRPLANE_EFFECT_TIME, self.reset_effect_time)
+
+                elif effect == "BOOM":
+                    # killed, so remove_dead() below counts them too
+                    self.swarm.kill(np.arange(len(self.missiles)))
+
+            # coin object is reused by the next spawn
+            self.coin_factory.release(c)
+
+        # Update current missiles
+        # swarm moves alive missiles into rows of dead ones in place
+        # missiles that hit player are counted in score but not dodged
+        removed = self.swarm.remove_dead()
+        self.missiles_dodged += removed - player_hits
+
+    def check_discrete_colision(self) -> int:
+        """Checks for collisions of player and missiles at their place
+        now, missiles that touch each other are both destroyed
+
+        Returns:
+            int: number of missiles that hit player
+        """
+        # with no missile or one missile there is nothing to test,
+        # a server runs many games that are like that most ticks
+        count = len(self.missiles)
+        if count == 0:
+            return 0
+
+        # points and bounding boxes are calculated once for this tick
+        # boxes reject most pairs, then real shapes are tested
+        points = self.swarm.get_points()
+        boxes = self.swarm.get_bounding_boxes()
+        player_hits = 0
+
+        # Player is invincing. So, missiles can go through player
+        # effect ends by itself, see reset_effect_time()
+        if self.player_effect != "invincible":
+            player_box = np.array(self.player.bouncing_box())
+            player_points = np.array(self.player.get_points())
+            hit = narrow_phase(points, boxes, player_points, player_box,
+                               self.collision_stats)
+
+            if len(hit) > 0:
+                self.player.set_is_alive(False)
+                self.swarm.kill(hit)
+                player_hits = len(hit)
+
+        # Checking for missile collding to themself
+        # spatial hash gives only pairs in same or neighbour cells
+        # so we don't have to check every pair of missiles
+        if count > 1:
+            self.missile_grid.build(self.swarm.get_centers())
+            first, second = self.missile_grid.candidate_pairs()
+            hit = narrow_phase(points[first], boxes[first],
+                               points[second], boxes[second],
+                               self.collision_stats)
+            self.swarm.kill(first[hit])
+            self.swarm.kill(second[hit])
+
+        return player_hits
+
+    def check_swept_colision(self) -> int:
+        """Checks for collisions of player and missiles from their place
+        before this tick to their place now, hits are used in order of
+        time so a missile that is destroyed cannot hit anything later
+
+        Returns:
+            int: number of missiles that hit player
+        """
+        swarm = self.swarm
+        nose = swarm.NOSE_UP
+        sizes = swarm.get_sizes()
+
+        start_centers, start_headings = swarm.get_poses(0.0)
+        end_centers, end_headings = swarm.get_poses()
+        start = (start_centers, start_headings - nose)
+        end = (end_centers, end_headings - nose)
+
+        # (time of impact, missile, other missile or -1 for player)
+        events = []
+
+        # Player is invincing. So, missiles can go through player
+        if self.player_effect != "invincible":
+            center, heading = self.player.get_center(), \
+                self.player.get_heading()
+            prev_center, prev_heading = self.prev_player or (center, heading)
+
+            hit, toi = swept_narrow_phase(
+                swarm.SHAPE, start, end, sizes,
+                (np.array(prev_center), prev_heading - nose),
+                (np.array(center), heading - nose),
+                self.player.get_size(), self.collision_stats)
+            events.extend(zip(toi.tolist(), hit.tolist(), [-1] * len(hit)))
+
+        # grid of middle of every move, two missiles can touch only
+        # when middles are as close as their size plus the longest move
+        if len(sizes) > 1:
+            longest = float(np.hypot(*(end_centers - start_centers).T).max())
+            self.missile_grid.build((start_centers + end_centers) / 2,
+                                    self.MISSILE_CELL_SIZE + longest)
+            first, second = self.missile_grid.candidate_pairs()
+
+            hit, toi = swept_narrow_phase(
+                swarm.SHAPE, (start[0][first], start[1][first]),
+                (end[0][first], end[1][first]), sizes[first],
+                (start[0][second], start[1][second]),
+                (end[0][second], end[1][second]), sizes[second],
+                self.collision_stats)
+            events.extend(zip(toi.tolist(), first[hit].tolist(),
+                              second[hit].tolist()))
+
+        # only a few hits in a tick, earliest first
+        dead = set()
+        player_hits = 0
+        for _, missile, other in sorted(events):
+            if missile in dead or other in dead:
+                continue
+
+            dead.add(missile)
+            if other < 0:
+                self.player.set_is_alive(False)
+                player_hits += 1
+            else:
+                dead.add(other)
+
+        if dead:
+            swarm.kill(np.fromiter(dead, np.intp, len(dead)))
+
+        return player_hits
+
+    def remove_coin(self, coin: Coin) -> None:
+        """Remove a coin by moving the last coin into its place,
+        so the list is changed in place without a new list
+
+        Args:
+            coin (Coin): coin in self.coin
+        """
+        i = self.coin.index(coin)
+        self.coin[i] = self.coin[-1]
+        self.coin.pop()
+
+    def start_timers(self) -> None:
+        """Schedule first missile wave and first coin from now"""
+        self.scheduler.cancel(self.missile_timer)
+        self.scheduler.cancel(self.coin_timer)
+
+        self.missile_timer = self.scheduler.schedule(self.MISSILE_SPAWN_TIME,
+                                                     self.spwan_missiles)
+        self.coin_timer = self.scheduler.schedule(self.COIN_SPAWN_TIME,
+                                                  self.spawn_coin)
+
+    def spwan_missiles(self) -> None:
+        """Spawns new missiles at random positions, scheduler runs it
+        every MISSILE_SPAWN_TIME"""
+        num_new_missiles = self.rng.randint(2, self.MAX_MISSILES)
+
+        spawn_postions = self.rng.sample(self.SPAWN_POSITION,
+                                       num_new_missiles)
+
+        for pos in spawn_postions:
+            self.swarm.spawn(
+                size=self.MISSILE_SIZE,
+                center=pos,
+                speed=self.MISSILE_SPEED,
+                acceleration=self.MISSILE_ACCELERATION,
+                max_speed=self.MISSILE_MAX_SPEED,
+                max_turn_rate=self.MISSLIE_MAX_TURN_RATE
+            )
+
+        # Update number of new_missies and time of next wave
+        self.last_num = num_new_missiles
+        self.missile_timer = self.scheduler.schedule(self.MISSILE_SPAWN_TIME,
+                                                     self.spwan_missiles)
+
+    def increase_score_misslie(self) -> None:
+        """Increases the score based on changes in the missile count"""
+        current_num = len(self.missiles)
+
+        # Because we have case that missiles run out of fuel
+        # So we have to check that number of
+        # current missiles is different from last time
+        if current_num < self.last_num:
+            self.score += self.last_num - len(self.missiles)
+            self.last_num = current_num
+
+    def spawn_coin(self) -> None:
+        """Spawns a coin of a random type at a random position,
+        scheduler runs it every COIN_SPAWN_TIME"""
+        margin = self.COIN_SPAWN_MARGIN
+        spawn_area = (
+            (margin, margin),
+            (self.WORLD_WIDTH - margin, self.WORLD_HEIGHT - margin)
+        )
+
+        # random, (x,y)
+        # random type get only one choices with rate
+        # k means we want only one sample and choices return in List
+        rand_type = self.rng.choices(self.COIN_TYPES,
+                                     weights=self.COIN_WEIGHTS, k=1)[0]
+        rand_x = self.rng.randint(spawn_area[0][0], spawn_area[1][0])
+        rand_y = self.rng.randint(spawn_area[0][1], spawn_area[1][1])
+
+        # Use Factory pattern to create differnet type of coin
+        new_coin = self.coin_factory.create_coin(coin_type=rand_type,
+                                                 center=(rand_x, rand_y),
+                                                 score=self.COIN_SCORE,
+                                                 radius=self.COIN_RADIUS)
+
+        # Update
+        self.coin.append(new_coin)
+        self.coin_grid.insert(new_coin)
+        self.coin_timer = self.scheduler.schedule(self.COIN_SPAWN_TIME,
+                                                  self.spawn_coin)
+
+    def reset_effect_time(self) -> None:
+        """Ends temporary effect on the player, scheduler runs it
+        AIRPLANE_EFFECT_TIME after the effect started"""
+        self.player_effect = ""
+        self.effect_timer = None
+
+
+# run headless simulation as fast as possible
+if __name__ == "__main__":
+    import time
+
+    TICKS = 20_000
+
+    sim = Simulation()
+    DT = sim.tick_dt
+    sim.reset()
+    start = time.perf_counter()
+
+    for tick in range(TICKS):
+        # turn left and right in turn, start and restart when it can
+        keys = INPUT_START | INPUT_RESTART
+        keys |= INPUT_LEFT if (tick // 90) % 2 else INPUT_RIGHT
+        sim.step(keys, DT)
+
+    elapsed = time.perf_counter() - start
+    print(f"{TICKS} ticks ({TICKS * DT:.0f}s of game) in {elapsed:.2f}s, "
+          f"{TICKS / elapsed:.0f} ticks/s, high score {sim.high_score}")
+    print(f"collision pairs {sim.collision_stats.get_stats()}")
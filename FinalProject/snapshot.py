@@ -0,0 +1,515 @@
+"""
+    Module that packs the state of a Simulation into small binary
+    snapshots and unpacks them again, so a game can be streamed to a
+    file or a socket
+
+    Positions are kept in 1/16 pixel and headings in 1/65536 of a turn.
+    A keyframe has the whole world, a delta has only the difference of
+    every value to the frame before it. Differences are small, so a
+    block of them is packed with the fewest bytes that fit every value,
+    and a block that did not change costs one byte.
+
+    Frame layout (little endian):
+        header    size u32, flags u8, state u8, tick u32, gap u16,
+                  score i32, high score i32, effect ms u16,
+                  player x i32, y i32, heading u16, missiles u32, coins u32
+        missiles  block of centers, block of headings, alive bits
+        coins     block of centers, block of types, collected bits
+        block     width u8 (0, 1, 2 or 4), then one value of that width
+                  for every number, width 0 means every number is 0
+        bits      one bit for every entity, from np.packbits
+
+    gap is ticks from the frame that a delta is based on, so a reader
+    knows when a frame is lost and waits for the next keyframe.
+"""
+import math
+import struct
+from itertools import chain
+from typing import Iterator, Tuple
+
+import numpy as np
+
+from coin import Coin, CoinFactory
+from simulation import Simulation, STATES
+
+
+# size, flags, state, tick, gap, score, high score, effect ms,
+# player x, y, heading, missiles, coins
+HEADER = struct.Struct("<IBBIHiiHiiHII")
+
+FLAG_KEY = 1
+FLAG_ALIVE = 2
+FLAG_INVINCIBLE = 4
+
+# 1/16 pixel, a missile moves less than 127 of them in one tick
+POSITION_SCALE = 16
+HEADING_STEPS = 1 << 16
+HEADING_SCALE = HEADING_STEPS / (2 * math.pi)
+
+# code of every coin class, same order as CoinFactory.COIN_TYPES
+COIN_CODES = {cls: code
+              for code, cls in enumerate(CoinFactory.COIN_TYPES.values())}
+
+# width of a block by bytes of every value
+WIDTHS = {0: None, 1: np.dtype("<i1"), 2: np.dtype("<i2"), 4: np.dtype("<i4")}
+
+
+class Snapshot:
+    """World state that is unpacked from a frame
+
+    Attributes:
+        tick (int): tick of the frame
+        state (str): "menu", "playing" or "died"
+        score (int): score of the game
+        high_score (int): best score of the session
+        effect_time (float): seconds left of player effect, 0 is none
+        player_alive (bool): `False` when player died
+        invincible (bool): `True` while player is invincible
+        player (np.ndarray): (3,) player x, y and heading in radians
+        missile_centers (np.ndarray): (n, 2) center of every missile
+        missile_headings (np.ndarray): (n,) heading of every missile
+        missile_alive (np.ndarray): (n,) alive flag of every missile
+        coin_centers (np.ndarray): (m, 2) center of every coin
+        coin_types (np.ndarray): (m,) code of every coin, see COIN_CODES
+        coin_collected (np.ndarray): (m,) collected flag of every coin
+    """
+
+    __slots__ = ("tick", "state", "score", "high_score", "effect_time",
+                 "player_alive", "invincible", "player", "missile_centers",
+                 "missile_headings", "missile_alive", "coin_centers",
+                 "coin_types", "coin_collected")
+
+    def __init__(self,
+                 tick: int,
+                 state: str,
+                 score: int,
+                 high_score: int,
+                 effect_time: float,
+                 player_alive: bool,
+                 invincible: bool,
+                 player: np.ndarray,
+                 missile_centers: np.ndarray,
+                 missile_headings: np.ndarray,
+                 missile_alive: np.ndarray,
+                 coin_centers: np.ndarray,
+                 coin_types: np.ndarray,
+                 coin_collected: np.ndarray) -> None:
+        self.tick = tick
+        self.state = state
+        self.score = score
+        self.high_score = high_score
+        self.effect_time = effect_time
+        self.player_alive = player_alive
+        self.invincible = invincible
+        self.player = player
+        self.missile_centers = missile_centers
+        self.missile_headings = missile_headings
+        self.missile_alive = missile_alive
+        self.coin_centers = coin_centers
+        self.coin_types = coin_types
+        self.coin_collected = coin_collected
+
+
+class SnapshotEncoder:
+    """Pack state of a simulation after every tick
+
+    Quantized values of the last frame are kept, so the next frame
+    is packed as the difference to them. Every value is read from the
+    arrays of the swarm or once per coin, no object is made for an
+    entity, and blocks are written straight into one buffer.
+
+    Attributes:
+        KEYFRAME_INTERVAL (int): frames between keyframes, a reader
+                                 that joins late or loses a frame
+                                 waits at most this long
+
+    Medthods:
+        encode(): pack state of a simulation
+        force_keyframe(): make the next frame a keyframe
+        get_stats(): get number of frames and bytes that are packed
+    """
+
+    KEYFRAME_INTERVAL = 60
+
+    def __init__(self, keyframe_interval: int = KEYFRAME_INTERVAL) -> None:
+
+        assert isinstance(keyframe_interval, int) and keyframe_interval > 0, \
+            f"keyframe_interval should be positive int, " \
+            f"but got {keyframe_interval}"
+
+        self.__interval = keyframe_interval
+        self.__since_key = keyframe_interval
+        self.__last_tick = 0
+
+        # quantized values of the last frame and their blocks
+        self.__last = (np.zeros(0, dtype=np.int64), _blocks(0, 0))
+
+        # frame is written here, it grows when a frame does not fit
+        self.__buffer = bytearray(1024)
+
+        # Statistic
+        self.__frames = 0
+        self.__keyframes = 0
+        self.__bytes = 0
+
+    def encode(self, sim: Simulation, tick: int) -> bytes:
+        """Pack state of a simulation
+
+        Args:
+            sim (Simulation): game after a tick
+            tick (int): number of the tick, it should grow
+
+        Returns:
+            bytes: one frame, a keyframe every KEYFRAME_INTERVAL frames
+        """
+        assert isinstance(sim, Simulation), \
+            f"sim should be Simulation, but got {type(sim)}"
+
+        swarm = sim.swarm
+        coins = sim.coin
+        n = len(swarm)
+        m = len(coins)
+
+        key = self.__since_key >= self.__interval
+        self.__since_key = 1 if key else self.__since_key + 1
+
+        # every value of the frame is in one array and blocks are
+        # slices of it, so each step is one NumPy call for all blocks
+        values = np.empty(3 * n + 3 * m)
+        np.multiply(swarm.get_centers(), POSITION_SCALE,
+                    out=values[:2 * n].reshape(n, 2))
+        np.multiply(swarm.get_headings(), HEADING_SCALE,
+                    out=values[2 * n:3 * n])
+
+        # coins are objects, but only their stored tuple and type are read
+        if m:
+            values[3 * n:] = np.fromiter(chain(
+                chain.from_iterable(map(Coin.get_center, coins)),
+                map(COIN_CODES.__getitem__, map(type, coins))), float, 3 * m)
+            values[3 * n:3 * n + 2 * m] *= POSITION_SCALE
+
+        values = np.rint(values, out=values).astype(np.int64)
+        values[2 * n:3 * n] %= HEADING_STEPS
+
+        # keyframe is the difference to an empty frame
+        blocks = _blocks(n, m)
+        if key:
+            self.__last = (values[:0], _blocks(0, 0))
+        diff = _difference(values, blocks, *self.__last)
+        magnitude = np.abs(diff)
+
+        # worst case every value is 4 bytes
+        most = HEADER.size + 4 * len(values) + (n + 7) // 8 + (m + 7) // 8 + 4
+        if len(self.__buffer) < most:
+            self.__buffer = bytearray(most * 2)
+        buffer = self.__buffer
+
+        offset = HEADER.size
+        for i, block in enumerate(blocks):
+            offset = _write_block(buffer, offset, diff[block],
+                                  magnitude[block])
+
+            # missile alive bits are after missile headings,
+            # coin collected bits are after coin types
+            if i == 1:
+                offset = _write_bits(buffer, offset, swarm.get_alive())
+            elif i == 3:
+                offset = _write_bits(buffer, offset, np.fromiter(
+                    map(Coin.get_collected, coins), bool, m))
+
+        self.__last = (values, blocks)
+
+        self.__pack_header(buffer, sim, tick, offset, key)
+        self.__last_tick = tick
+
+        self.__frames += 1
+        self.__keyframes += key
+        self.__bytes += offset
+        return bytes(memoryview(buffer)[:offset])
+
+    def __pack_header(self,
+                      buffer: bytearray,
+                      sim: Simulation,
+                      tick: int,
+                      size: int,
+                      key: bool) -> None:
+        """Pack fixed fields of a frame at the start of buffer"""
+        player = sim.player
+
+        flags = FLAG_KEY if key else 0
+        x = y = heading = 0
+
+        if player is not None:
+            if player.get_alive():
+                flags |= FLAG_ALIVE
+            cx, cy = player.get_center()
+            x = round(cx * POSITION_SCALE)
+            y = round(cy * POSITION_SCALE)
+            heading = round(player.get_heading() * HEADING_SCALE) \
+                % HEADING_STEPS
+
+        if sim.player_effect == "invincible":
+            flags |= FLAG_INVINCIBLE
+
+        effect = 0.0
+        timer = sim.effect_timer
+        if timer is not None and timer.pending:
+            effect = max(timer.time - sim.get_time(), 0.0)
+
+        gap = 0 if key else min(tick - self.__last_tick, 0xFFFF)
+
+        HEADER.pack_into(buffer, 0, size, flags, STATES.index(sim.state),
+                         tick, gap, sim.score, sim.high_score,
+                         min(round(effect * 1000), 0xFFFF), x, y, heading,
+                         len(sim.swarm), len(sim.coin))
+
+    def force_keyframe(self) -> None:
+        """Make the next frame a keyframe, when a new reader joins"""
+        self.__since_key = self.__interval
+
+    # Access data part
+    def get_stats(self) -> Tuple[int, int, int]:
+        """Get number of frames and bytes that are packed
+
+        Returns:
+            Tuple[int, int, int]: frames, keyframes and bytes
+        """
+        return self.__frames, self.__keyframes, self.__bytes
+
+
+class SnapshotDecoder:
+    """Unpack frames of one SnapshotEncoder in the order they are packed
+
+    Blocks are read with np.frombuffer from the frame without a copy,
+    then added to the values of the last frame.
+
+    Medthods:
+        decode(): unpack one frame
+        reset(): forget last frame, wait for a keyframe
+    """
+
+    def __init__(self) -> None:
+        self.__last = None
+        self.__last_tick = 0
+
+    def decode(self, frame: bytes | bytearray | memoryview) -> Snapshot:
+        """Unpack one frame
+
+        Args:
+            frame (bytes | bytearray | memoryview): frame from encode()
+
+        Returns:
+            Snapshot: state of the world at that tick
+
+        Raises:
+            ValueError: frame is cut, or it is a delta of a frame that
+                        this decoder does not have
+        """
+        view = memoryview(frame)
+        if len(view) < HEADER.size:
+            raise ValueError("Frame is shorter than header")
+
+        (size, flags, state, tick, gap, score, high_score, effect,
+         x, y, heading, n, m) = HEADER.unpack_from(view, 0)
+
+        if size != len(view):
+            raise ValueError(f"Frame should be {size} bytes, "
+                             f"but got {len(view)}")
+
+        key = bool(flags & FLAG_KEY)
+        if not key and (self.__last is None
+                        or tick - gap != self.__last_tick):
+            raise ValueError(f"Delta of tick {tick} is not based on "
+                             f"the last frame, wait for a keyframe")
+
+        blocks = _blocks(n, m)
+        values = np.empty(3 * n + 3 * m, dtype=np.int64)
+
+        offset = HEADER.size
+        offset = _read_block(view, offset, values[blocks[0]])
+        offset = _read_block(view, offset, values[blocks[1]])
+        missile_alive, offset = _read_bits(view, offset, n)
+        offset = _read_block(view, offset, values[blocks[2]])
+        offset = _read_block(view, offset, values[blocks[3]])
+        coin_collected, offset = _read_bits(view, offset, m)
+
+        if not key:
+            values = _difference(values, blocks, *self.__last, add=True)
+        values[blocks[1]] %= HEADING_STEPS
+
+        self.__last = (values, blocks)
+        self.__last_tick = tick
+
+        return Snapshot(
+            tick=tick,
+            state=STATES[state],
+            score=score,
+            high_score=high_score,
+            effect_time=effect / 1000,
+            player_alive=bool(flags & FLAG_ALIVE),
+            invincible=bool(flags & FLAG_INVINCIBLE),
+            player=np.array([x / POSITION_SCALE, y / POSITION_SCALE,
+                             dequantize_headings(heading)]),
+            missile_centers=(values[blocks[0]] / POSITION_SCALE).reshape(n, 2),
+            missile_headings=dequantize_headings(values[blocks[1]]),
+            missile_alive=missile_alive,
+            coin_centers=(values[blocks[2]] / POSITION_SCALE).reshape(m, 2),
+            coin_types=values[blocks[3]],
+            coin_collected=coin_collected)
+
+    def reset(self) -> None:
+        """Forget last frame, only a keyframe can be decoded next"""
+        self.__last = None
+
+
+def dequantize_headings(values: np.ndarray) -> np.ndarray:
+    """Get headings in radian in range [-pi, pi)
+
+    Args:
+        values (np.ndarray): headings in 1/65536 of a turn
+
+    Returns:
+        np.ndarray: float64 of same shape
+    """
+    return (values + HEADING_STEPS // 2) % HEADING_STEPS / HEADING_SCALE \
+        - math.pi
+
+
+def split_frames(data: bytes | bytearray | memoryview) -> Iterator[memoryview]:
+    """Split a stream of frames, a cut frame at the end is not given
+
+    Args:
+        data (bytes | bytearray | memoryview): frames one after another
+
+    Yields:
+        memoryview: one frame, it is a view of data without a copy
+    """
+    view = memoryview(data)
+    offset = 0
+
+    while len(view) - offset >= HEADER.size:
+        size = int.from_bytes(view[offset:offset + 4], "little")
+        if size < HEADER.size or offset + size > len(view):
+            return
+
+        yield view[offset:offset + size]
+        offset += size
+
+
+def _blocks(n: int, m: int) -> Tuple[slice, slice, slice, slice]:
+    """Get slices of missile centers, missile headings, coin centers
+    and coin types in the values of a frame"""
+    return (slice(0, 2 * n), slice(2 * n, 3 * n),
+            slice(3 * n, 3 * n + 2 * m), slice(3 * n + 2 * m, 3 * n + 3 * m))
+
+
+def _difference(values: np.ndarray,
+                blocks: Tuple[slice, ...],
+                last: np.ndarray,
+                last_blocks: Tuple[slice, ...],
+                add: bool = False) -> np.ndarray:
+    """Get values minus last block by block, or plus when add is set
+
+    A block that has more values than last block is compared with 0
+    after the end of last block. Difference of headings goes around,
+    65535 to 0 is a step of 1.
+
+    Returns:
+        np.ndarray: new array of the difference or sum
+    """
+    sign = 1 if add else -1
+
+    # same missiles and coins as last frame, most ticks are like that
+    if blocks == last_blocks:
+        result = values + sign * last
+    else:
+        result = values.copy()
+        for block, last_block in zip(blocks, last_blocks):
+            k = min(block.stop - block.start,
+                    last_block.stop - last_block.start)
+            result[block.start:block.start + k] += \
+                sign * last[last_block.start:last_block.start + k]
+
+    if not add:
+        headings = result[blocks[1]]
+        headings += HEADING_STEPS // 2
+        headings %= HEADING_STEPS
+        headings -= HEADING_STEPS // 2
+
+    return result
+
+
+def _write_block(buffer: bytearray,
+                 offset: int,
+                 diff: np.ndarray,
+                 magnitude: np.ndarray) -> int:
+    """Write diff in the fewest bytes that fit its largest magnitude
+
+    Returns:
+        int: offset after the block
+    """
+    top = int(magnitude.max(initial=0))
+
+    if top == 0:
+        width = 0
+    elif top < 0x80:
+        width = 1
+    elif top < 0x8000:
+        width = 2
+    else:
+        width = 4
+
+    buffer[offset] = width
+    offset += 1
+
+    if width:
+        np.ndarray(len(diff), WIDTHS[width], buffer, offset)[:] = diff
+        offset += width * len(diff)
+
+    return offset
+
+
+def _read_block(view: memoryview, offset: int, out: np.ndarray) -> int:
+    """Read one block of differences into out
+
+    Returns:
+        int: offset after the block
+    """
+    width = view[offset]
+    offset += 1
+
+    if width not in WIDTHS:
+        raise ValueError(f"Invalid block width: {width}")
+
+    if width:
+        out[:] = np.frombuffer(view, WIDTHS[width], len(out), offset)
+        offset += width * len(out)
+    else:
+        out[:] = 0
+
+    return offset
+
+
+def _write_bits(buffer: bytearray, offset: int, flags: np.ndarray) -> int:
+    """Write one bit for every flag
+
+    Returns:
+        int: offset after the bits
+    """
+    bits = np.packbits(flags)
+    buffer[offset:offset + len(bits)] = bits.data
+    return offset + len(bits)
+
+
+def _read_bits(view: memoryview,
+               offset: int,
+               count: int) -> Tuple[np.ndarray, int]:
+    """Read count flags that are written by _write_bits()
+
+    Returns:
+        Tuple[np.ndarray, int]: bool flags and offset after the bits
+    """
+    size = (count + 7) // 8
+    bits = np.frombuffer(view, np.uint8, size, offset)
+    flags = np.unpackbits(bits, count=count).view(bool)
+    return flags, offset + size
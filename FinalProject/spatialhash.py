@@ -0,0 +1,289 @@
+"""
+    Module that contains SpatialHash, a uniform grid that finds
+    pairs of objects that are close enough to collide, and CoinGrid,
+    a grid of coins that finds the coins under the player
+"""
+import math
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from coin import Coin
+
+
+class SpatialHash:
+    """Uniform grid broad phase for many objects
+
+    Every object is put into the cell that contains its center. Two
+    objects can only collide when they are in the same cell or in
+    neighbour cells, so only those pairs are returned for testing.
+    Cell size should be at least the largest distance between centers
+    of two objects that touch each other.
+
+    The grid is rebuilt from an array of centers with one sort, so it
+    is cheap to rebuild every tick. With SMALL_COUNT objects or less
+    every pair is returned instead, that is cheaper than the grid.
+
+    Attributes:
+        cell_size (float): width and height of one cell
+        SMALL_COUNT (int): most objects that skip the grid
+
+    Medthods:
+        build(): put every center into the grid
+        candidate_pairs(): get every pair in the same or neighbour cells
+        get_cell_size(): get cell size of this grid
+    """
+
+    # Half of the 8 neighbours plus own cell, so each pair of cells
+    # is visited only once
+    NEIGHBOURS = ((1, -1), (1, 0), (1, 1), (0, 1))
+
+    # cell y is shifted into the low 32 bits of the key
+    KEY_SHIFT = 32
+    KEY_OFFSET = 1 << 31
+
+    SMALL_COUNT = 16
+
+    # every pair of n objects by n, only for n up to SMALL_COUNT
+    _ALL_PAIRS: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def __init__(self, cell_size: int | float) -> None:
+
+        assert isinstance(cell_size, (int, float)) and cell_size > 0, \
+            f"cell_size should be positive int or float, but got {cell_size}"
+
+        self.__cell_size = float(cell_size)
+        self.__order = np.empty(0, dtype=np.intp)
+        self.__keys = np.empty(0, dtype=np.int64)
+        self.__small = None
+
+    def build(self,
+              centers: np.ndarray,
+              cell_size: float | None = None) -> None:
+        """Put every center into the grid
+
+        Args:
+            centers (np.ndarray): (n, 2) center of every object
+            cell_size (float | None): cell size of this build only,
+                                      default is cell size of the grid
+        """
+        if len(centers) <= self.SMALL_COUNT:
+            self.__small = len(centers)
+            return
+        self.__small = None
+
+        cell_size = self.__cell_size if cell_size is None else cell_size
+        cells = np.floor(centers / cell_size).astype(np.int64)
+        keys = self._key(cells[:, 0], cells[:, 1])
+
+        # sort by cell so every cell is a range in sorted order
+        self.__order = np.argsort(keys, kind="stable")
+        self.__keys = keys[self.__order]
+
+    def candidate_pairs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Get every pair of objects in the same or neighbour cells
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: index of first and second object
+                                           of each pair, every pair is
+                                           returned once
+        """
+        if self.__small is not None:
+            return self._all_pairs(self.__small)
+
+        keys = self.__keys
+        positions = np.arange(len(keys))
+
+        # same cell: object with every object after it in the cell
+        firsts = [positions]
+        starts = [positions + 1]
+        ends = [np.searchsorted(keys, keys, side="right")]
+
+        # neighbour cells: object with every object in that cell
+        for dx, dy in self.NEIGHBOURS:
+            neighbour = keys + ((dx << self.KEY_SHIFT) + dy)
+            firsts.append(positions)
+            starts.append(np.searchsorted(keys, neighbour, side="left"))
+            ends.append(np.searchsorted(keys, neighbour, side="right"))
+
+        first = np.concatenate(firsts)
+        start = np.concatenate(starts)
+        counts = np.concatenate(ends) - start
+        np.maximum(counts, 0, out=counts)
+
+        # expand every range [start, end) into single pairs
+        total = int(counts.sum())
+        offsets = np.cumsum(counts) - counts
+        second = np.arange(total) - np.repeat(offsets - start, counts)
+        first = np.repeat(first, counts)
+
+        return self.__order[first], self.__order[second]
+
+    @classmethod
+    def _all_pairs(cls, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Get every pair of count objects, it is made once per count"""
+        pairs = cls._ALL_PAIRS.get(count)
+
+        if pairs is None:
+            pairs = np.triu_indices(count, 1)
+            cls._ALL_PAIRS[count] = pairs
+
+        return pairs
+
+    def _key(self, cell_x: np.ndarray, cell_y: np.ndarray) -> np.ndarray:
+        """Pack cell x and y into one int64 key"""
+        return (cell_x << self.KEY_SHIFT) + (cell_y + self.KEY_OFFSET)
+
+    # Access data part
+    def get_cell_size(self) -> float:
+        """Get cell size of this grid
+
+        Returns:
+            float: width and height of one cell
+        """
+        return self.__cell_size
+
+
+class CoinGrid:
+    """Grid of coins that never move, updated one coin at a time
+
+    Coins are added when they spawn and removed when they are collected,
+    so the grid is never rebuilt. A pickup looks only in the cells
+    around the player and compares squared distances, so it costs the
+    same with 10 or 10000 coins on the field.
+
+    Attributes:
+        cell_size (float): width and height of one cell
+
+    Medthods:
+        insert(): add a coin to its cell
+        remove(): take a coin out of its cell
+        clear(): remove every coin
+        query(): get every coin that contains a point
+        query_box(): get every coin whose circle can be in a box
+        get_cell_size(): get cell size of this grid
+        get_count(): get number of coins in the grid
+    """
+
+    def __init__(self, cell_size: int | float) -> None:
+
+        assert isinstance(cell_size, (int, float)) and cell_size > 0, \
+            f"cell_size should be positive int or float, but got {cell_size}"
+
+        self.__cell_size = float(cell_size)
+        self.__cells: Dict[Tuple[int, int], List[Coin]] = {}
+        self.__count = 0
+
+        # query has to reach this far to find every coin
+        self.__max_radius = 0
+
+    def insert(self, coin: Coin) -> None:
+        """Add a coin to the cell of its center
+
+        Args:
+            coin (Coin): coin that is added
+        """
+        assert isinstance(coin, Coin), \
+            f"coin should be Coin, but got {type(coin)}"
+
+        self.__cells.setdefault(self._cell(coin.get_center()), []).append(coin)
+        self.__max_radius = max(self.__max_radius, coin.get_radius())
+        self.__count += 1
+
+    def remove(self, coin: Coin) -> None:
+        """Take a coin out of its cell
+
+        Args:
+            coin (Coin): coin that is in the grid
+        """
+        key = self._cell(coin.get_center())
+        cell = self.__cells[key]
+        cell.remove(coin)
+        self.__count -= 1
+
+        if not cell:
+            del self.__cells[key]
+
+    def clear(self) -> None:
+        """Remove every coin"""
+        self.__cells.clear()
+        self.__count = 0
+        self.__max_radius = 0
+
+    def query(self, point: Tuple[int | float, int | float]) -> List[Coin]:
+        """Get every coin whose circle contains point,
+        like `Coin.is_colliding()` with an object at point
+
+        Args:
+            point (Tuple[int | float, int | float]): position to check
+
+        Returns:
+            List[Coin]: coins that contain point
+        """
+        x, y = point
+        reach = self.__max_radius
+        size = self.__cell_size
+
+        found = []
+        for cx in range(math.floor((x - reach) / size),
+                        math.floor((x + reach) / size) + 1):
+            for cy in range(math.floor((y - reach) / size),
+                            math.floor((y + reach) / size) + 1):
+
+                for coin in self.__cells.get((cx, cy), ()):
+                    coin_x, coin_y = coin.get_center()
+                    dx = coin_x - x
+                    dy = coin_y - y
+                    radius = coin.get_radius()
+
+                    # same as distance < radius without square root
+                    if dx * dx + dy * dy < radius * radius:
+                        found.append(coin)
+
+        return found
+
+    def query_box(self,
+                  box: Tuple[float, float, float, float]) -> List[Coin]:
+        """Get every coin whose circle can be in box, only cells
+        that box covers are visited
+
+        Args:
+            box (Tuple[float, float, float, float]): min_x, max_x, min_y, max_y
+
+        Returns:
+            List[Coin]: coins in or around box
+        """
+        min_x, max_x, min_y, max_y = box
+        reach = self.__max_radius
+        size = self.__cell_size
+
+        found = []
+        for cx in range(math.floor((min_x - reach) / size),
+                        math.floor((max_x + reach) / size) + 1):
+            for cy in range(math.floor((min_y - reach) / size),
+                            math.floor((max_y + reach) / size) + 1):
+                found.extend(self.__cells.get((cx, cy), ()))
+
+        return found
+
+    def _cell(self, point: Tuple[int | float, int | float]) -> Tuple[int, int]:
+        """Get cell that contains point"""
+        return (math.floor(point[0] / self.__cell_size),
+                math.floor(point[1] / self.__cell_size))
+
+    # Access data part
+    def get_cell_size(self) -> float:
+        """Get cell size of this grid
+
+        Returns:
+            float: width and height of one cell
+        """
+        return self.__cell_size
+
+    def get_count(self) -> int:
+        """Get number of coins in the grid
+
+        Returns:
+            int: coins that are not collected yet
+        """
+        return self.__count
@@ -0,0 +1,186 @@
+"""
+    Module that contains SpriteCache, pre-rendered surfaces of missiles
+    and coins so a frame is a list of blits instead of many polygons
+"""
+from collections import OrderedDict
+from typing import List, Tuple
+import math
+
+import numpy as np
+import pygame
+
+from baseairplane import BaseAirplane
+
+
+class SpriteCache:
+    """Surfaces of missiles and coins that are rendered once
+
+    A missile is rendered in BUCKETS headings around the circle, its
+    heading is rounded to the nearest one when it is drawn. A coin
+    does not turn, so it has one surface for every radius and color.
+    Sprites use a colorkey with RLE, it is the fastest way to blit a
+    shape that is not a rectangle.
+
+    Attributes:
+        screen (pygame.Surface): surface that sprites are drawn on,
+                                 sprites are made in its pixel format
+        BUCKETS (int): number of headings of every missile sprite
+        CACHE_SIZE (int): max number of sprite sets that are kept
+        COLORKEY (Tuple[int, int, int]): color that is not drawn
+
+    Medthods:
+        missile(): get sprite of every heading of a missile
+        coin(): get sprite of a coin
+        buckets(): get bucket of many headings at once
+        get_half(): get distance from top left of a sprite to its center
+        get_cache_stats(): get hits and misses of sprite cache
+        clear_cache(): remove every sprite from cache
+    """
+
+    BUCKETS = 64
+    CACHE_SIZE = 32
+    COLORKEY = (255, 0, 255)
+
+    def __init__(self,
+                 screen: pygame.Surface,
+                 buckets: int = BUCKETS) -> None:
+
+        assert isinstance(screen, pygame.Surface), \
+            f"screen should be pygame.Surface, but got {type(screen)}"
+
+        assert isinstance(buckets, int) and buckets > 0, \
+            f"buckets should be positive int, but got {buckets}"
+
+        self.__screen = screen
+        self.__buckets = buckets
+
+        # sprites by (kind, size, color), most recently used is at the end
+        self.__cache = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+
+    def missile(self,
+                size: int,
+                color: Tuple[int, int, int]) -> List[pygame.Surface]:
+        """Get sprite of every heading of a missile
+
+        Sprite i is the missile turned by i * 2pi / BUCKETS from nose up,
+        its center is at get_half() of the sprite.
+
+        Args:
+            size (int): size of missile
+            color (Tuple[int, int, int]): color of missile
+
+        Returns:
+            List[pygame.Surface]: one sprite per bucket
+        """
+        key = ("missile", size, tuple(color))
+        sprites = self.__get(key)
+
+        if sprites is None:
+            # farthest point of shape is a corner, sqrt(2) * size away
+            side = math.ceil(2 * math.sqrt(2) * size) + 2
+            half = side / 2
+            shape = np.array(BaseAirplane.SHAPE) * size
+
+            sprites = []
+            for i in range(self.__buckets):
+                theta = i * 2 * math.pi / self.__buckets
+                cos_t, sin_t = math.cos(theta), math.sin(theta)
+                points = [(half + x * cos_t - y * sin_t,
+                           half + x * sin_t + y * cos_t) for x, y in shape]
+
+                surface = self.__new_surface(side, color)
+                pygame.draw.polygon(surface, color, points)
+                sprites.append(surface)
+
+            self.__put(key, sprites)
+
+        return sprites
+
+    def coin(self, radius: int, color: Tuple[int, int, int]) -> pygame.Surface:
+        """Get sprite of a coin, its center is at get_half() of the sprite
+
+        Args:
+            radius (int): radius of coin
+            color (Tuple[int, int, int]): color of coin
+
+        Returns:
+            pygame.Surface: sprite of the coin
+        """
+        key = ("coin", radius, tuple(color))
+        sprite = self.__get(key)
+
+        if sprite is None:
+            sprite = self.__new_surface(2 * radius, color)
+            pygame.draw.circle(sprite, color, (radius, radius), radius)
+            self.__put(key, sprite)
+
+        return sprite
+
+    def buckets(self, headings: np.ndarray) -> np.ndarray:
+        """Get bucket of many headings at once
+
+        Args:
+            headings (np.ndarray): (n,) headings in radian
+
+        Returns:
+            np.ndarray: (n,) index of sprite in missile()
+        """
+        turn = (headings - BaseAirplane.NOSE_UP) \
+            * (self.__buckets / (2 * math.pi))
+        return np.rint(turn).astype(np.intp) % self.__buckets
+
+    def __new_surface(self,
+                      side: int,
+                      color: Tuple[int, int, int]) -> pygame.Surface:
+        """Create empty square sprite in pixel format of screen"""
+        key = self.COLORKEY if tuple(color) != self.COLORKEY else (0, 0, 0)
+
+        surface = pygame.Surface((side, side), 0, self.__screen)
+        surface.fill(key)
+        surface.set_colorkey(key, pygame.RLEACCEL)
+        return surface
+
+    def __get(self, key: tuple):
+        """Get sprites from cache and mark them as recently used"""
+        sprites = self.__cache.get(key)
+
+        if sprites is None:
+            self.__misses += 1
+            return None
+
+        self.__hits += 1
+        self.__cache.move_to_end(key)
+        return sprites
+
+    def __put(self, key: tuple, sprites) -> None:
+        """Keep sprites, remove least recently used when cache is full"""
+        self.__cache[key] = sprites
+        if len(self.__cache) > self.CACHE_SIZE:
+            self.__cache.popitem(last=False)
+
+    # Access data part
+    @staticmethod
+    def get_half(sprite: pygame.Surface) -> float:
+        """Get distance from top left of a sprite to its center
+
+        Args:
+            sprite (pygame.Surface): sprite from missile() or coin()
+
+        Returns:
+            float: half of the side of the sprite
+        """
+        return sprite.get_width() / 2
+
+    def get_cache_stats(self) -> Tuple[int, int, int]:
+        """Get hits and misses of sprite cache
+
+        Returns:
+            Tuple[int, int, int]: hits, misses and sprite sets in cache
+        """
+        return self.__hits, self.__misses, len(self.__cache)
+
+    def clear_cache(self) -> None:
+        """Remove every sprite from cache"""
+        self.__cache.clear()
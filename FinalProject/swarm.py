@@ -0,0 +1,592 @@
+"""
+    Module that contains MissileSwarm, a structure-of-arrays store
+    that steers and moves every missile in a few NumPy operations
+"""
+from typing import List, Tuple
+import math
+
+import numpy as np
+
+from baseairplane import BaseAirplane, Missile
+from collision import transform_shapes
+
+
+class MissileSwarm:
+    """Store every missile of the game as rows of NumPy arrays
+
+    Instead of calling `rotation_to_target()` and `update()` on each
+    missile, the whole swarm is steered, accelerated and moved with
+    batched array operations every tick. Each row can still be used as
+    a `Missile` through `SwarmMissile` for the old per-object code.
+
+    Views of removed missiles are kept in a free list and given to the
+    next spawns, so a game that keeps spawning and losing missiles
+    does not create new objects once the swarm is big enough.
+
+    Attributes:
+        centers (np.ndarray): (n, 2) center of every missile
+        headings (np.ndarray): (n,) angle of nose vector in radians
+        speeds (np.ndarray): (n,) current speed
+        accelerations (np.ndarray): (n,) acceleration by dt
+        max_speeds (np.ndarray): (n,) speed that missile runs out of fuel
+        turn_rates (np.ndarray): (n,) max turn rate in radians per tick
+        sizes (np.ndarray): (n,) size of every missile
+        alive (np.ndarray): (n,) `True` when missile is still alive
+        prev_centers (np.ndarray): (n, 2) center at previous tick
+        prev_headings (np.ndarray): (n,) heading at previous tick
+        ids (np.ndarray): (n,) number of every missile in order of spawn,
+                          it stays with the missile when rows move
+
+    Medthods:
+        spawn(): add new missile to the swarm and return its view
+        add(): copy a standalone Missile into the swarm
+        set_missiles(): replace every missile in the swarm
+        clear(): remove every missile
+        steer(): rotate every missile to the target
+        update(): accelerate and move every missile by dt
+        step(): steer and update in one call
+        save_previous(): keep current place for interpolation
+        remove_dead(): fill rows of dead missiles with the last alive ones
+        invalidate(): forget cached points and boxes after a change
+        kill(): set some missiles to be dead
+        get_points(): get (n, 4, 2) array of every missile points
+        get_poses(): get centers and headings between two ticks
+        get_bounding_boxes(): get (n, 4) bounding box of every missile
+        get_missiles(): get list of views, one per row
+        get_centers(), get_headings(), ...: get one column of every
+                                            missile, it is a view so
+                                            writes change the swarm
+    """
+
+    # Shape of BaseAirplane when nose point up (heading = -pi/2)
+    SHAPE = np.array(BaseAirplane.SHAPE)
+    NOSE_UP = BaseAirplane.NOSE_UP
+
+    # every array that has one row per missile
+    COLUMNS = ("_centers", "_headings", "_speeds", "_accelerations",
+               "_max_speeds", "_turn_rates", "_sizes", "_alive",
+               "_prev_centers", "_prev_headings", "_ids")
+
+    def __init__(self, capacity: int = 64) -> None:
+
+        assert isinstance(capacity, int) and capacity > 0, \
+            f"capacity should be positive int, but got {capacity}"
+
+        self._count = 0
+        self._capacity = capacity
+        self._next_id = 0
+        self._missiles: List["SwarmMissile"] = []
+
+        # views of removed missiles, they are used again by spawn
+        self._free: List["SwarmMissile"] = []
+
+        # points and boxes of this tick, None after anything moves
+        self._points = None
+        self._boxes = None
+
+        self._centers = np.zeros((capacity, 2))
+        self._headings = np.zeros(capacity)
+        self._speeds = np.zeros(capacity)
+        self._accelerations = np.zeros(capacity)
+        self._max_speeds = np.zeros(capacity)
+        self._turn_rates = np.zeros(capacity)
+        self._sizes = np.zeros(capacity)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._prev_centers = np.zeros((capacity, 2))
+        self._prev_headings = np.zeros(capacity)
+        self._ids = np.zeros(capacity, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _grow(self) -> None:
+        """Double capacity of every array when the swarm is full"""
+        new_capacity = self._capacity * 2
+
+        for name in self.COLUMNS:
+            old = getattr(self, name)
+            new = np.zeros((new_capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self._count] = old[:self._count]
+            setattr(self, name, new)
+
+        self._capacity = new_capacity
+
+    def spawn(self,
+              size: int,
+              center: Tuple[int | float, int | float],
+              speed: int | float,
+              max_turn_rate: int | float,
+              acceleration: int | float,
+              max_speed: int | float,
+              heading: float = NOSE_UP) -> "SwarmMissile":
+        """Add new missile to the swarm
+
+        Args:
+            size (int): size of missile
+            center (Tuple[int | float, int | float]): center of missile
+            speed (int | float): starting speed
+            max_turn_rate (int | float): max_turn_rate in degrees per tick
+            acceleration (int | float): acceleration by dt
+            max_speed (int | float): max_speed that missile can reach
+            heading (float): angle of nose in radians, default is nose up
+
+        Returns:
+            SwarmMissile: view of the new row
+        """
+        if self._count == self._capacity:
+            self._grow()
+
+        i = self._count
+        self._centers[i] = center
+        self._headings[i] = heading
+        self._speeds[i] = speed
+        self._accelerations[i] = acceleration
+        self._max_speeds[i] = max_speed
+        self._turn_rates[i] = math.radians(max_turn_rate)
+        self._sizes[i] = size
+        self._alive[i] = True
+        self._prev_centers[i] = center
+        self._prev_headings[i] = heading
+        self._ids[i] = self._next_id
+        self._next_id += 1
+        self._count += 1
+        self.invalidate()
+
+        if self._free:
+            view = self._free.pop()
+            view.swarm = self
+            view.index = i
+        else:
+            view = SwarmMissile(self, i)
+
+        self._missiles.append(view)
+        return view
+
+    def add(self, missile: Missile) -> "SwarmMissile":
+        """Copy a standalone Missile into the swarm
+
+        Args:
+            missile (Missile): missile that want to copy
+
+        Returns:
+            SwarmMissile: view of the new row
+        """
+        assert isinstance(missile, Missile), \
+            f"missile should be Missile, but got {type(missile)}"
+
+        view = self.spawn(**self._describe(missile))
+        self._alive[view.index] = missile.get_alive()
+        return view
+
+    def set_missiles(self, missiles: List[Missile]) -> None:
+        """Replace every missile in the swarm
+
+        Args:
+            missiles (List[Missile]): missiles that want to be in the swarm,
+                                      they can be views of this swarm too
+        """
+        # copy out first because views of this swarm will be cleared
+        rows = [(self._describe(m), m.get_alive()) for m in missiles]
+
+        self.clear()
+        for kwargs, alive in rows:
+            view = self.spawn(**kwargs)
+            self._alive[view.index] = alive
+
+    @staticmethod
+    def _describe(missile: Missile) -> dict:
+        """Get arguments of `spawn()` that make a copy of missile"""
+        return {
+            "size": missile.get_size(),
+            "center": missile.get_center(),
+            "speed": missile.get_speed(),
+            "max_turn_rate": missile.get_max_turn_rate(),
+            "acceleration": missile.get_acceleration(),
+            "max_speed": missile.get_max_speed(),
+            "heading": missile.get_heading()
+        }
+
+    def clear(self) -> None:
+        """Remove every missile in the swarm"""
+        self._count = 0
+        self._release(self._missiles)
+        self._missiles.clear()
+        self.invalidate()
+
+    def _release(self, views: List["SwarmMissile"]) -> None:
+        """Detach views of removed missiles and keep them for spawn,
+        a view that is kept somewhere else cannot read a row anymore"""
+        for view in views:
+            view.swarm = None
+        self._free.extend(views)
+
+    def steer(self, target: Tuple[float, float], scale: float = 1.0) -> None:
+        """Rotate every missile to the target, same as
+        `Missile.rotation_to_target()` but for the whole swarm
+
+        Args:
+            target (Tuple[float, float]): center of the target
+            scale (float): part of max turn rate that can be used
+        """
+        n = self._count
+        centers = self._centers[:n]
+        headings = self._headings[:n]
+        turn_rates = self._turn_rates[:n] * scale
+
+        target_angle = np.arctan2(target[1] - centers[:, 1],
+                                  target[0] - centers[:, 0])
+
+        # keep diff_angle in range [-pi, pi] for the shortest rotation
+        diff_angle = target_angle - headings
+        diff_angle = np.where(diff_angle > math.pi,
+                              diff_angle - 2 * math.pi, diff_angle)
+        diff_angle = np.where(diff_angle < -math.pi,
+                              diff_angle + 2 * math.pi, diff_angle)
+        np.clip(diff_angle, -turn_rates, turn_rates, out=diff_angle)
+
+        headings += diff_angle
+
+        # wrap heading back to [-pi, pi)
+        headings += math.pi
+        np.mod(headings, 2 * math.pi, out=headings)
+        headings -= math.pi
+        self.invalidate()
+
+    def update(self, dt: float, scale: float = 1.0) -> None:
+        """Accelerate and move every missile, same as `Missile.update()`
+        but for the whole swarm
+
+        Args:
+            dt (float): delatime from pygame
+            scale (float): part of speed to move, speed is distance per
+                           tick at 60 ticks per second
+        """
+        n = self._count
+        speeds = self._speeds[:n]
+        max_speeds = self._max_speeds[:n]
+
+        # speed that reach max_speed means missile is out of fuel
+        self._alive[:n] &= speeds != max_speeds
+
+        # move by speed before limit, like Missile.update does
+        new_speeds = speeds + self._accelerations[:n] * dt
+        headings = self._headings[:n]
+        distance = new_speeds * scale
+        self._centers[:n, 0] += distance * np.cos(headings)
+        self._centers[:n, 1] += distance * np.sin(headings)
+
+        np.minimum(new_speeds, max_speeds, out=speeds)
+        self.invalidate()
+
+    def step(self,
+             target: Tuple[float, float],
+             dt: float,
+             scale: float = 1.0) -> None:
+        """Steer every missile to target and then update them
+
+        Args:
+            target (Tuple[float, float]): center of the target
+            dt (float): delatime from pygame
+            scale (float): part of turn rate and speed of one tick
+                           at 60 ticks per second
+        """
+        if self._count == 0:
+            return
+
+        self.steer(target, scale)
+        self.update(dt, scale)
+
+    def save_previous(self) -> None:
+        """Keep current center and heading of every missile, so they can
+        be drawn between previous and current tick"""
+        n = self._count
+        self._prev_centers[:n] = self._centers[:n]
+        self._prev_headings[:n] = self._headings[:n]
+
+    def remove_dead(self) -> int:
+        """Drop every dead missile, alive missiles at the end of the
+        swarm are moved into the rows of dead ones
+
+        Only the moved rows are copied, and views of the alive missiles
+        are kept with their index updated. Order of missiles changes.
+
+        Returns:
+            int: number of missiles that removed
+        """
+        n = self._count
+        alive = self._alive[:n]
+        removed = n - int(np.count_nonzero(alive))
+
+        if removed == 0:
+            return 0
+
+        # dead rows in front part are holes, alive rows behind are fillers
+        count = n - removed
+        dead = np.flatnonzero(~alive)
+        holes = dead[dead < count]
+        fillers = np.flatnonzero(alive[count:]) + count
+
+        missiles = self._missiles
+        self._release([missiles[i] for i in dead.tolist()])
+
+        if len(holes) > 0:
+            for name in self.COLUMNS:
+                arr = getattr(self, name)
+                arr[holes] = arr[fillers]
+
+            for hole, filler in zip(holes.tolist(), fillers.tolist()):
+                view = missiles[filler]
+                view.index = hole
+                missiles[hole] = view
+
+        # update list in place so other reference to it still valid
+        del missiles[count:]
+        self._count = count
+        self.invalidate()
+
+        return removed
+
+    def invalidate(self) -> None:
+        """Forget cached points and bounding boxes, it must be called
+        after centers or headings are changed from outside"""
+        self._points = None
+        self._boxes = None
+
+    def kill(self, indices: np.ndarray) -> None:
+        """Set missiles to be dead
+
+        Args:
+            indices (np.ndarray): rows of missiles that are dead
+        """
+        self._alive[indices] = False
+
+    # Access data part
+    def get_points(self,
+                   alpha: float = 1.0,
+                   rows: np.ndarray | None = None) -> np.ndarray:
+        """Get points of every missile
+
+        Args:
+            alpha (float): 0 is place at previous tick and 1 is
+                           current place, between is interpolated
+            rows (np.ndarray | None): index of missiles to get,
+                                      `None` is every missile
+
+        Returns:
+            np.ndarray: (n, 4, 2) points in the same order as
+                        `BaseAirplane.get_points()`, points of current
+                        place are cached and should not be changed
+        """
+        # only points of every missile at current place are cached
+        cache = rows is None and alpha == 1.0
+        if cache and self._points is not None:
+            return self._points
+
+        if rows is None:
+            rows = slice(0, self._count)
+
+        centers, headings = self.get_poses(alpha, rows)
+        points = transform_shapes(self.SHAPE, centers, headings - self.NOSE_UP,
+                                  self._sizes[rows])
+
+        if cache:
+            self._points = points
+        return points
+
+    def get_poses(self,
+                  alpha: float = 1.0,
+                  rows: np.ndarray | slice | None = None
+                  ) -> Tuple[np.ndarray, np.ndarray]:
+        """Get center and heading of missiles between two ticks
+
+        Args:
+            alpha (float): 0 is place at previous tick and 1 is
+                           current place, between is interpolated
+            rows (np.ndarray | slice | None): index of missiles to get,
+                                              `None` is every missile
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (n, 2) centers and (n,) headings
+        """
+        if rows is None:
+            rows = slice(0, self._count)
+
+        centers = self._centers[rows]
+        headings = self._headings[rows]
+
+        if alpha != 1.0:
+            prev_centers = self._prev_centers[rows]
+            prev_headings = self._prev_headings[rows]
+
+            # turn the shortest way from previous heading
+            diff = np.mod(headings - prev_headings + math.pi, 2 * math.pi) \
+                - math.pi
+            centers = prev_centers + (centers - prev_centers) * alpha
+            headings = prev_headings + diff * alpha
+
+        return centers, headings
+
+    def get_bounding_boxes(self) -> np.ndarray:
+        """Get bounding box of every missile
+
+        Returns:
+            np.ndarray: (n, 4) boxes in the same order as
+                        `BaseAirplane.bouncing_box()`, they are cached
+                        until a missile moves and should not be changed
+        """
+        if self._boxes is not None:
+            return self._boxes
+
+        points = self.get_points()
+        boxes = np.empty((self._count, 4))
+        boxes[:, 0] = points[:, :, 0].min(axis=1)
+        boxes[:, 1] = points[:, :, 0].max(axis=1)
+        boxes[:, 2] = points[:, :, 1].min(axis=1)
+        boxes[:, 3] = points[:, :, 1].max(axis=1)
+
+        self._boxes = boxes
+        return boxes
+
+    def get_missiles(self) -> List["SwarmMissile"]:
+        """Get views of every missile, this list is updated in place
+
+        Returns:
+            List[SwarmMissile]: one view per row
+        """
+        return self._missiles
+
+    def get_centers(self) -> np.ndarray:
+        """Get (n, 2) centers of every missile"""
+        return self._centers[:self._count]
+
+    def get_headings(self) -> np.ndarray:
+        """Get (n,) headings of every missile in radians"""
+        return self._headings[:self._count]
+
+    def get_speeds(self) -> np.ndarray:
+        """Get (n,) speeds of every missile"""
+        return self._speeds[:self._count]
+
+    def get_accelerations(self) -> np.ndarray:
+        """Get (n,) acceleration of every missile"""
+        return self._accelerations[:self._count]
+
+    def get_max_speeds(self) -> np.ndarray:
+        """Get (n,) speed that every missile runs out of fuel"""
+        return self._max_speeds[:self._count]
+
+    def get_turn_rates(self) -> np.ndarray:
+        """Get (n,) max turn rate of every missile in radians per tick"""
+        return self._turn_rates[:self._count]
+
+    def get_sizes(self) -> np.ndarray:
+        """Get (n,) sizes of every missile"""
+        return self._sizes[:self._count]
+
+    def get_alive(self) -> np.ndarray:
+        """Get (n,) alive flags of every missile"""
+        return self._alive[:self._count]
+
+    def get_ids(self) -> np.ndarray:
+        """Get (n,) id of every missile, a new missile gets the next id"""
+        return self._ids[:self._count]
+
+
+class SwarmMissile(Missile):
+    """Missile that is a view onto one row of MissileSwarm
+
+    It has every medthod of Missile, but all data is read from
+    and written to the arrays of the swarm, through the column views
+    that its getters return. `rotation_to_target()` is the one of
+    Missile, it only uses these getters and `rotation_points()`.
+
+    A view is only valid until the next `remove_dead()` or `clear()`
+    of its swarm. Views of alive missiles follow their rows, but a view
+    of a removed missile is detached, its swarm is `None`, and a later
+    `spawn()` gives it to a new missile. So a view that is kept across
+    a tick, by a renderer or a list taken before, can fail or point at
+    a different missile, keep ids from `get_ids()` instead.
+
+    Attributes:
+        swarm (MissileSwarm | None): swarm that owns the data,
+                                     `None` after it is removed
+        index (int): row of this missile in the swarm
+    """
+
+    __slots__ = ("swarm", "index")
+
+    # pylint: disable=super-init-not-called
+    def __init__(self, swarm: MissileSwarm, index: int) -> None:
+        self.swarm = swarm
+        self.index = index
+
+    def rotation_points(self, angle: int | float) -> None:
+        assert isinstance(angle, (int, float)), \
+            f"angle should be float or int, but got {type(angle)}"
+
+        headings = self.swarm.get_headings()
+        heading = headings[self.index] + math.radians(angle)
+        headings[self.index] = (heading + math.pi) % (2 * math.pi) - math.pi
+        self.swarm.invalidate()
+
+    def update(self, dt: int | float) -> None:
+        assert isinstance(dt, (int, float)), \
+            f"dt should be int or float, but got {type(dt)}"
+
+        swarm, i = self.swarm, self.index
+        speeds = swarm.get_speeds()
+        speed = float(speeds[i])
+        max_speed = self.get_max_speed()
+
+        if speed == max_speed:
+            self.set_is_alive(False)
+
+        new_speed = speed + self.get_acceleration() * dt
+        heading = self.get_heading()
+        centers = swarm.get_centers()
+        centers[i, 0] += new_speed * math.cos(heading)
+        centers[i, 1] += new_speed * math.sin(heading)
+        speeds[i] = min(new_speed, max_speed)
+        swarm.invalidate()
+
+    # Acess data part
+    def set_is_alive(self, state: bool) -> None:
+        self.swarm.get_alive()[self.index] = state
+
+    def get_points(self) -> List[Tuple[float, float]]:
+        return self.transform_points(self.get_center(), self.get_heading())
+
+    def bouncing_box(self) -> Tuple[float, float, float, float]:
+        min_x, max_x, min_y, max_y = \
+            self.swarm.get_bounding_boxes()[self.index].tolist()
+        return min_x, max_x, min_y, max_y
+
+    def get_vector(self) -> List[float]:
+        heading = self.get_heading()
+        size = self.get_size()
+        return [size * math.cos(heading), size * math.sin(heading)]
+
+    def get_heading(self) -> float:
+        return float(self.swarm.get_headings()[self.index])
+
+    def get_size(self) -> int:
+        return int(self.swarm.get_sizes()[self.index])
+
+    def get_center(self) -> Tuple[float, float]:
+        x, y = self.swarm.get_centers()[self.index]
+        return float(x), float(y)
+
+    def get_speed(self) -> float:
+        return float(self.swarm.get_speeds()[self.index])
+
+    def get_alive(self) -> bool:
+        return bool(self.swarm.get_alive()[self.index])
+
+    def get_acceleration(self) -> float:
+        return float(self.swarm.get_accelerations()[self.index])
+
+    def get_max_speed(self) -> float:
+        return float(self.swarm.get_max_speeds()[self.index])
+
+    def get_max_turn_rate(self) -> float:
+        return math.degrees(float(self.swarm.get_turn_rates()[self.index]))
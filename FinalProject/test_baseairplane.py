@@ -0,0 +1,99 @@
+"""
+    Module that contains tests of points of BaseAirplane
+"""
+
+import math
+import random
+import unittest
+
+from baseairplane import Airplane
+from collision import bounding_box
+
+
+class EagerPoints:
+    """Points that are rotated and moved on every change, like
+    BaseAirplane before it kept only center and heading"""
+
+    def __init__(self, size: int, center: tuple) -> None:
+        cx, cy = center
+        self.center = center
+        self.points = [(cx, cy - size),
+                       (cx - size, cy + size),
+                       (cx, cy + size * 0.3),
+                       (cx + size, cy + size)]
+
+    def rotate(self, angle: float) -> None:
+        """Rotate every point around center by angle in degrees"""
+        cx, cy = self.center
+        cos_t = math.cos(math.radians(angle))
+        sin_t = math.sin(math.radians(angle))
+        self.points = [(cx + (x - cx) * cos_t - (y - cy) * sin_t,
+                        cy + (x - cx) * sin_t + (y - cy) * cos_t)
+                       for x, y in self.points]
+
+    def move_to(self, center: tuple) -> None:
+        """Move every point with the center"""
+        dx = center[0] - self.center[0]
+        dy = center[1] - self.center[1]
+        self.center = center
+        self.points = [(x + dx, y + dy) for x, y in self.points]
+
+
+class TestLazyPoints(unittest.TestCase):
+    """Tests of points made from center and heading"""
+
+    def assert_points(self, plane: Airplane, eager: EagerPoints) -> None:
+        """Points of plane are the eager points"""
+        for got, want in zip(plane.get_points(), eager.points, strict=True):
+            self.assertAlmostEqual(got[0], want[0], places=6)
+            self.assertAlmostEqual(got[1], want[1], places=6)
+
+    def test_same_as_eager_points(self) -> None:
+        """Lazy points follow every turn and move like eager points"""
+        rng = random.Random(4)
+        plane = Airplane(size=8, center=(400.0, 300.0), speed=6)
+        eager = EagerPoints(8, (400.0, 300.0))
+        self.assert_points(plane, eager)
+
+        for _ in range(500):
+            angle = rng.uniform(-30, 30)
+            plane.rotation_points(angle)
+            eager.rotate(angle)
+
+            # points are not always asked for between changes
+            if rng.random() < 0.5:
+                self.assert_points(plane, eager)
+
+            plane.move_forward(rng.uniform(0.5, 2.0))
+            eager.move_to(plane.get_center())
+            self.assert_points(plane, eager)
+
+    def test_cache_follows_changes(self) -> None:
+        """Cached points and box are made again after a change"""
+        plane = Airplane(size=8, center=(100.0, 100.0), speed=6)
+        points = plane.get_points()
+        self.assertIs(plane.get_points(), points)
+        self.assertEqual(plane.bouncing_box(), bounding_box(points))
+
+        plane.rotation_points(90)
+        self.assertIsNot(plane.get_points(), points)
+        self.assertEqual(plane.bouncing_box(),
+                         bounding_box(plane.get_points()))
+
+        points = plane.get_points()
+        plane.move_forward()
+        self.assertIsNot(plane.get_points(), points)
+        self.assertEqual(plane.bouncing_box(),
+                         bounding_box(plane.get_points()))
+
+    def test_same_shape_is_shared(self) -> None:
+        """Objects of the same size use one shape template"""
+        self.assertIs(Airplane.get_shape(8), Airplane.get_shape(8))
+        first = Airplane(size=8, center=(0.0, 0.0), speed=6)
+        second = Airplane(size=8, center=(50.0, 0.0), speed=6)
+        self.assertEqual([(x + 50, y) for x, y in first.get_points()],
+                         second.get_points())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+    Module that contains tests of regression and budget checks of benchmark
+"""
+
+import contextlib
+import io
+import json
+import os
+import subprocess
+import tempfile
+import unittest
+from unittest import mock
+
+import benchmark
+
+
+def result(*cases: tuple) -> dict:
+    """Get a suite result with best time of (case, count, best)"""
+    return {"results": [{"case": case, "count": count, "best": best}
+                        for case, count, best in cases]}
+
+
+class TestCompare(unittest.TestCase):
+    """Tests of compare() and the exit code of compare command"""
+
+    BASELINE = result(("draw", 100, 0.010), ("draw", 1000, 0.100),
+                      ("check_colision", 100, 0.002))
+
+    def compare(self, current: dict, threshold: float = 0.10) -> int:
+        """Run compare without printing"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            return benchmark.compare(self.BASELINE, current, threshold)
+
+    def test_counts_regressions(self) -> None:
+        """Only cases slower than the threshold are regressions"""
+        current = result(("draw", 100, 0.0105), ("draw", 1000, 0.150),
+                         ("check_colision", 100, 0.001))
+        self.assertEqual(self.compare(current), 1)
+        self.assertEqual(self.compare(current, threshold=0.01), 2)
+        self.assertEqual(self.compare(self.BASELINE), 0)
+
+    def test_new_cases_are_skipped(self) -> None:
+        """A case that is not in baseline cannot regress"""
+        current = result(("draw", 10, 1.0), ("coin_pickup", 100, 1.0))
+        self.assertEqual(self.compare(current), 0)
+
+    def run_main(self, current: dict) -> int:
+        """Run compare command on files and get its exit code"""
+        with tempfile.TemporaryDirectory() as folder:
+            paths = []
+            for name, data in (("baseline", self.BASELINE),
+                               ("current", current)):
+                paths.append(os.path.join(folder, f"{name}.json"))
+                with open(paths[-1], "w", encoding="utf-8") as file:
+                    json.dump(data, file)
+
+            argv = ["benchmark.py", "compare", *paths, "--threshold", "0.1"]
+            with mock.patch("sys.argv", argv), \
+                    contextlib.redirect_stdout(io.StringIO()):
+                return benchmark.main()
+
+    def test_exit_code(self) -> None:
+        """Compare command fails when there is a regression"""
+        self.assertEqual(self.run_main(self.BASELINE), 0)
+        self.assertEqual(self.run_main(result(("draw", 100, 0.020))), 1)
+
+
+class TestStartup(unittest.TestCase):
+    """Tests of startup budget with scripts that are not run"""
+
+    def setUp(self) -> None:
+        self.frame = (0.1, 0.2)
+        self.needs_pygame = set()
+
+    def run_script(self, script: str) -> list:
+        """Stand in for benchmark.run_script()"""
+        if script == benchmark.FIRST_FRAME_SCRIPT:
+            return list(self.frame)
+
+        blocked = "if True:" in script
+        if blocked and any(f"import {m}\n" in script
+                           for m in self.needs_pygame):
+            raise subprocess.CalledProcessError(1, "python")
+        return [0.01]
+
+    def run_main(self, budget: float) -> int:
+        """Run startup command and get its exit code"""
+        argv = ["benchmark.py", "startup", "--budget", str(budget),
+                "--repeat", "1"]
+        with mock.patch("benchmark.run_script", self.run_script), \
+                mock.patch("sys.argv", argv), \
+                contextlib.redirect_stdout(io.StringIO()):
+            return benchmark.main()
+
+    def test_budget(self) -> None:
+        """First frame later than budget fails"""
+        self.assertEqual(self.run_main(0.5), 0)
+        self.assertEqual(self.run_main(0.25), 1)
+
+    def test_module_that_needs_pygame(self) -> None:
+        """Simulation module that imports pygame is a failure"""
+        self.needs_pygame = {"swarm", "snapshot"}
+        with mock.patch("benchmark.run_script", self.run_script), \
+                contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(benchmark.bench_startup(0.5, repeat=1), 2)
+        self.assertEqual(self.run_main(0.5), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+    Module that contains tests of CoinFactory and its pool of coins
+"""
+
+import unittest
+
+from coin import Coin, CoinFactory, NormalCoin
+from simulation import Simulation
+
+
+class TestCoinFactory(unittest.TestCase):
+    """Tests of create_coin() and release()"""
+
+    def test_reuse_released_coin(self) -> None:
+        """A released coin is the next coin of its type"""
+        factory = CoinFactory()
+        coin = factory.create_coin("normal", (1, 2), 5, 15)
+        coin.set_is_collected(True)
+        factory.release(coin)
+
+        again = factory.create_coin("normal", (30, 40), 7, 10)
+        self.assertIs(again, coin)
+        self.assertIsInstance(again, NormalCoin)
+        self.assertEqual(again.get_center(), (30, 40))
+        self.assertEqual(again.get_score(), 7)
+        self.assertFalse(again.get_collected())
+
+        other = factory.create_coin("invincible", (1, 2), 5, 15)
+        self.assertIsNot(other, coin)
+
+    def test_release_other_class(self) -> None:
+        """A coin that create_coin() does not make is only dropped"""
+        factory = CoinFactory()
+        factory.release(Coin(center=(10, 10), score=1, radius=15))
+
+        coin = factory.create_coin("normal", (1, 2), 5, 15)
+        self.assertIsInstance(coin, NormalCoin)
+
+
+class TestSimulationCoins(unittest.TestCase):
+    """Coins of any class can be in a game"""
+
+    def test_reset_with_plain_coin(self) -> None:
+        """Reset releases a coin that is not from the factory"""
+        sim = Simulation(seed=0)
+        sim.reset()
+        sim.set_coin([Coin(center=(10, 10), score=1, radius=15)])
+        sim.reset()
+        self.assertEqual(sim.coin, [])
+
+    def test_pick_up_plain_coin(self) -> None:
+        """Player picks up a coin that is not from the factory"""
+        sim = Simulation(seed=0)
+        sim.reset()
+        coin = Coin(center=sim.player.get_center(), score=3, radius=15)
+        sim.set_coin([coin])
+        sim.check_colision()
+
+        self.assertEqual(sim.coin, [])
+        self.assertEqual(sim.score, 3)
+        self.assertTrue(coin.get_collected())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,286 @@
+"""
+    Module that contains tests of the exact and swept collision tests
+"""
+
+import random
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import collision
+from baseairplane import Airplane, BaseAirplane, Missile
+from collision import (CollisionStats, narrow_phase, shapes_overlap,
+                       shapes_overlap_many, swept_narrow_phase,
+                       transform_shapes)
+from simulation import Simulation
+from swarm import MissileSwarm
+
+
+SHAPE = np.array(BaseAirplane.SHAPE)
+
+
+def poses(centers, turns):
+    """Get centers and turns as arrays of many shapes"""
+    return np.array(centers, dtype=float), np.array(turns, dtype=float)
+
+
+def boxes(points: np.ndarray) -> np.ndarray:
+    """Get (n, 4) bounding boxes of (n, k, 2) points"""
+    low = points.min(axis=1)
+    high = points.max(axis=1)
+    return np.stack((low[:, 0], high[:, 0], low[:, 1], high[:, 1]), axis=1)
+
+
+def polygons_overlap(poly_a: list, poly_b: list) -> bool:
+    """Polygon test without separating axes, for any simple polygon:
+    an edge of one crosses an edge of the other, or one is inside"""
+
+    def side(o, a, b) -> float:
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    def cross(p1, p2, q1, q2) -> bool:
+        return side(p1, p2, q1) * side(p1, p2, q2) <= 0 \
+            and side(q1, q2, p1) * side(q1, q2, p2) <= 0
+
+    def inside(point, poly) -> bool:
+        x, y = point
+        result = False
+        for (x1, y1), (x2, y2) in zip(poly, poly[1:] + poly[:1]):
+            if (y1 > y) != (y2 > y) \
+                    and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+                result = not result
+        return result
+
+    edges_a = list(zip(poly_a, poly_a[1:] + poly_a[:1]))
+    edges_b = list(zip(poly_b, poly_b[1:] + poly_b[:1]))
+    return any(cross(*a, *b) for a in edges_a for b in edges_b) \
+        or inside(poly_a[0], poly_b) or inside(poly_b[0], poly_a)
+
+
+class TestExactCollision(unittest.TestCase):
+    """Tests of separating axis test and boxes against a plain
+    polygon test"""
+
+    PAIRS = 5000
+
+    def setUp(self) -> None:
+        self.rng = random.Random(6)
+
+    def random_plane(self, size: int) -> Airplane:
+        """Airplane near (100, 100) that points anywhere"""
+        plane = Airplane(size=size,
+                         center=(100 + self.rng.uniform(-15, 15),
+                                 100 + self.rng.uniform(-15, 15)),
+                         speed=6)
+        plane.rotation_points(self.rng.uniform(-180, 180))
+        return plane
+
+    def test_same_as_polygon_test(self) -> None:
+        """SAT of the two triangles is the concave shape test, one pair
+        at a time, many pairs at once and after boxes"""
+        planes = [(self.random_plane(8), self.random_plane(5))
+                  for _ in range(self.PAIRS)]
+        want = [polygons_overlap(a.get_points(), b.get_points())
+                for a, b in planes]
+
+        # both results are common, so both sides are checked
+        self.assertGreater(sum(want), self.PAIRS // 10)
+        self.assertLess(sum(want), self.PAIRS * 9 // 10)
+
+        self.assertEqual([shapes_overlap(a.get_points(), b.get_points())
+                          for a, b in planes], want)
+
+        points_a = np.array([a.get_points() for a, _ in planes])
+        points_b = np.array([b.get_points() for _, b in planes])
+        self.assertEqual(shapes_overlap_many(points_a, points_b).tolist(),
+                         want)
+
+        stats = CollisionStats()
+        hit = narrow_phase(points_a, boxes(points_a),
+                           points_b, boxes(points_b), stats)
+        self.assertEqual(hit.tolist(), np.flatnonzero(want).tolist())
+        self.assertEqual(stats.get_stats()["hits"], sum(want))
+        self.assertEqual(stats.pairs, self.PAIRS)
+
+    def test_is_colliding_counts_stages(self) -> None:
+        """is_colliding() is the polygon test, stats count every stage"""
+        stats = CollisionStats()
+        for _ in range(500):
+            a, b = self.random_plane(8), self.random_plane(5)
+            self.assertEqual(a.is_colliding(b, stats),
+                             polygons_overlap(a.get_points(),
+                                              b.get_points()))
+
+        counts = stats.get_stats()
+        self.assertEqual(counts["pairs"], 500)
+        self.assertEqual(counts["box_rejected"] + counts["sat_rejected"]
+                         + counts["hits"], 500)
+        self.assertGreater(counts["sat_rejected"], 0)
+
+    def test_cached_boxes(self) -> None:
+        """Cached boxes are the boxes of current points"""
+        missile = Missile(size=5, center=(50.0, 50.0), speed=6,
+                          max_turn_rate=5, acceleration=0.1, max_speed=6.5)
+        swarm = MissileSwarm()
+        for i in range(20):
+            swarm.spawn(size=5, center=(10.0 * i, 50.0), speed=6,
+                        acceleration=0.1, max_speed=6.5, max_turn_rate=5)
+        target = Airplane(size=8, center=(100.0, 200.0), speed=6)
+
+        for _ in range(30):
+            missile.rotation_to_target(target)
+            missile.update(1 / 60)
+            self.assertEqual(missile.bouncing_box(),
+                             collision.bounding_box(missile.get_points()))
+
+            swarm.steer(target.get_center())
+            swarm.update(1 / 60)
+            np.testing.assert_array_equal(swarm.get_bounding_boxes(),
+                                          boxes(swarm.get_points()))
+
+
+class TestSweptCollision(unittest.TestCase):
+    """Tests of swept_narrow_phase against shapes that move fast"""
+
+    SIZE = 10.0
+
+    def setUp(self) -> None:
+        self.sizes = np.array([self.SIZE])
+
+    def test_head_on_pass(self) -> None:
+        """Shapes that swap places in one tick touch in the middle,
+        a test of only the end of the tick misses them"""
+        start_a = poses([[0, 0]], [0])
+        end_a = poses([[100, 0]], [0])
+        start_b = poses([[100, 0]], [0])
+        end_b = poses([[0, 0]], [0])
+
+        points_a = transform_shapes(SHAPE, *end_a, self.sizes)
+        points_b = transform_shapes(SHAPE, *end_b, self.sizes)
+        self.assertEqual(len(narrow_phase(points_a, boxes(points_a),
+                                          points_b, boxes(points_b))), 0)
+
+        hit, toi = swept_narrow_phase(SHAPE, start_a, end_a, self.sizes,
+                                      start_b, end_b, self.sizes)
+        self.assertEqual(hit.tolist(), [0])
+
+        # they meet before the middle, when the gap is less than size
+        self.assertGreater(toi[0], 0.0)
+        self.assertLess(toi[0], 0.5)
+        self.assertGreater(toi[0], 0.5 - self.SIZE / 100)
+
+    def test_shapes_touch_at_time_of_impact(self) -> None:
+        """Shapes overlap a bit after the time of impact but not before"""
+        start_a = poses([[0, 0]], [0])
+        end_a = poses([[100, 0]], [0])
+        start_b = poses([[100, 0]], [0])
+        end_b = poses([[0, 0]], [0])
+        _, toi = swept_narrow_phase(SHAPE, start_a, end_a, self.sizes,
+                                    start_b, end_b, self.sizes)
+
+        def overlap(t: float) -> bool:
+            a = transform_shapes(SHAPE, start_a[0] * (1 - t) + end_a[0] * t,
+                                 start_a[1], self.sizes)
+            b = transform_shapes(SHAPE, start_b[0] * (1 - t) + end_b[0] * t,
+                                 start_b[1], self.sizes)
+            return len(narrow_phase(a, boxes(a), b, boxes(b))) > 0
+
+        self.assertFalse(overlap(toi[0] - 0.01))
+        self.assertTrue(overlap(toi[0] + 0.01))
+
+    def test_parallel_paths_miss(self) -> None:
+        """Shapes that pass far from each other do not collide"""
+        hit, toi = swept_narrow_phase(
+            SHAPE, poses([[0, 0]], [0]), poses([[100, 0]], [0]), self.sizes,
+            poses([[100, 50]], [0]), poses([[0, 50]], [0]), self.sizes)
+        self.assertEqual(len(hit), 0)
+        self.assertEqual(len(toi), 0)
+
+    def test_batches_same_as_one_sample_at_a_time(self) -> None:
+        """Batched samples and cuts find the same hits as one sample and
+        one halving at a time, which is SWEEP_BATCH 2, and time of
+        impact moves by at most 1/1024 tick"""
+        rng = np.random.default_rng(1)
+        n = 20000
+        start_a = (rng.uniform(0, 200, (n, 2)), rng.uniform(-np.pi, np.pi, n))
+        end_a = (start_a[0] + rng.normal(0, 40, (n, 2)),
+                 start_a[1] + rng.normal(0, 0.5, n))
+        start_b = (rng.uniform(0, 200, (n, 2)), rng.uniform(-np.pi, np.pi, n))
+        end_b = (start_b[0] + rng.normal(0, 40, (n, 2)),
+                 start_b[1] + rng.normal(0, 0.5, n))
+        sizes_a = rng.uniform(3, 15, n)
+        sizes_b = rng.uniform(3, 15, n)
+        args = (SHAPE, start_a, end_a, sizes_a, start_b, end_b, sizes_b)
+
+        hit, toi = swept_narrow_phase(*args)
+        with mock.patch.object(collision, "SWEEP_BATCH", 2):
+            old_hit, old_toi = swept_narrow_phase(*args)
+
+        self.assertGreater(len(hit), 1000)
+        np.testing.assert_array_equal(hit, old_hit)
+        np.testing.assert_allclose(toi, old_toi, rtol=0, atol=1 / 1024)
+
+    def test_one_shape_against_many(self) -> None:
+        """Second shape can be one shape that is tested with every first"""
+        start_a = poses([[0, 0], [0, 200]], [0, 0])
+        end_a = poses([[100, 0], [100, 200]], [0, 0])
+        hit, _ = swept_narrow_phase(
+            SHAPE, start_a, end_a, np.full(2, self.SIZE),
+            (np.array([100.0, 0.0]), 0.0), (np.array([0.0, 0.0]), 0.0),
+            self.SIZE)
+        self.assertEqual(hit.tolist(), [0])
+
+
+class DiscreteSimulation(Simulation):
+    """Simulation that tests missiles only at their place now"""
+
+    SWEPT_COLLISION = False
+
+
+class TestCheckColision(unittest.TestCase):
+    """Tests of Simulation.check_colision with both collision tests"""
+
+    def make(self, cls: type, centers: list) -> Simulation:
+        """Get a game with missiles at centers that have not moved"""
+        sim = cls(seed=0)
+        sim.reset()
+        for center in centers:
+            sim.swarm.spawn(size=sim.MISSILE_SIZE, center=center,
+                            speed=sim.MISSILE_SPEED,
+                            acceleration=sim.MISSILE_ACCELERATION,
+                            max_speed=sim.MISSILE_MAX_SPEED,
+                            max_turn_rate=sim.MISSLIE_MAX_TURN_RATE)
+        sim.save_previous()
+        return sim
+
+    def test_no_missile(self) -> None:
+        """Nothing to test and nothing is removed without missiles"""
+        for cls in (Simulation, DiscreteSimulation):
+            sim = self.make(cls, [])
+            sim.check_colision()
+            self.assertTrue(sim.player.get_alive())
+            self.assertEqual(sim.missiles_dodged, 0)
+
+    def test_missiles_hit_each_other(self) -> None:
+        """Two missiles at the same place are both removed and dodged"""
+        for cls in (Simulation, DiscreteSimulation):
+            sim = self.make(cls, [(50.0, 50.0), (52.0, 50.0), (400.0, 50.0)])
+            sim.check_colision()
+            self.assertEqual(len(sim.missiles), 1)
+            self.assertEqual(sim.missiles_dodged, 2)
+            self.assertTrue(sim.player.get_alive())
+
+    def test_missile_hits_player(self) -> None:
+        """Missile on player kills it and is not counted as dodged"""
+        for cls in (Simulation, DiscreteSimulation):
+            center = (cls.WORLD_WIDTH / 2, cls.WORLD_HEIGHT / 2)
+            sim = self.make(cls, [center])
+            sim.check_colision()
+            self.assertFalse(sim.player.get_alive())
+            self.assertEqual(len(sim.missiles), 0)
+            self.assertEqual(sim.missiles_dodged, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
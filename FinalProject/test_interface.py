@@ -0,0 +1,62 @@
+"""
+    Module that contains tests of text cache of UserInterface
+"""
+
+import unittest
+
+import pygame
+
+from interface import UserInterface
+
+
+WHITE = (255, 255, 255)
+RED = (255, 0, 0)
+
+
+class TestTextCache(unittest.TestCase):
+    """Tests of hits and evictions of rendered texts"""
+
+    def setUp(self) -> None:
+        self.ui = UserInterface(pygame.Surface((200, 100)))
+
+    def draw(self, text: str, col: tuple = WHITE) -> None:
+        """Draw text in hud style and check that it is drawn"""
+        self.assertIsNotNone(self.ui.draw_text(text, "hud", col, (0, 0)))
+
+    def test_same_text_is_rendered_once(self) -> None:
+        """Text is rendered on first draw and taken from cache after"""
+        for _ in range(5):
+            self.draw("score: 3")
+        self.assertEqual(self.ui.get_cache_stats(), (4, 1))
+
+        # color and style are part of the key
+        self.draw("score: 3", RED)
+        self.ui.draw_text("score: 3", "small", WHITE, (0, 0))
+        self.assertEqual(self.ui.get_cache_stats(), (4, 3))
+
+    def test_least_recently_used_is_dropped(self) -> None:
+        """Full cache drops the text that was not drawn for longest"""
+        self.ui.CACHE_SIZE = 2
+        self.draw("a")
+        self.draw("b")
+        self.draw("a")
+        self.draw("c")
+        self.assertEqual(self.ui.get_cache_stats(), (1, 3))
+
+        # b was dropped, a and c are still there
+        self.draw("a")
+        self.draw("c")
+        self.assertEqual(self.ui.get_cache_stats(), (3, 3))
+        self.draw("b")
+        self.assertEqual(self.ui.get_cache_stats(), (3, 4))
+
+    def test_clear_cache(self) -> None:
+        """Text is rendered again after cache is cleared"""
+        self.draw("a")
+        self.ui.clear_cache()
+        self.draw("a")
+        self.assertEqual(self.ui.get_cache_stats(), (0, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+    Module that contains tests of FrameProfiler
+"""
+
+import csv
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from profiler import (PHASE_DRAW, PHASE_EVENTS, PHASE_FRAME, PHASES,
+                      FrameProfiler)
+
+
+class TestFrameProfiler(unittest.TestCase):
+    """Tests of ring buffer and export with a clock set by the test"""
+
+    def setUp(self) -> None:
+        self.now = 0.0
+        patcher = mock.patch("profiler.time.perf_counter",
+                             lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def record(self, profiler: FrameProfiler, events: float,
+               draw: float) -> None:
+        """Record one frame, events runs twice like a frame of two ticks"""
+        profiler.begin_frame()
+        for _ in range(2):
+            profiler.start()
+            self.now += events / 2
+            profiler.lap(PHASE_EVENTS)
+        self.now += 0.001
+        profiler.start()
+        self.now += draw
+        profiler.lap(PHASE_DRAW)
+        profiler.end_frame()
+
+    def test_laps_add_up(self) -> None:
+        """Every lap adds to its phase, frame has the whole time"""
+        profiler = FrameProfiler()
+        self.record(profiler, 0.004, 0.002)
+
+        last = profiler.get_last()
+        self.assertAlmostEqual(last["events"], 0.004)
+        self.assertAlmostEqual(last["draw"], 0.002)
+        self.assertAlmostEqual(last["frame"], 0.007)
+        self.assertEqual(last["present"], 0.0)
+
+    def test_ring_buffer_keeps_newest(self) -> None:
+        """Full buffer overwrites the oldest frame, order stays oldest
+        first"""
+        profiler = FrameProfiler(size=3)
+        self.assertEqual(len(profiler.get_frames()), 0)
+
+        for i in range(5):
+            self.record(profiler, 0.001 * (i + 1), 0.0)
+
+        frames = profiler.get_frames()
+        self.assertEqual(frames.shape, (3, len(PHASES)))
+        for got, want in zip(frames[:, PHASE_EVENTS], (0.003, 0.004, 0.005)):
+            self.assertAlmostEqual(got, want)
+        self.assertAlmostEqual(profiler.get_last()["events"], 0.005)
+
+    def test_percentiles(self) -> None:
+        """Percentiles are in milliseconds"""
+        profiler = FrameProfiler(size=100)
+        for i in range(100):
+            self.record(profiler, 0.001 * (i + 1), 0.0)
+
+        events = profiler.get_percentiles()["events"]
+        self.assertAlmostEqual(events["p50"], 50.5)
+        self.assertAlmostEqual(events["p99"], 99.01)
+
+    def test_dump_csv_and_json(self) -> None:
+        """Files have every frame in milliseconds, oldest first"""
+        profiler = FrameProfiler(size=2)
+        for i in range(3):
+            self.record(profiler, 0.001 * (i + 1), 0.002)
+
+        path = os.path.join(self.dir.name, "frames.csv")
+        profiler.dump_csv(path)
+        with open(path, newline="", encoding="utf-8") as file:
+            rows = list(csv.reader(file))
+        self.assertEqual(tuple(rows[0]), PHASES)
+        self.assertEqual(len(rows), 3)
+        self.assertAlmostEqual(float(rows[1][PHASE_EVENTS]), 2.0)
+        self.assertAlmostEqual(float(rows[2][PHASE_FRAME]), 6.0)
+
+        path = os.path.join(self.dir.name, "frames.json")
+        profiler.dump_json(path)
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+        self.assertEqual(tuple(data["phases"]), PHASES)
+        self.assertEqual(len(data["frames"]), 2)
+        self.assertAlmostEqual(data["frames"][0][PHASE_EVENTS], 2.0)
+        self.assertAlmostEqual(data["percentiles"]["draw"]["p50"], 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
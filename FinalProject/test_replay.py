@@ -0,0 +1,108 @@
+"""
+    Module that contains tests of recording and playing replays
+"""
+
+import os
+import random
+import tempfile
+import unittest
+
+from replay import (FOOTER, ReplayReader, ReplayWriter, _encode_varint,
+                    play)
+from simulation import (INPUT_LEFT, INPUT_RESTART, INPUT_RIGHT, INPUT_START,
+                        Simulation)
+
+
+class TestReplay(unittest.TestCase):
+    """Tests of ReplayWriter and ReplayReader"""
+
+    SEED = 12345
+    TICKS = 3000
+
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "game.rpl")
+
+    def tearDown(self) -> None:
+        self.dir.cleanup()
+
+    def record(self) -> Simulation:
+        """Play a game with random inputs and record it"""
+        sim = Simulation(seed=self.SEED)
+        sim.reset()
+        writer = ReplayWriter(self.path, self.SEED, 1 / sim.tick_dt)
+        sim.set_recorder(writer)
+
+        # keys are held for a while like a player does
+        rng = random.Random(0)
+        inputs = INPUT_START
+        for _ in range(self.TICKS):
+            if rng.random() < 0.05:
+                inputs = rng.choice((0, INPUT_LEFT, INPUT_RIGHT,
+                                     INPUT_START | INPUT_RESTART))
+            sim.step(inputs, sim.tick_dt)
+
+        writer.close(sim.score)
+        self.assertEqual(writer.get_ticks(), self.TICKS)
+        return sim
+
+    def test_round_trip(self) -> None:
+        """Same seed and same inputs is the same game"""
+        recorded = self.record()
+        played, reader = play(self.path)
+
+        self.assertEqual(reader.get_ticks(), self.TICKS)
+        self.assertEqual(reader.get_score(), recorded.score)
+        self.assertEqual(played.score, recorded.score)
+        self.assertEqual(played.high_score, recorded.high_score)
+        self.assertEqual(played.state, recorded.state)
+        self.assertEqual(played.player.get_center(),
+                         recorded.player.get_center())
+        self.assertEqual(played.swarm.get_centers().tolist(),
+                         recorded.swarm.get_centers().tolist())
+
+    def test_without_footer(self) -> None:
+        """A replay of a game that crashed is played but not verified"""
+        self.record()
+        with open(self.path, "r+b") as file:
+            file.truncate(os.path.getsize(self.path) - FOOTER.size - 1)
+
+        _, reader = play(self.path)
+        self.assertIsNone(reader.get_ticks())
+        self.assertIsNone(reader.get_score())
+
+    def test_runs_of_same_inputs(self) -> None:
+        """Inputs that are held are one run, every tick is read back"""
+        ticks = [0] * 5 + [INPUT_LEFT] * 300 + [INPUT_RIGHT] + [0] * 70000
+        writer = ReplayWriter(self.path, 1, 60)
+        for inputs in ticks:
+            writer.record(inputs)
+        writer.close(7)
+
+        reader = ReplayReader(self.path)
+        self.assertEqual(reader.get_seed(), 1)
+        self.assertEqual(reader.get_tick_rate(), 60.0)
+        self.assertEqual([reader.next_inputs() for _ in ticks], ticks)
+        self.assertTrue(reader.is_finished())
+        self.assertEqual(reader.next_inputs(), 0)
+        self.assertEqual((reader.get_ticks(), reader.get_score()),
+                         (len(ticks), 7))
+
+    def test_invalid_file(self) -> None:
+        """A file that is not a replay is refused"""
+        with open(self.path, "wb") as file:
+            file.write(b"not a replay file at all")
+
+        with self.assertRaises(ValueError):
+            ReplayReader(self.path)
+
+    def test_varint(self) -> None:
+        """Varint takes 7 bits per byte"""
+        self.assertEqual(_encode_varint(0), b"\x00")
+        self.assertEqual(_encode_varint(127), b"\x7f")
+        self.assertEqual(_encode_varint(128), b"\x80\x01")
+        self.assertEqual(_encode_varint(300), b"\xac\x02")
+
+
+if __name__ == "__main__":
+    unittest.main()
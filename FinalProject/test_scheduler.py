@@ -0,0 +1,90 @@
+"""
+    Module that contains tests of Scheduler
+"""
+
+import unittest
+
+from scheduler import Scheduler
+
+
+class TestScheduler(unittest.TestCase):
+    """Tests of order and cancelling of timed events"""
+
+    def setUp(self) -> None:
+        self.now = 0.0
+        self.ran = []
+        self.scheduler = Scheduler(lambda: self.now)
+
+    def note(self, name: str):
+        """Get callback that notes its name when it runs"""
+        return lambda: self.ran.append(name)
+
+    def test_order(self) -> None:
+        """Earliest first, same time in the order of scheduling"""
+        self.scheduler.schedule(2.0, self.note("c"))
+        self.scheduler.schedule(1.0, self.note("a"))
+        self.scheduler.schedule(1.0, self.note("b"))
+        self.scheduler.schedule(5.0, self.note("d"))
+
+        self.now = 0.5
+        self.assertEqual(self.scheduler.run_due(), 0)
+
+        self.now = 2.0
+        self.assertEqual(self.scheduler.run_due(), 3)
+        self.assertEqual(self.ran, ["a", "b", "c"])
+        self.assertEqual(self.scheduler.get_next_time(), 5.0)
+        self.assertEqual(self.scheduler.get_count(), 1)
+
+    def test_cancel(self) -> None:
+        """Cancelled events do not run and are not counted"""
+        first = self.scheduler.schedule(1.0, self.note("a"))
+        self.scheduler.schedule(2.0, self.note("b"))
+        self.scheduler.cancel(first)
+        self.scheduler.cancel(first)
+        self.scheduler.cancel(None)
+
+        self.assertEqual(self.scheduler.get_count(), 1)
+        self.assertEqual(self.scheduler.get_next_time(), 2.0)
+
+        self.now = 3.0
+        self.scheduler.run_due()
+        self.assertEqual(self.ran, ["b"])
+        self.assertFalse(first.pending)
+        self.assertEqual(self.scheduler.get_count(), 0)
+
+    def test_many_cancelled(self) -> None:
+        """Heap is built again when most of it is cancelled"""
+        events = [self.scheduler.schedule(float(i), self.note(i))
+                  for i in range(200)]
+        for event in events[:150]:
+            self.scheduler.cancel(event)
+
+        self.assertEqual(self.scheduler.get_count(), 50)
+        self.now = 1000.0
+        self.assertEqual(self.scheduler.run_due(), 50)
+        self.assertEqual(self.ran, list(range(150, 200)))
+
+    def test_schedule_while_running(self) -> None:
+        """Event scheduled by a callback waits for the next run_due()"""
+        def again() -> None:
+            self.ran.append("again")
+            self.scheduler.schedule(0.0, again)
+
+        self.scheduler.schedule(0.0, again)
+        self.assertEqual(self.scheduler.run_due(), 1)
+        self.assertEqual(self.scheduler.run_due(), 1)
+        self.assertEqual(self.ran, ["again", "again"])
+        self.assertEqual(self.scheduler.get_count(), 1)
+
+    def test_clear(self) -> None:
+        """Clear removes every event, their handles are not pending"""
+        event = self.scheduler.schedule(1.0, self.note("a"))
+        self.scheduler.clear()
+
+        self.assertFalse(event.pending)
+        self.assertEqual(self.scheduler.get_count(), 0)
+        self.assertIsNone(self.scheduler.get_next_time())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+"""
+    Module that contains tests of ScoreLog recovery
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from scorelog import RECORD, ScoreLog
+
+
+class TestScoreLog(unittest.TestCase):
+    """Tests of opening a log that was written, cut or broken"""
+
+    SCORES = [3, 10, 7, 1, 5]
+
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "scores.log")
+
+        log = ScoreLog(self.path)
+        for i, score in enumerate(self.SCORES):
+            log.add(score, when=1_700_000_000.0 + i)
+        log.close()
+
+    def tearDown(self) -> None:
+        self.dir.cleanup()
+
+    def open(self, drop_index: bool = True) -> ScoreLog:
+        """Open the log again, without index every record is read"""
+        if drop_index:
+            os.remove(self.path + ".idx")
+        log = ScoreLog(self.path)
+        log.close()
+        return log
+
+    def test_reopen_with_index(self) -> None:
+        """Index gives every run without reading the log"""
+        log = self.open(drop_index=False)
+        self.assertEqual(log.get_count(), len(self.SCORES))
+        self.assertEqual([s for s, _ in log.top()],
+                         sorted(self.SCORES, reverse=True))
+
+    def test_broken_record_in_middle(self) -> None:
+        """A record with wrong checksum is skipped, the rest are kept"""
+        with open(self.path, "r+b") as file:
+            file.seek(RECORD.size + 4)
+            file.write(b"\xff\xff\xff\x7f")
+
+        log = self.open()
+        self.assertEqual(log.get_count(), len(self.SCORES) - 1)
+        self.assertEqual(log.get_high_score(), 7)
+        self.assertEqual(os.path.getsize(self.path),
+                         RECORD.size * len(self.SCORES))
+
+    def test_cut_record_at_end(self) -> None:
+        """Part of a record at the end is dropped from the file"""
+        with open(self.path, "ab") as file:
+            file.write(b"\x00" * (RECORD.size // 2))
+
+        log = self.open()
+        self.assertEqual(log.get_count(), len(self.SCORES))
+        self.assertEqual(os.path.getsize(self.path),
+                         RECORD.size * len(self.SCORES))
+
+        # next run is aligned after the dropped part
+        log = ScoreLog(self.path)
+        log.add(20, when=1_700_000_100.0)
+        log.close()
+        log = self.open()
+        self.assertEqual(log.get_count(), len(self.SCORES) + 1)
+        self.assertEqual(log.get_high_score(), 20)
+
+
+class TestScoreLogWriteError(unittest.TestCase):
+    """Tests of a batch that the disk does not take"""
+
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "scores.log")
+        self.fsync = os.fsync
+        self.fails = 0
+
+    def tearDown(self) -> None:
+        self.dir.cleanup()
+
+    def failing_fsync(self, fd: int) -> None:
+        """fsync that fails while self.fails is not zero"""
+        if self.fails:
+            self.fails -= 1
+            raise OSError("disk full")
+        self.fsync(fd)
+
+    def test_failed_batch_is_written_again(self) -> None:
+        """Failed batch is cut from the log and goes with the next one"""
+        with mock.patch("scorelog.os.fsync", self.failing_fsync), \
+                contextlib.redirect_stdout(io.StringIO()):
+            log = ScoreLog(self.path)
+
+            self.fails = 1
+            log.add(3, when=1_700_000_000.0)
+            log.flush()
+
+            # bytes written before the failed fsync are cut
+            self.assertEqual(os.path.getsize(self.path), 0)
+
+            log.add(8, when=1_700_000_001.0)
+            log.close()
+
+        self.assertEqual(os.path.getsize(self.path), 2 * RECORD.size)
+
+        os.remove(self.path + ".idx")
+        log = ScoreLog(self.path)
+        log.close()
+        self.assertEqual(log.get_count(), 2)
+        self.assertEqual([s for s, _ in log.top()], [8, 3])
+
+    def test_failed_index_does_not_write_again(self) -> None:
+        """Runs in the log are not written again when the index fails"""
+        with mock.patch("scorelog.os.replace",
+                        side_effect=OSError("disk full")), \
+                contextlib.redirect_stdout(io.StringIO()):
+            log = ScoreLog(self.path)
+            log.add(3, when=1_700_000_000.0)
+            log.flush()
+            log.add(8, when=1_700_000_001.0)
+            log.close()
+
+        self.assertEqual(os.path.getsize(self.path), 2 * RECORD.size)
+
+        # log is read past the old index
+        log = ScoreLog(self.path)
+        log.close()
+        self.assertEqual(log.get_count(), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
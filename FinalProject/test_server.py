@@ -0,0 +1,203 @@
+"""
+    Module that contains tests of GameServer
+"""
+
+import asyncio
+import random
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from server import (HELLO, MAGIC, VERSION, GameServer, read_frame,
+                    run_client)
+from simulation import INPUT_START
+from snapshot import POSITION_SCALE, SnapshotDecoder
+
+
+class FakeWriter:
+    """Connection that keeps what is written, its buffer size is set
+    by the test"""
+
+    def __init__(self) -> None:
+        self.frames = []
+        self.closed = False
+        self.transport = mock.Mock()
+        self.transport.get_write_buffer_size.return_value = 0
+
+    def write(self, data: bytes) -> None:
+        self.frames.append(data)
+
+    def is_closing(self) -> bool:
+        return self.closed
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class TestGameServer(unittest.TestCase):
+    """Tests of tick loop without network"""
+
+    def setUp(self) -> None:
+        self.server = GameServer(tick_rate=60)
+
+    def test_tick_steps_every_session(self) -> None:
+        """Every session is stepped once when all of them fit a tick"""
+        sessions = [self.server.add_session() for _ in range(5)]
+
+        for _ in range(3):
+            self.assertEqual(self.server.tick(), 5)
+
+        self.assertEqual([s.ticks for s in sessions], [3] * 5)
+        self.assertEqual(self.server.get_stats()["ticks"], 3)
+
+    def test_slow_session_does_not_stall_others(self) -> None:
+        """Session slower than the budget skips ticks, others keep
+        the tick rate"""
+        slow, *fast = [self.server.add_session() for _ in range(3)]
+        budget = self.server.TICK_BUDGET / 60
+        step = slow.sim.step
+
+        def sleepy_step(inputs: int, dt: float) -> None:
+            time.sleep(2 * budget)
+            step(inputs, dt)
+
+        ticks = 30
+        with mock.patch.object(slow.sim, "step", sleepy_step):
+            for _ in range(ticks):
+                self.server.tick()
+
+        # only a tick where the slow one runs first can run out
+        for session in fast:
+            self.assertGreaterEqual(session.ticks, ticks - ticks // 3)
+        self.assertLessEqual(slow.ticks, ticks // 2)
+        self.assertGreater(self.server.get_stats()["throttled"], 0)
+
+    def test_full_buffer_drops_frames(self) -> None:
+        """Client that does not read loses frames, the next frame is a
+        delta of the last one that it has"""
+        writer = FakeWriter()
+        session = self.server.add_session(writer)
+        session.inputs = INPUT_START
+        decoder = SnapshotDecoder()
+
+        self.server.tick()
+        self.assertEqual(len(writer.frames), 1)
+        decoder.decode(writer.frames[-1])
+
+        writer.transport.get_write_buffer_size.return_value = \
+            self.server.MAX_BUFFER + 1
+        for _ in range(3):
+            self.server.tick()
+        self.assertEqual(len(writer.frames), 1)
+        self.assertEqual(session.dropped, 3)
+        self.assertEqual(self.server.get_stats()["dropped"], 3)
+
+        writer.transport.get_write_buffer_size.return_value = 0
+        self.server.tick()
+        self.assertEqual(len(writer.frames), 2)
+        world = decoder.decode(writer.frames[-1])
+        self.assertEqual(world.tick, 5)
+        np.testing.assert_allclose(world.player[:2],
+                                   session.sim.player.get_center(),
+                                   atol=1 / POSITION_SCALE)
+
+    def test_remove_session(self) -> None:
+        """Removed session is closed and not stepped, removing it
+        again does nothing"""
+        writer = FakeWriter()
+        session = self.server.add_session(writer)
+        other = self.server.add_session()
+
+        self.server.remove_session(session.session_id)
+        self.server.remove_session(session.session_id)
+        self.assertTrue(writer.closed)
+        self.assertEqual(self.server.get_sessions(), [other])
+
+        self.server.tick()
+        self.assertEqual(session.ticks, 0)
+        self.assertEqual(other.ticks, 1)
+
+    def test_closed_or_broken_session_is_removed(self) -> None:
+        """Session whose client is gone or whose game fails is removed"""
+        writer = FakeWriter()
+        closed = self.server.add_session(writer)
+        broken = self.server.add_session()
+        writer.closed = True
+
+        with mock.patch.object(broken.sim, "step",
+                               side_effect=RuntimeError("broken")), \
+                mock.patch("builtins.print"):
+            self.server.tick()
+
+        self.assertEqual(self.server.get_sessions(), [])
+        self.assertEqual(closed.ticks, 1)
+
+
+class TestGameServerNetwork(unittest.IsolatedAsyncioTestCase):
+    """Tests of real clients over localhost"""
+
+    async def asyncSetUp(self) -> None:
+        self.server = GameServer(tick_rate=60, seed=7)
+        self.port = await self.server.start()
+
+    async def asyncTearDown(self) -> None:
+        await self.server.stop()
+
+    async def test_world_round_trip(self) -> None:
+        """Client gets HELLO, then frames with every missile and coin
+        of its game"""
+        reader, writer = await asyncio.open_connection("127.0.0.1",
+                                                       self.port)
+        magic, version, tick_rate, seed, session_id = HELLO.unpack(
+            await reader.readexactly(HELLO.size))
+        self.assertEqual((magic, version), (MAGIC, VERSION))
+        self.assertEqual((tick_rate, seed), (60.0, 7 + session_id))
+
+        writer.write(bytes((INPUT_START,)))
+        session, = self.server.get_sessions()
+        while session.inputs != INPUT_START:
+            await asyncio.sleep(0.01)
+
+        # start the game, then put a wave and a coin into it
+        self.server.tick()
+        session.sim.spwan_missiles()
+        session.sim.spawn_coin()
+        decoder = SnapshotDecoder()
+        decoder.decode(await read_frame(reader))
+
+        for tick in range(2, 12):
+            self.server.tick()
+            world = decoder.decode(await read_frame(reader))
+            sim = session.sim
+
+            self.assertEqual(world.tick, tick)
+            self.assertEqual(world.state, "playing")
+            np.testing.assert_allclose(world.missile_centers,
+                                       sim.swarm.get_centers(),
+                                       atol=1 / POSITION_SCALE)
+            coins = [c.get_center() for c in sim.coin]
+            np.testing.assert_allclose(world.coin_centers, coins,
+                                       atol=1 / POSITION_SCALE)
+
+        self.assertGreater(len(world.missile_centers), 0)
+        writer.close()
+        await writer.wait_closed()
+
+    async def test_run_serves_clients(self) -> None:
+        """Tick loop sends frames to every client until it stops"""
+        loop = asyncio.create_task(self.server.run())
+
+        received = await asyncio.gather(*(
+            run_client("127.0.0.1", self.port, 0.3, random.Random(i))
+            for i in range(3)))
+
+        await self.server.stop()
+        await loop
+        for count in received:
+            self.assertGreater(count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
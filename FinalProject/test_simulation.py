@@ -0,0 +1,131 @@
+"""
+    Module that contains tests of Simulation without a window
+"""
+
+import subprocess
+import sys
+import unittest
+
+import numpy as np
+
+from simulation import (INPUT_LEFT, INPUT_RESTART, INPUT_RIGHT, INPUT_START,
+                        Simulation)
+
+
+def play(seed: int, ticks: int = 3000) -> list:
+    """Play a game with inputs that only depend on the tick
+
+    Returns:
+        list: state, score and every missile center of every tick
+    """
+    sim = Simulation(seed=seed)
+    sim.reset()
+
+    trace = []
+    for tick in range(ticks):
+        # turn one way, go straight, turn the other way
+        inputs = (INPUT_LEFT, 0, INPUT_RIGHT, 0)[tick // 40 % 4]
+        sim.step(inputs | INPUT_START | INPUT_RESTART, sim.tick_dt)
+        trace.append((sim.state, sim.score,
+                      sim.swarm.get_centers().tolist()))
+    return trace
+
+
+class TestSimulation(unittest.TestCase):
+    """Tests of Simulation as a headless core"""
+
+    def test_no_pygame(self) -> None:
+        """Simulation does not import pygame"""
+        result = subprocess.run(
+            [sys.executable, "-c",
+             "import sys, simulation; "
+             "sim = simulation.Simulation(seed=0); sim.reset(); "
+             "sim.step(simulation.INPUT_START, sim.tick_dt); "
+             "sys.exit('pygame' in sys.modules)"],
+            capture_output=True, check=False)
+        self.assertEqual(result.returncode, 0, result.stderr.decode())
+
+    def test_same_seed_same_game(self) -> None:
+        """Same seed and inputs give the same game every tick"""
+        first = play(5)
+        self.assertEqual(first, play(5))
+
+        # the game was played, with missiles and a restart after death
+        self.assertTrue(any(centers for _, _, centers in first))
+        self.assertIn("menu", [state for state, _, _ in first[1:]])
+
+    def test_other_seed_other_game(self) -> None:
+        """Spawns come from the seed"""
+        self.assertNotEqual(play(5, 600), play(6, 600))
+
+
+class TestFixedStep(unittest.TestCase):
+    """Tests of ticks and alpha of advance_frame()"""
+
+    # 1/64 second is exact in float, so times compare equal
+    TICK_RATE = 64
+
+    def setUp(self) -> None:
+        self.sim = Simulation(tick_rate=self.TICK_RATE, seed=1)
+        self.sim.reset()
+        self.dt = self.sim.tick_dt
+
+    def ticks(self) -> int:
+        """Get ticks that are run, clock moves one tick_dt each"""
+        return round(self.sim.get_time() / self.dt)
+
+    def test_time_left_goes_to_next_frame(self) -> None:
+        """Whole ticks run, part of a tick is kept and is alpha"""
+        self.assertEqual(self.sim.advance_frame(2.5 * self.dt, 0), 0.5)
+        self.assertEqual(self.ticks(), 2)
+
+        self.assertEqual(self.sim.advance_frame(0.25 * self.dt, 0), 0.75)
+        self.assertEqual(self.ticks(), 2)
+
+        self.assertEqual(self.sim.advance_frame(0.5 * self.dt, 0), 0.25)
+        self.assertEqual(self.ticks(), 3)
+
+    def test_slow_frame_drops_time(self) -> None:
+        """Frame of many ticks runs only MAX_SUBSTEPS of them"""
+        alpha = self.sim.advance_frame(100.5 * self.dt, 0)
+        self.assertEqual(self.ticks(), Simulation.MAX_SUBSTEPS)
+        self.assertEqual(alpha, 0.5)
+
+        # and the next frame is on time again
+        self.sim.advance_frame(self.dt, 0)
+        self.assertEqual(self.ticks(), Simulation.MAX_SUBSTEPS + 1)
+
+    def test_interpolation(self) -> None:
+        """Alpha 0 is the place before the last tick, 1 is the place
+        now and 0.5 is half way"""
+        self.sim.advance_frame(self.dt, INPUT_START)
+        self.sim.spwan_missiles()
+        self.sim.advance_frame(3 * self.dt, INPUT_LEFT)
+
+        player = self.sim.player
+        center, heading = self.sim.prev_player
+        self.assertEqual(player.get_interpolated_points(center, heading, 0),
+                         player.transform_points(center, heading))
+        np.testing.assert_allclose(
+            player.get_interpolated_points(center, heading, 1),
+            player.get_points())
+
+        # player turned left, so half way is half of that turn
+        turn = player.get_heading() - heading
+        self.assertLess(turn, 0)
+        middle = np.mean([center, player.get_center()], axis=0)
+        np.testing.assert_allclose(
+            player.get_interpolated_points(center, heading, 0.5),
+            player.transform_points(tuple(middle), heading + turn / 2))
+
+        swarm = self.sim.swarm
+        self.assertGreater(len(swarm), 0)
+        prev, _ = swarm.get_poses(0.0)
+        now, _ = swarm.get_poses(1.0)
+        half, _ = swarm.get_poses(0.5)
+        self.assertFalse(np.allclose(prev, now))
+        np.testing.assert_allclose(half, (prev + now) / 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
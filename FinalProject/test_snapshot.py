@@ -0,0 +1,142 @@
+"""
+    Module that contains tests of packing and unpacking snapshots
+"""
+
+import unittest
+
+import numpy as np
+
+from simulation import INPUT_START, Simulation
+from snapshot import (COIN_CODES, POSITION_SCALE, SnapshotDecoder,
+                      SnapshotEncoder, dequantize_headings, split_frames)
+
+
+class TestSnapshot(unittest.TestCase):
+    """Tests of SnapshotEncoder and SnapshotDecoder on a played game"""
+
+    TICKS = 600
+    KEYFRAME_INTERVAL = 25
+
+    def setUp(self) -> None:
+        self.sim = Simulation(seed=3)
+        self.sim.reset()
+        self.sim.step(INPUT_START, self.sim.tick_dt)
+        self.encoder = SnapshotEncoder(self.KEYFRAME_INTERVAL)
+
+    def step(self) -> None:
+        """Run one tick, player never dies so waves and coins keep coming,
+        an invincible coin ends the effect so it is set every tick"""
+        self.sim.player_effect = "invincible"
+        self.sim.step(0, self.sim.tick_dt)
+
+    def assert_same(self, world, sim: Simulation, tick: int) -> None:
+        """Snapshot is the state of sim up to quantization"""
+        step = 1 / POSITION_SCALE
+        self.assertEqual(world.tick, tick)
+        self.assertEqual(world.state, sim.state)
+        self.assertEqual(world.score, sim.score)
+        self.assertEqual(world.invincible, sim.player_effect == "invincible")
+        np.testing.assert_allclose(world.player[:2], sim.player.get_center(),
+                                   atol=step)
+
+        centers = sim.swarm.get_centers()
+        self.assertEqual(world.missile_centers.shape, centers.shape)
+        np.testing.assert_allclose(world.missile_centers, centers, atol=step)
+
+        # heading goes around, compare the shortest turn between them
+        turn = world.missile_headings - sim.swarm.get_headings()
+        turn = (turn + np.pi) % (2 * np.pi) - np.pi
+        np.testing.assert_allclose(turn, 0, atol=1e-4)
+        np.testing.assert_array_equal(world.missile_alive,
+                                      sim.swarm.get_alive())
+
+        coins = np.array([c.get_center() for c in sim.coin]).reshape(-1, 2)
+        np.testing.assert_allclose(world.coin_centers, coins, atol=step)
+        self.assertEqual(world.coin_types.tolist(),
+                         [COIN_CODES[type(c)] for c in sim.coin])
+
+    def test_round_trip_with_deltas(self) -> None:
+        """Every keyframe and delta of a game is unpacked again"""
+        decoder = SnapshotDecoder()
+        keys = 0
+        counts = set()
+
+        for tick in range(1, self.TICKS + 1):
+            self.step()
+            frame = self.encoder.encode(self.sim, tick)
+            world = decoder.decode(frame)
+            self.assert_same(world, self.sim, tick)
+            keys += tick % self.KEYFRAME_INTERVAL == 1
+            counts.add((len(self.sim.swarm), len(self.sim.coin)))
+
+        # missiles and coins came and went during the game
+        self.assertGreater(len(counts), 2)
+        frames, keyframes, _ = self.encoder.get_stats()
+        self.assertEqual(frames, self.TICKS)
+        self.assertEqual(keyframes, keys)
+
+    def test_split_stream(self) -> None:
+        """Frames in one stream are split again, a cut end is dropped"""
+        frames = []
+        for tick in range(1, 41):
+            self.step()
+            frames.append(self.encoder.encode(self.sim, tick))
+
+        stream = b"".join(frames) + frames[-1][:-1]
+        self.assertEqual([bytes(f) for f in split_frames(stream)], frames)
+
+    def test_delta_without_keyframe(self) -> None:
+        """A delta of a frame that decoder does not have is refused"""
+        self.step()
+        self.encoder.encode(self.sim, 1)
+        self.step()
+        delta = self.encoder.encode(self.sim, 2)
+
+        with self.assertRaises(ValueError):
+            SnapshotDecoder().decode(delta)
+
+        # lost frame, gap does not lead to the last decoded tick
+        decoder = SnapshotDecoder()
+        self.encoder.force_keyframe()
+        decoder.decode(self.encoder.encode(self.sim, 3))
+        self.encoder.encode(self.sim, 4)
+        with self.assertRaises(ValueError):
+            decoder.decode(self.encoder.encode(self.sim, 5))
+
+    def test_cut_frame(self) -> None:
+        """A frame that is cut is refused"""
+        frame = self.encoder.encode(self.sim, 1)
+        with self.assertRaises(ValueError):
+            SnapshotDecoder().decode(frame[:-1])
+
+    def test_more_missiles_than_u16(self) -> None:
+        """Count of missiles does not wrap above 65535"""
+        count = 70_000
+        swarm = self.sim.swarm
+        rng = np.random.default_rng(0)
+        for x, y in rng.uniform(0, 600, (count, 2)).tolist():
+            swarm.spawn(size=self.sim.MISSILE_SIZE, center=(x, y),
+                        speed=self.sim.MISSILE_SPEED,
+                        acceleration=self.sim.MISSILE_ACCELERATION,
+                        max_speed=self.sim.MISSILE_MAX_SPEED,
+                        max_turn_rate=self.sim.MISSLIE_MAX_TURN_RATE)
+
+        world = SnapshotDecoder().decode(self.encoder.encode(self.sim, 1))
+        self.assertEqual(len(world.missile_centers), len(swarm))
+        np.testing.assert_allclose(world.missile_centers, swarm.get_centers(),
+                                   atol=1 / POSITION_SCALE)
+
+
+class TestHeadings(unittest.TestCase):
+    """Tests of quantized headings"""
+
+    def test_range(self) -> None:
+        """Headings are in [-pi, pi) and 0 is 0"""
+        headings = dequantize_headings(np.arange(0, 1 << 16, 997))
+        self.assertTrue(np.all(headings >= -np.pi))
+        self.assertTrue(np.all(headings < np.pi))
+        self.assertEqual(float(dequantize_headings(np.array(0))), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
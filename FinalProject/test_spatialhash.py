@@ -0,0 +1,140 @@
+"""
+    Module that contains tests of SpatialHash and CoinGrid
+"""
+
+import random
+import unittest
+
+import numpy as np
+
+from baseairplane import Airplane
+from coin import CoinFactory
+from spatialhash import CoinGrid, SpatialHash
+
+
+class TestSpatialHash(unittest.TestCase):
+    """Tests of candidate pairs against checking every pair"""
+
+    CELL_SIZE = 15.0
+
+    def setUp(self) -> None:
+        self.rng = np.random.default_rng(2)
+        self.grid = SpatialHash(self.CELL_SIZE)
+
+    def pairs(self, centers: np.ndarray) -> set:
+        """Get candidate pairs as a set of (low, high) index"""
+        self.grid.build(centers)
+        first, second = self.grid.candidate_pairs()
+
+        pairs = {(min(a, b), max(a, b))
+                 for a, b in zip(first.tolist(), second.tolist())}
+        self.assertEqual(len(pairs), len(first), "a pair is returned twice")
+        self.assertTrue(all(a != b for a, b in pairs))
+        return pairs
+
+    def test_same_as_brute_force(self) -> None:
+        """Every pair that is close is found, and every pair found is in
+        the same or neighbour cells"""
+        # some centers are left of and above zero
+        centers = self.rng.uniform(-100, 400, (800, 2))
+        pairs = self.pairs(centers)
+
+        gap = centers[:, None] - centers[None]
+        close = np.argwhere(np.triu((gap * gap).sum(axis=2)
+                                    <= self.CELL_SIZE ** 2, 1))
+        self.assertTrue({tuple(p) for p in close.tolist()} <= pairs)
+
+        cells = np.floor(centers / self.CELL_SIZE)
+        near = np.abs(cells[:, None] - cells[None]).max(axis=2) <= 1
+        brute = {tuple(p) for p in np.argwhere(np.triu(near, 1)).tolist()}
+        self.assertEqual(pairs, brute)
+
+    def test_same_cell(self) -> None:
+        """Objects on one point are every pair of each other"""
+        count = SpatialHash.SMALL_COUNT + 4
+        pairs = self.pairs(np.full((count, 2), 7.0))
+        self.assertEqual(len(pairs), count * (count - 1) // 2)
+
+    def test_small_count_gives_every_pair(self) -> None:
+        """Few objects skip the grid, even far apart ones are a pair"""
+        centers = self.rng.uniform(0, 10000, (SpatialHash.SMALL_COUNT, 2))
+        count = len(centers)
+        self.assertEqual(len(self.pairs(centers)), count * (count - 1) // 2)
+
+    def test_empty(self) -> None:
+        """No object gives no pair"""
+        self.assertEqual(self.pairs(np.zeros((0, 2))), set())
+
+
+class TestCoinGrid(unittest.TestCase):
+    """Tests of coin queries against checking every coin"""
+
+    CELL_SIZE = 30
+
+    def setUp(self) -> None:
+        self.rng = random.Random(3)
+        self.grid = CoinGrid(self.CELL_SIZE)
+        factory = CoinFactory()
+
+        # radius up to twice the cell, and coins left of and above zero
+        self.coins = [
+            factory.create_coin(self.rng.choice(list(CoinFactory.COIN_TYPES)),
+                                (self.rng.randint(-50, 300),
+                                 self.rng.randint(-50, 300)),
+                                5, self.rng.choice((5, 15, 60)))
+            for _ in range(300)]
+        for coin in self.coins:
+            self.grid.insert(coin)
+
+    def assert_same_as_radius_check(self) -> None:
+        """Query finds the coins that Coin.is_colliding() finds"""
+        hits = 0
+        for _ in range(300):
+            point = (self.rng.uniform(-80, 330), self.rng.uniform(-80, 330))
+            plane = Airplane(size=8, center=point, speed=6)
+
+            found = self.grid.query(point)
+            want = [c for c in self.coins if c.is_colliding(plane)]
+            self.assertEqual(len(found), len(set(map(id, found))))
+            self.assertEqual(set(map(id, found)), set(map(id, want)))
+            hits += len(want)
+
+        self.assertGreater(hits, 0)
+
+    def test_query_same_as_radius_check(self) -> None:
+        """Every coin that contains a point is found, and only those"""
+        self.assert_same_as_radius_check()
+
+    def test_removed_coins_are_not_found(self) -> None:
+        """Coins that are taken out are not found any more"""
+        removed = self.coins[::2]
+        self.coins = self.coins[1::2]
+        for coin in removed:
+            self.grid.remove(coin)
+
+        self.assertEqual(self.grid.get_count(), len(self.coins))
+        self.assert_same_as_radius_check()
+
+    def test_query_box_has_every_coin_in_box(self) -> None:
+        """Box query has every coin whose circle reaches into the box"""
+        for _ in range(100):
+            x, y = self.rng.uniform(-80, 330), self.rng.uniform(-80, 330)
+            box = (x, x + 20, y, y + 20)
+
+            found = set(map(id, self.grid.query_box(box)))
+            for coin in self.coins:
+                cx, cy = coin.get_center()
+                dx = max(box[0] - cx, 0, cx - box[1])
+                dy = max(box[2] - cy, 0, cy - box[3])
+                if dx * dx + dy * dy < coin.get_radius() ** 2:
+                    self.assertIn(id(coin), found)
+
+    def test_clear(self) -> None:
+        """Clear removes every coin"""
+        self.grid.clear()
+        self.assertEqual(self.grid.get_count(), 0)
+        self.assertEqual(self.grid.query((100, 100)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+    Module that contains tests of MissileSwarm and its SwarmMissile views
+"""
+
+import unittest
+
+from baseairplane import Airplane, Missile
+from swarm import MissileSwarm
+
+
+MISSILE = {"size": 5, "speed": 6, "max_turn_rate": 3.5,
+           "acceleration": 0.1, "max_speed": 6.5}
+
+
+class TestSwarmMissile(unittest.TestCase):
+    """Views of a swarm act like standalone missiles"""
+
+    def test_same_as_missile(self) -> None:
+        """View and Missile steer and move the same way"""
+        target = Airplane(size=15, center=(400.0, 300.0), speed=4)
+        missile = Missile(center=(10.0, 20.0), **MISSILE)
+        swarm = MissileSwarm()
+        view = swarm.spawn(center=(10.0, 20.0), **MISSILE)
+
+        for _ in range(20):
+            for m in (missile, view):
+                m.rotation_to_target(target)
+                m.update(1.0)
+
+            self.assertAlmostEqual(view.get_heading(), missile.get_heading())
+            for a, b in zip(view.get_center(), missile.get_center()):
+                self.assertAlmostEqual(a, b)
+            self.assertAlmostEqual(view.get_speed(), missile.get_speed())
+            self.assertEqual(view.get_alive(), missile.get_alive())
+
+        # out of fuel once it reaches max speed
+        self.assertFalse(view.get_alive())
+
+    def test_writes_go_to_swarm(self) -> None:
+        """A view changes the arrays of its swarm"""
+        swarm = MissileSwarm()
+        swarm.spawn(center=(0.0, 0.0), **MISSILE)
+        view = swarm.spawn(center=(50.0, 0.0), **MISSILE)
+
+        view.set_is_alive(False)
+        self.assertEqual(swarm.get_alive().tolist(), [True, False])
+
+        view.rotation_points(90)
+        self.assertAlmostEqual(float(swarm.get_headings()[1]),
+                               view.get_heading())
+        self.assertEqual(view.get_max_turn_rate(), MISSILE["max_turn_rate"])
+        self.assertEqual(view.get_acceleration(), MISSILE["acceleration"])
+        self.assertEqual(view.get_max_speed(), MISSILE["max_speed"])
+
+    def test_remove_dead_moves_views(self) -> None:
+        """Views of alive missiles follow their rows after remove_dead()"""
+        swarm = MissileSwarm()
+        views = [swarm.spawn(center=(float(i), 0.0), **MISSILE)
+                 for i in range(5)]
+        views[1].set_is_alive(False)
+        views[3].set_is_alive(False)
+
+        self.assertEqual(swarm.remove_dead(), 2)
+        self.assertEqual(sorted(v.get_center()[0]
+                                for v in swarm.get_missiles()),
+                         [0.0, 2.0, 4.0])
+        self.assertEqual(views[4].get_center(), (4.0, 0.0))
+
+    def test_stale_view_is_not_old_missile(self) -> None:
+        """View of a removed missile cannot be read as any missile,
+        and a spawn that reuses it is a new missile"""
+        swarm = MissileSwarm()
+        views = [swarm.spawn(center=(float(i), 0.0), **MISSILE)
+                 for i in range(3)]
+        stale = views[0]
+        stale.set_is_alive(False)
+        swarm.remove_dead()
+
+        self.assertIsNone(stale.swarm)
+        with self.assertRaises(AttributeError):
+            stale.get_center()
+
+        # row 0 is now the missile that was last
+        self.assertEqual(swarm.get_centers()[0].tolist(), [2.0, 0.0])
+
+        new = swarm.spawn(center=(9.0, 9.0), **MISSILE)
+        self.assertIs(new, stale)
+        self.assertEqual(new.get_center(), (9.0, 9.0))
+
+    def test_clear_detaches_views(self) -> None:
+        """Every view is detached by clear()"""
+        swarm = MissileSwarm()
+        view = swarm.spawn(center=(1.0, 0.0), **MISSILE)
+        swarm.clear()
+        with self.assertRaises(AttributeError):
+            view.get_alive()
+
+
+if __name__ == "__main__":
+    unittest.main()
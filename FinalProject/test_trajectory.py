@@ -0,0 +1,101 @@
+"""
+    Module that contains tests of trajectory datasets
+"""
+
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+from montecarlo import ScriptedPilot
+from simulation import INPUT_START, Simulation
+from trajectory import TrajectoryDataset, TrajectoryWriter
+
+
+class TestTrajectory(unittest.TestCase):
+    """Tests of TrajectoryWriter and TrajectoryDataset"""
+
+    EPISODES = 3
+    TICKS = 400
+    BUFFER_RECORDS = 64
+
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = self.dir.name
+
+    def tearDown(self) -> None:
+        self.dir.cleanup()
+
+    def assert_consistent(self, data: TrajectoryDataset) -> None:
+        """Every record points inside the files"""
+        ticks = data.get_ticks()
+        end = ticks["missile_start"].astype(np.int64) + ticks["missile_count"]
+        self.assertTrue(np.all(end <= len(data.get_missiles())))
+        self.assertTrue(np.all(data.get_coins()["tick"] < len(ticks)))
+
+        for e in data.get_episodes():
+            self.assertLessEqual(e["tick_start"] + e["tick_count"],
+                                 len(ticks))
+
+    def test_record_and_read(self) -> None:
+        """Dataset read while it is written is consistent, after close
+        every tick and its missiles are there"""
+        expected = []
+        writer = TrajectoryWriter(self.path,
+                                  buffer_records=self.BUFFER_RECORDS)
+
+        for episode in range(self.EPISODES):
+            sim = Simulation(seed=episode)
+            pilot = ScriptedPilot(random.Random(episode))
+            sim.reset()
+            sim.step(INPUT_START, sim.tick_dt)
+            writer.begin_episode(sim, episode)
+
+            for _ in range(self.TICKS):
+                if not sim.player.get_alive():
+                    break
+                inputs = pilot.choose(sim)
+                sim.step(inputs, sim.tick_dt)
+                writer.record(inputs)
+                expected.append(sim.swarm.get_centers().astype(np.float32))
+
+                # like a crash, files are read before close
+                if len(expected) % 97 == 0:
+                    self.assert_consistent(TrajectoryDataset(self.path))
+
+            writer.end_episode()
+
+        writer.close()
+        data = TrajectoryDataset(self.path)
+        self.assert_consistent(data)
+
+        self.assertEqual(len(data), self.EPISODES)
+        self.assertEqual(len(data.get_ticks()), len(expected))
+        self.assertEqual(int(data.get_episodes()["tick_count"].sum()),
+                         len(expected))
+        self.assertEqual(len(data.get_missiles()),
+                         sum(map(len, expected)))
+
+        for row, centers in enumerate(expected):
+            missiles = data.tick_missiles(row)
+            np.testing.assert_array_equal(missiles["x"], centers[:, 0])
+            np.testing.assert_array_equal(missiles["y"], centers[:, 1])
+
+        ticks, missiles, _ = data.episode(1)
+        self.assertTrue(np.all(ticks["episode"] == 1))
+        self.assertEqual(ticks["tick"].tolist(), list(range(len(ticks))))
+        self.assertEqual(len(missiles), int(ticks["missile_count"].sum()))
+
+    def test_existing_dataset(self) -> None:
+        """A dataset is not replaced without overwrite"""
+        TrajectoryWriter(self.path).close()
+        with self.assertRaises(FileExistsError):
+            TrajectoryWriter(self.path)
+        TrajectoryWriter(self.path, overwrite=True).close()
+        self.assertTrue(os.path.exists(os.path.join(self.path, "ticks.npy")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+"""
+    Module that contains tests of VectorEnv
+"""
+
+import unittest
+
+import numpy as np
+
+from simulation import Simulation
+from vecenv import VectorEnv
+
+
+class TestVectorEnv(unittest.TestCase):
+    """Tests of observation of VectorEnv"""
+
+    def setUp(self) -> None:
+        self.env = VectorEnv(4, seed=1)
+        self.start = VectorEnv.PLAYER_FEATURES
+
+    def __step_until_missiles(self) -> np.ndarray:
+        """Step with no input until some world sees a missile"""
+        actions = np.zeros(4, dtype=np.int64)
+        present = slice(self.start + VectorEnv.MISSILE_FEATURES - 1,
+                        self.start + 4 * VectorEnv.MISSILE_FEATURES,
+                        VectorEnv.MISSILE_FEATURES)
+        for _ in range(2000):
+            obs, _, _ = self.env.step(actions)
+            if obs[:, present].any():
+                return obs
+        self.fail("no missile was spawned")
+
+    def test_reset_clears_missiles_and_coins(self) -> None:
+        """Observation after reset has nothing left from the last game"""
+        self.__step_until_missiles()
+        obs = self.env.reset()
+        self.assertTrue(np.all(obs[:, self.start:] == 0))
+
+    def test_obs_size(self) -> None:
+        """Observation has player, missile and coin features"""
+        obs = self.env.reset()
+        size = (VectorEnv.PLAYER_FEATURES + 4 * VectorEnv.MISSILE_FEATURES
+                + 2 * VectorEnv.COIN_FEATURES)
+        self.assertEqual(obs.shape, (4, size))
+        self.assertEqual(self.env.get_obs_size(), size)
+
+
+class TestVectorEnvRules(unittest.TestCase):
+    """Tests of rewards and dones on worlds that are set up by hand,
+    world 1 is left empty and should get nothing"""
+
+    def setUp(self) -> None:
+        self.env = VectorEnv(2, seed=1)
+        self.env.reset()
+        self.actions = np.zeros(2, dtype=np.int64)
+
+        # no wave or coin comes by itself
+        self.array("next_wave")[:] = np.inf
+        self.array("next_coin")[:] = np.inf
+
+    def array(self, name: str) -> np.ndarray:
+        """Get a private array of the env, like VectorEnv.__double()"""
+        return getattr(self.env, f"_VectorEnv__{name}")
+
+    def place_missile(self,
+                      offset: tuple,
+                      heading: float,
+                      speed: float = Simulation.MISSILE_SPEED) -> None:
+        """Put a missile of a wave at offset from player of world 0"""
+        slot = int(np.argmin(self.array("m_present")[0]))
+        center = self.array("centers")[0] + offset
+
+        for name, value in (("m_centers", center),
+                            ("m_prev_centers", center),
+                            ("m_headings", heading),
+                            ("m_prev_headings", heading),
+                            ("m_speeds", speed),
+                            ("m_present", True),
+                            ("m_alive", True)):
+            self.array(name)[0, slot] = value
+        self.array("last_num")[0] += 1
+
+    def place_coin(self, kind: str) -> None:
+        """Put a coin under player of world 0"""
+        slot = int(np.argmin(self.array("c_present")[0]))
+        self.array("c_centers")[0, slot] = self.array("centers")[0]
+        self.array("c_types")[0, slot] = Simulation.COIN_TYPES.index(kind)
+        self.array("c_present")[0, slot] = True
+
+    def step(self):
+        """Step both worlds with no input"""
+        _, rewards, dones = self.env.step(self.actions)
+        return rewards.copy(), dones.copy()
+
+    def test_wave_score(self) -> None:
+        """Every missile of a wave that is gone scores one"""
+        # two missiles on top of each other hit, the third flies on
+        self.place_missile((300, 0), 0.0)
+        self.place_missile((300, 3), 0.0)
+        self.place_missile((-300, 0), 0.0)
+
+        rewards, dones = self.step()
+        self.assertEqual(rewards.tolist(), [2, 0])
+        self.assertEqual(dones.tolist(), [False, False])
+        self.assertEqual(self.env.get_scores().tolist(), [2, 0])
+        self.assertEqual(self.array("last_num")[0], 1)
+
+    def test_out_of_fuel(self) -> None:
+        """Missile at max speed is out of fuel, it is gone and scores"""
+        self.place_missile((300, 300), 0.0, Simulation.MISSILE_MAX_SPEED)
+
+        rewards, _ = self.step()
+        self.assertEqual(rewards.tolist(), [1, 0])
+        self.assertFalse(self.array("m_present")[0].any())
+
+    def test_boom_coin(self) -> None:
+        """Boom coin scores itself and removes every missile"""
+        self.place_missile((300, 0), 0.0)
+        self.place_missile((-300, 0), 0.0)
+        self.place_coin("delete_missile")
+
+        rewards, _ = self.step()
+        self.assertEqual(rewards.tolist(), [Simulation.COIN_SCORE + 2, 0])
+        self.assertFalse(self.array("m_present")[0].any())
+        self.assertFalse(self.array("c_present")[0].any())
+
+    def test_invincible_ends(self) -> None:
+        """Missiles go through an invincible player until the effect
+        time is over, then they kill it"""
+        self.place_coin("invincible")
+        rewards, _ = self.step()
+        self.assertEqual(rewards.tolist(), [Simulation.COIN_SCORE, 0])
+
+        # missile flies down into the player and out the other side
+        self.place_missile((0, -30), np.pi / 2)
+        for _ in range(10):
+            _, dones = self.step()
+            self.assertFalse(dones.any())
+        self.assertTrue(self.array("m_present")[0].any())
+
+        ticks = round(Simulation.AIRPLANE_EFFECT_TIME * Simulation.TICK_RATE)
+        for _ in range(ticks):
+            self.array("m_present")[0] = False
+            self.array("last_num")[0] = 0
+            self.step()
+        self.assertFalse(self.array("invincible")[0])
+
+        self.place_missile((0, -30), np.pi / 2)
+        done = False
+        for _ in range(10):
+            _, dones = self.step()
+            done = done or dones[0]
+        self.assertTrue(done)
+
+    def test_death_resets_world(self) -> None:
+        """Step that player dies gives DEATH_REWARD, is done and starts
+        a new game in that world only"""
+        self.place_coin("normal")
+        self.step()
+        self.place_missile((0, -30), np.pi / 2)
+        time = self.env.get_times()[0]
+
+        for _ in range(10):
+            rewards, dones = self.step()
+            if dones[0]:
+                break
+        else:
+            self.fail("missile did not hit the player")
+
+        # missile that hit is gone too, it scores like in Simulation
+        score = Simulation.COIN_SCORE + 1
+        self.assertEqual(rewards.tolist(), [1 + VectorEnv.DEATH_REWARD, 0])
+        self.assertEqual(dones.tolist(), [True, False])
+        self.assertEqual(self.env.get_final_scores()[0], score)
+        self.assertGreater(self.env.get_final_times()[0], time)
+        self.assertEqual(self.env.get_episodes(), 1)
+
+        self.assertEqual(self.env.get_scores().tolist(), [0, 0])
+        self.assertEqual(self.env.get_times()[0], 0.0)
+        self.assertGreater(self.env.get_times()[1], 0.0)
+        self.assertFalse(self.array("m_present")[0].any())
+        self.assertTrue(self.array("alive")[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
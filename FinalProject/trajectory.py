@@ -0,0 +1,628 @@
+"""
+    Module that records every tick of headless runs into a dataset of
+    fixed-record NumPy files, and reads it back with memory maps
+
+    Dataset is a directory, every file is a .npy file of records:
+        ticks.npy      one TICK record per tick of every episode
+        missiles.npy   one MISSILE record per missile per tick, rows of
+                       a tick follow each other from its missile_start
+        coins.npy      one COIN record per coin that spawns or is collected
+        episodes.npy   one EPISODE record per finished episode, the index
+
+    Records are appended through a small buffer, so a dataset can be
+    much bigger than memory. Every file is flushed at the same time,
+    files that are pointed to before files that point to them, and the
+    header of a file is rewritten after every flush, so a run that
+    crashes keeps every record up to its last flush and no record
+    points past the end of a file, only its last episode is not in
+    the index.
+
+    Run:
+        python trajectory.py record runs/ --episodes 100 --pilot scripted
+        python trajectory.py info runs/
+"""
+import argparse
+import os
+import random
+import struct
+import time
+from typing import Dict, Tuple
+
+import numpy as np
+
+from coin import Coin
+from montecarlo import PILOTS
+from simulation import Simulation, INPUT_START
+from snapshot import COIN_CODES
+
+
+# player of every tick, time is seconds from start of episode
+TICK = np.dtype([("episode", "<u4"), ("tick", "<u4"), ("time", "<f8"),
+                 ("inputs", "u1"), ("alive", "u1"), ("invincible", "u1"),
+                 ("x", "<f4"), ("y", "<f4"), ("heading", "<f4"),
+                 ("score", "<i4"), ("missile_start", "<u8"),
+                 ("missile_count", "<u4")])
+
+# every missile of a tick, id is MissileSwarm id of the missile
+MISSILE = np.dtype([("id", "<u4"), ("x", "<f4"), ("y", "<f4"),
+                    ("heading", "<f4"), ("speed", "<f4")])
+
+# coin that spawns or is collected, tick is row of the tick in ticks.npy
+COIN = np.dtype([("tick", "<u8"), ("event", "u1"), ("type", "u1"),
+                 ("x", "<f4"), ("y", "<f4")])
+
+# index of an episode, start and count are rows of every file
+EPISODE = np.dtype([("seed", "<i8"), ("score", "<i8"),
+                    ("survival_time", "<f8"),
+                    ("tick_start", "<u8"), ("tick_count", "<u8"),
+                    ("missile_start", "<u8"), ("missile_count", "<u8"),
+                    ("coin_start", "<u8"), ("coin_count", "<u8")])
+
+# event of a COIN record
+EVENT_SPAWN = 0
+EVENT_COLLECT = 1
+
+FILES = {"ticks": TICK, "missiles": MISSILE, "coins": COIN,
+         "episodes": EPISODE}
+
+# magic and version 1.0 of .npy, then u16 length of the header text
+NPY_MAGIC = b"\x93NUMPY\x01\x00"
+NPY_LENGTH = struct.Struct("<H")
+
+# records of every file that are kept before they are written
+BUFFER_RECORDS = 16 * 1024
+
+
+def npy_header(dtype: np.dtype, count: int) -> bytes:
+    """Get .npy header of a 1-d array of count records, it has the same
+    size for every count so it can be rewritten in place
+
+    Args:
+        dtype (np.dtype): dtype of every record
+        count (int): number of records
+
+    Returns:
+        bytes: header, its size is a multiple of 64
+    """
+    text = (f"{{'descr': {np.lib.format.dtype_to_descr(dtype)!r}, "
+            f"'fortran_order': False, 'shape': ({count},), }}")
+
+    # room for the biggest count, u64 has 20 digits
+    longest = len(text) - len(str(count)) + 20
+    size = -(-(len(NPY_MAGIC) + NPY_LENGTH.size + longest + 1) // 64) * 64
+    length = size - len(NPY_MAGIC) - NPY_LENGTH.size
+
+    return NPY_MAGIC + NPY_LENGTH.pack(length) \
+        + (text.ljust(length - 1) + "\n").encode("latin1")
+
+
+class RecordFile:
+    """Append-only .npy file of fixed-size records
+
+    Records are filled in place in a buffer from `reserve()` and the
+    buffer is written in one call by `flush()`, the file is never
+    read while it is written. The file does not flush by itself, the
+    buffer grows until its owner flushes, so files of one dataset are
+    flushed together.
+
+    Attributes:
+        path (str): .npy file, it is replaced
+        dtype (np.dtype): dtype of every record
+        buffer_records (int): records that are kept before it is full
+
+    Medthods:
+        reserve(): get rows of the buffer for new records
+        is_full(): check that buffer should be flushed
+        flush(): write buffer and header
+        close(): flush and close the file
+        get_count(): get number of records
+    """
+
+    def __init__(self,
+                 path: str,
+                 dtype: np.dtype,
+                 buffer_records: int = BUFFER_RECORDS) -> None:
+
+        assert isinstance(buffer_records, int) and buffer_records > 0, \
+            f"buffer_records should be positive int, but got {buffer_records}"
+
+        self.__dtype = np.dtype(dtype)
+        self.__file = open(path, "w+b")
+        self.__file.write(npy_header(self.__dtype, 0))
+        self.__file.flush()
+
+        self.__size = buffer_records
+        self.__buffer = np.zeros(buffer_records, self.__dtype)
+        self.__used = 0
+        self.__written = 0
+
+    def reserve(self, count: int) -> np.ndarray:
+        """Get rows of the buffer for new records, they are written
+        by a later flush so they must be filled before the next
+        reserve() or flush()
+
+        Args:
+            count (int): number of records
+
+        Returns:
+            np.ndarray: (count,) records to fill, values are not cleared
+        """
+        used = self.__used
+        if used + count > len(self.__buffer):
+            # buffer grows, it is written only when owner flushes
+            buffer = np.zeros(max(2 * len(self.__buffer), used + count),
+                              self.__dtype)
+            buffer[:used] = self.__buffer[:used]
+            self.__buffer = buffer
+
+        rows = self.__buffer[used:used + count]
+        self.__used += count
+        return rows
+
+    def is_full(self) -> bool:
+        """Check that buffer has buffer_records or more
+
+        Returns:
+            bool: `True` when it should be flushed
+        """
+        return self.__used >= self.__size
+
+    def flush(self) -> None:
+        """Write records of the buffer, then count of the header"""
+        file = self.__file
+        if self.__used:
+            file.write(memoryview(self.__buffer[:self.__used]))
+            self.__written += self.__used
+            self.__used = 0
+
+            # a buffer that grew goes back to its size
+            if len(self.__buffer) > self.__size:
+                self.__buffer = np.zeros(self.__size, self.__dtype)
+
+        file.seek(0)
+        file.write(npy_header(self.__dtype, self.__written))
+        file.seek(0, os.SEEK_END)
+        file.flush()
+
+    def close(self) -> None:
+        """Write every record and close the file"""
+        if not self.__file.closed:
+            self.flush()
+            self.__file.close()
+
+    # Access data part
+    def get_count(self) -> int:
+        """Get number of records, written and in the buffer
+
+        Returns:
+            int: row of the next record
+        """
+        return self.__written + self.__used
+
+
+class TrajectoryWriter:
+    """Write every tick of headless episodes into a dataset
+
+    An episode is from `begin_episode()` to `end_episode()`,
+    `record()` is called after every step of the simulation. Coins are
+    compared with the last tick, so a coin that is new is a spawn and
+    a coin that is gone and collected is a pickup.
+
+    When a buffer is full every file is flushed: missiles, then ticks
+    that point to them, then coins that point to ticks, then episodes.
+
+    Attributes:
+        directory (str): dataset directory, it is created when needed
+        overwrite (bool): replace a dataset that is there
+        buffer_records (int): records of every file that are kept
+                              before they are written
+
+    Medthods:
+        begin_episode(): start an episode of a simulation
+        record(): add the tick that simulation just ran
+        end_episode(): add the episode to the index
+        flush(): write records of every file
+        close(): write every record and close the files
+        get_tick_count(): get number of ticks that are recorded
+    """
+
+    def __init__(self,
+                 directory: str,
+                 overwrite: bool = False,
+                 buffer_records: int = BUFFER_RECORDS) -> None:
+
+        os.makedirs(directory, exist_ok=True)
+        paths = {name: os.path.join(directory, name + ".npy")
+                 for name in FILES}
+
+        if not overwrite and any(map(os.path.exists, paths.values())):
+            raise FileExistsError(f"{directory} has a dataset already")
+
+        self.__ticks = RecordFile(paths["ticks"], TICK, buffer_records)
+        self.__missiles = RecordFile(paths["missiles"], MISSILE,
+                                     buffer_records)
+        self.__coins = RecordFile(paths["coins"], COIN, buffer_records)
+        self.__episodes = RecordFile(paths["episodes"], EPISODE,
+                                     buffer_records)
+
+        # order of flush, a file is before the files that point to it
+        self.__files = (self.__missiles, self.__ticks, self.__coins,
+                        self.__episodes)
+
+        self.__sim: Simulation | None = None
+        self.__seed = 0
+        self.__start_time = 0.0
+        self.__tick = 0
+        self.__first = (0, 0, 0)
+
+        # coins of the last tick by id, with the coin itself
+        self.__last_coins: Dict[int, Coin] = {}
+
+    def begin_episode(self, sim: Simulation, seed: int = 0) -> None:
+        """Start an episode, next record() is its first tick
+
+        Args:
+            sim (Simulation): simulation that is in playing state
+            seed (int): seed of the episode, it is kept in the index
+        """
+        assert isinstance(sim, Simulation), \
+            f"sim should be Simulation, but got {type(sim)}"
+
+        if self.__sim is not None:
+            self.end_episode()
+
+        self.__sim = sim
+        self.__seed = seed
+        self.__start_time = sim.get_time()
+        self.__tick = 0
+        self.__first = (self.__ticks.get_count(),
+                        self.__missiles.get_count(),
+                        self.__coins.get_count())
+        self.__last_coins = {id(c): c for c in sim.coin}
+
+    def record(self, inputs: int = 0) -> None:
+        """Add the tick that simulation of the episode just ran
+
+        Args:
+            inputs (int): inputs that the tick was stepped with
+        """
+        sim = self.__sim
+        assert sim is not None, "record() should be after begin_episode()"
+
+        swarm = sim.swarm
+        n = len(swarm)
+        row = self.__ticks.get_count()
+
+        missiles = self.__missiles.reserve(n)
+        if n:
+            centers = swarm.get_centers()
+            missiles["id"] = swarm.get_ids()
+            missiles["x"] = centers[:, 0]
+            missiles["y"] = centers[:, 1]
+            missiles["heading"] = swarm.get_headings()
+            missiles["speed"] = swarm.get_speeds()
+
+        player = sim.player
+        x, y = player.get_center()
+        self.__ticks.reserve(1)[0] = (
+            self.__episodes.get_count(), self.__tick,
+            sim.get_time() - self.__start_time, inputs,
+            player.get_alive(), sim.player_effect == "invincible",
+            x, y, player.get_heading(), sim.score,
+            self.__missiles.get_count() - n, n)
+        self.__tick += 1
+
+        # only a tick that spawns or collects a coin writes one
+        coins = sim.coin
+        last = self.__last_coins
+        if len(coins) != len(last) or any(id(c) not in last for c in coins):
+            now = {id(c): c for c in coins}
+            events = [(EVENT_SPAWN, c) for key, c in now.items()
+                      if key not in last]
+            events += [(EVENT_COLLECT, c) for key, c in last.items()
+                       if key not in now and c.get_collected()]
+
+            records = self.__coins.reserve(len(events))
+            for record, (event, c) in zip(records, events):
+                record["tick"] = row
+                record["event"] = event
+                record["type"] = COIN_CODES[type(c)]
+                record["x"], record["y"] = c.get_center()
+
+            self.__last_coins = now
+
+        self.__flush_if_full()
+
+    def end_episode(self) -> None:
+        """Add the episode to the index, nothing happens without one"""
+        sim = self.__sim
+        if sim is None:
+            return
+
+        ticks, missiles, coins = self.__first
+        self.__episodes.reserve(1)[0] = (
+            self.__seed, sim.score, sim.get_time() - self.__start_time,
+            ticks, self.__ticks.get_count() - ticks,
+            missiles, self.__missiles.get_count() - missiles,
+            coins, self.__coins.get_count() - coins)
+        self.__sim = None
+
+        self.__flush_if_full()
+
+    def flush(self) -> None:
+        """Write records of every file, a file is written before
+        the files that point to it"""
+        for file in self.__files:
+            file.flush()
+
+    def __flush_if_full(self) -> None:
+        """Flush every file when a buffer is full"""
+        if any(file.is_full() for file in self.__files):
+            self.flush()
+
+    def close(self) -> None:
+        """End the episode, write every record and close the files"""
+        self.end_episode()
+        for file in self.__files:
+            file.close()
+
+    def __enter__(self) -> "TrajectoryWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # Access data part
+    def get_tick_count(self) -> int:
+        """Get number of ticks that are recorded
+
+        Returns:
+            int: rows of ticks.npy
+        """
+        return self.__ticks.get_count()
+
+
+class TrajectoryDataset:
+    """Dataset of TrajectoryWriter that is read with memory maps
+
+    Every array is a view onto the files, nothing is read until it is
+    used and slices of an episode or a range of ticks are not copied.
+
+    Attributes:
+        directory (str): dataset directory
+
+    Medthods:
+        episode(): get ticks, missiles and coin events of an episode
+        tick_range(): get ticks, missiles and coin events of some ticks
+        tick_missiles(): get missiles of one tick
+        get_episodes(): get index of every episode
+        get_ticks(): get every tick
+        get_missiles(): get every missile record
+        get_coins(): get every coin event
+        get_count(): get number of episodes
+    """
+
+    def __init__(self, directory: str) -> None:
+        arrays = {}
+        for name, dtype in FILES.items():
+            array = np.load(os.path.join(directory, name + ".npy"),
+                            mmap_mode="r")
+
+            if array.dtype != dtype:
+                raise ValueError(f"{name}.npy has dtype {array.dtype}, "
+                                 f"but it should be {dtype}")
+            arrays[name] = array
+
+        self.__ticks = arrays["ticks"]
+        self.__missiles = arrays["missiles"]
+        self.__coins = arrays["coins"]
+        self.__episodes = arrays["episodes"]
+
+    def __len__(self) -> int:
+        return len(self.__episodes)
+
+    def episode(self, i: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get every record of an episode
+
+        Args:
+            i (int): index of episode
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: ticks, missiles
+                and coin events of the episode, views onto the files
+        """
+        e = self.__episodes[i]
+        return (self.__slice(self.__ticks, e["tick_start"], e["tick_count"]),
+                self.__slice(self.__missiles, e["missile_start"],
+                             e["missile_count"]),
+                self.__slice(self.__coins, e["coin_start"], e["coin_count"]))
+
+    def tick_range(self,
+                   start: int,
+                   stop: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get every record of rows start to stop of ticks, they can
+        cross episodes
+
+        Args:
+            start (int): first row of ticks
+            stop (int): row after the last one
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: ticks, missiles
+                and coin events of the ticks, views onto the files
+        """
+        ticks = self.__ticks[start:stop]
+        if len(ticks) == 0:
+            return ticks, self.__missiles[:0], self.__coins[:0]
+
+        first = int(ticks[0]["missile_start"])
+        last = int(ticks[-1]["missile_start"]) + int(ticks[-1]["missile_count"])
+
+        # coin events are in order of tick
+        rows = self.__coins["tick"]
+        low, high = np.searchsorted(rows, (start, start + len(ticks)))
+        return ticks, self.__missiles[first:last], self.__coins[low:high]
+
+    def tick_missiles(self, row: int) -> np.ndarray:
+        """Get missiles of one tick
+
+        Args:
+            row (int): row of the tick in ticks
+
+        Returns:
+            np.ndarray: records of every missile, a view onto the file
+        """
+        tick = self.__ticks[row]
+        return self.__slice(self.__missiles, tick["missile_start"],
+                            tick["missile_count"])
+
+    @staticmethod
+    def __slice(array: np.ndarray, start, count) -> np.ndarray:
+        """Get count rows from start without a copy"""
+        start = int(start)
+        return array[start:start + int(count)]
+
+    # Access data part
+    def get_episodes(self) -> np.ndarray:
+        """Get index of every episode
+
+        Returns:
+            np.ndarray: EPISODE records
+        """
+        return self.__episodes
+
+    def get_ticks(self) -> np.ndarray:
+        """Get every tick, also ticks of an episode that did not end
+
+        Returns:
+            np.ndarray: TICK records
+        """
+        return self.__ticks
+
+    def get_missiles(self) -> np.ndarray:
+        """Get every missile record
+
+        Returns:
+            np.ndarray: MISSILE records
+        """
+        return self.__missiles
+
+    def get_coins(self) -> np.ndarray:
+        """Get every coin event
+
+        Returns:
+            np.ndarray: COIN records
+        """
+        return self.__coins
+
+    def get_count(self) -> int:
+        """Get number of episodes in the index
+
+        Returns:
+            int: finished episodes
+        """
+        return len(self.__episodes)
+
+
+def record_episodes(directory: str,
+                    episodes: int,
+                    seed: int = 0,
+                    pilot: str = "scripted",
+                    params: Dict[str, float] | None = None,
+                    max_time: float = 120.0,
+                    overwrite: bool = False) -> int:
+    """Play headless episodes like montecarlo and record every tick
+
+    Args:
+        directory (str): dataset directory
+        episodes (int): number of episodes
+        seed (int): seed of the whole run, episode i uses seed + i
+        pilot (str): name of pilot in PILOTS
+        params (Dict[str, float] | None): constants of Simulation to change
+        max_time (float): longest game time of one episode in seconds
+        overwrite (bool): replace a dataset that is there
+
+    Returns:
+        int: number of ticks that are recorded
+    """
+    with TrajectoryWriter(directory, overwrite) as writer:
+        for episode in range(episodes):
+            sim = Simulation(seed=seed + episode)
+            for name, value in (params or {}).items():
+                setattr(sim, name, value)
+
+            # pilot has its own random so it does not change spawns
+            driver = PILOTS[pilot](random.Random((seed + episode) ^ 0x5EED))
+            sim.reset()
+            sim.step(INPUT_START, sim.tick_dt)
+            writer.begin_episode(sim, seed + episode)
+
+            for _ in range(int(max_time / sim.tick_dt)):
+                if not sim.player.get_alive():
+                    break
+                inputs = driver.choose(sim)
+                sim.step(inputs, sim.tick_dt)
+                writer.record(inputs)
+
+            writer.end_episode()
+
+        return writer.get_tick_count()
+
+
+def info(directory: str) -> None:
+    """Print size of a dataset and how fast it is read
+
+    Args:
+        directory (str): dataset directory
+    """
+    data = TrajectoryDataset(directory)
+    ticks, missiles, coins = data.get_ticks(), data.get_missiles(), \
+        data.get_coins()
+    size = sum(os.path.getsize(os.path.join(directory, name + ".npy"))
+               for name in FILES)
+
+    print(f"episodes {len(data)}, ticks {len(ticks)}, "
+          f"missile records {len(missiles)}, coin events {len(coins)}")
+    print(f"size {size / 1e6:.1f} MB, "
+          f"{size / max(len(ticks), 1):.0f} bytes per tick")
+
+    if len(missiles):
+        start = time.perf_counter()
+        speed = float(missiles["speed"].mean())
+        print(f"mean missile speed {speed:.3f}, read every missile in "
+              f"{(time.perf_counter() - start) * 1e3:.1f} ms")
+
+
+def main() -> None:
+    """Command line of trajectory dataset"""
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip(),
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="record headless episodes")
+    record.add_argument("directory")
+    record.add_argument("--episodes", type=int, default=100)
+    record.add_argument("--seed", type=int, default=0)
+    record.add_argument("--pilot", choices=list(PILOTS), default="scripted")
+    record.add_argument("--max-time", type=float, default=120.0)
+    record.add_argument("--overwrite", action="store_true")
+
+    show = commands.add_parser("info", help="size of a dataset")
+    show.add_argument("directory")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        start = time.perf_counter()
+        ticks = record_episodes(args.directory, args.episodes, args.seed,
+                                args.pilot, max_time=args.max_time,
+                                overwrite=args.overwrite)
+        seconds = time.perf_counter() - start
+        print(f"recorded {ticks} ticks in {seconds:.1f} s "
+              f"({ticks / seconds:.0f} ticks/s)")
+
+    info(args.directory)
+
+
+if __name__ == "__main__":
+    main()
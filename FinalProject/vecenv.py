@@ -0,0 +1,707 @@
+"""
+    Module that contains VectorEnv, many headless games that are
+    stepped together in lock-step for training an autopilot
+
+    Every world follows the rules of Simulation, but the state of all
+    worlds is kept in NumPy arrays with one row per world, so a step of
+    1024 worlds is a few dozen array operations instead of 1024 calls
+    of `Simulation.step()`. Nothing of pygame is imported.
+
+    Run:
+        python vecenv.py --envs 1 64 1024
+"""
+import argparse
+import math
+import time
+from typing import Dict, Tuple
+
+import numpy as np
+
+from collision import swept_narrow_phase
+from simulation import Simulation, INPUT_LEFT, INPUT_RIGHT, INPUT_START
+from swarm import MissileSwarm
+
+
+class VectorEnv:
+    """Many worlds of the game that are reset and stepped together
+
+    A world is the playing state of Simulation, it starts when the
+    game starts and is done when the player dies or max_time is over.
+    A world that is done is reset in the same step, so `step()` can be
+    called forever and every row always has a running game.
+
+    Missiles and coins of every world are rows of padded arrays, a
+    slot is used when its `present` flag is set. Padding grows by
+    doubling when a world needs more slots than there are.
+
+    `step()` writes into the same observation, reward and done arrays
+    every call, copy them when they are kept for longer than a step.
+
+    Attributes:
+        num_envs (int): number of worlds
+        seed (int): seed of random spawns of every world
+        tick_rate (int): ticks per second of game time
+        max_time (float): game time in seconds before a world is done
+        params (Dict[str, float] | None): constants of Simulation
+                                          to change, like montecarlo
+        missile_obs (int): nearest missiles in every observation
+        coin_obs (int): nearest coins in every observation
+        DEATH_REWARD (float): reward of the step that player dies
+        PLAYER_FEATURES (int): x, y, cos and sin of heading and
+                               part of invincible time that is left
+        MISSILE_FEATURES (int): dx, dy, cos and sin of heading, present
+        COIN_FEATURES (int): dx, dy and one-hot of coin type
+        CAPACITY (int): missile and coin slots of a world at start
+
+    Medthods:
+        reset(): start a new game in every world
+        step(): run one tick of every world
+        get_obs_size(): get length of one observation
+        get_scores(): get score of running game of every world
+        get_times(): get game time of running game of every world
+        get_final_scores(): get score of worlds that were done last step
+        get_final_times(): get game time of worlds that were done last step
+        get_episodes(): get number of finished games
+    """
+
+    DEATH_REWARD = -10.0
+
+    PLAYER_FEATURES = 5
+    MISSILE_FEATURES = 5
+    COIN_FEATURES = 2 + len(Simulation.COIN_TYPES)
+
+    CAPACITY = 16
+
+    def __init__(self,
+                 num_envs: int,
+                 seed: int = 0,
+                 tick_rate: int = Simulation.TICK_RATE,
+                 max_time: float = 120.0,
+                 params: Dict[str, float] | None = None,
+                 missile_obs: int = 4,
+                 coin_obs: int = 2) -> None:
+
+        assert isinstance(num_envs, int) and num_envs > 0, \
+            f"num_envs should be positive int, but got {num_envs}"
+
+        assert isinstance(tick_rate, int) and tick_rate > 0, \
+            f"tick_rate should be positive int, but got {tick_rate}"
+
+        assert isinstance(missile_obs, int) and missile_obs >= 0, \
+            f"missile_obs should be int >= 0, but got {missile_obs}"
+
+        assert isinstance(coin_obs, int) and coin_obs >= 0, \
+            f"coin_obs should be int >= 0, but got {coin_obs}"
+
+        # constants of Simulation, params change some of them
+        rules = type("Rules", (Simulation,), dict(params or {}))
+        self.__rules = rules
+
+        n = num_envs
+        self.__num_envs = n
+        self.__rng = np.random.default_rng(seed)
+        self.__dt = 1.0 / tick_rate
+        self.__max_time = max_time
+        self.__missile_obs = missile_obs
+        self.__coin_obs = coin_obs
+
+        # constants that every tick uses
+        self.__scale = self.__dt * rules.BASE_TICK_RATE
+        self.__turn = math.radians(rules.AIRPLANE_ROTATION_ANGLE
+                                   * self.__scale)
+        self.__missile_turn = math.radians(rules.MISSLIE_MAX_TURN_RATE) \
+            * self.__scale
+        self.__spawn_positions = np.array(rules.SPAWN_POSITION, dtype=float)
+        weights = np.array(rules.COIN_WEIGHTS, dtype=float)
+        self.__coin_weights = weights / weights.sum()
+        self.__invincible_type = rules.COIN_TYPES.index("invincible")
+        self.__boom_type = rules.COIN_TYPES.index("delete_missile")
+        self.__position_scale = 1.0 / max(rules.WORLD_WIDTH,
+                                          rules.WORLD_HEIGHT)
+
+        # player of every world
+        self.__time = np.zeros(n)
+        self.__centers = np.zeros((n, 2))
+        self.__headings = np.zeros(n)
+        self.__prev_centers = np.zeros((n, 2))
+        self.__prev_headings = np.zeros(n)
+        self.__alive = np.ones(n, dtype=bool)
+        self.__invincible = np.zeros(n, dtype=bool)
+        self.__effect_end = np.zeros(n)
+        self.__score = np.zeros(n, dtype=np.int64)
+        self.__last_num = np.zeros(n, dtype=np.int64)
+        self.__next_wave = np.zeros(n)
+        self.__next_coin = np.zeros(n)
+
+        # missiles, (world, slot)
+        m = self.CAPACITY
+        self.__m_centers = np.zeros((n, m, 2))
+        self.__m_headings = np.zeros((n, m))
+        self.__m_speeds = np.zeros((n, m))
+        self.__m_prev_centers = np.zeros((n, m, 2))
+        self.__m_prev_headings = np.zeros((n, m))
+        self.__m_present = np.zeros((n, m), dtype=bool)
+        self.__m_alive = np.zeros((n, m), dtype=bool)
+
+        # pairs of slots for every number of used slots
+        self.__pairs: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+
+        # coins, (world, slot)
+        self.__c_centers = np.zeros((n, m, 2))
+        self.__c_types = np.zeros((n, m), dtype=np.intp)
+        self.__c_present = np.zeros((n, m), dtype=bool)
+
+        # results of step, written in place every call
+        self.__obs = np.zeros((n, self.get_obs_size()), dtype=np.float32)
+        self.__rewards = np.zeros(n, dtype=np.float32)
+        self.__dones = np.zeros(n, dtype=bool)
+        self.__final_scores = np.zeros(n, dtype=np.int64)
+        self.__final_times = np.zeros(n)
+        self.__episodes = 0
+
+        self.__reset_worlds(np.ones(n, dtype=bool))
+
+    def reset(self) -> np.ndarray:
+        """Start a new game in every world
+
+        Returns:
+            np.ndarray: (num_envs, get_obs_size()) observation of every world
+        """
+        self.__reset_worlds(np.ones(self.__num_envs, dtype=bool))
+        self.__dones[:] = False
+        self.__rewards[:] = 0
+        self.__observe()
+        return self.__obs
+
+    def step(self,
+             actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Run one tick of every world, in the same order as
+        `Simulation.step()` in playing state
+
+        Args:
+            actions (np.ndarray): (num_envs,) inputs of every world packed
+                                  with INPUT_LEFT and INPUT_RIGHT
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: observation, reward
+                and done of every world, a world that is done is already
+                reset and its observation is of the new game
+        """
+        actions = np.asarray(actions)
+        assert actions.shape == (self.__num_envs,), \
+            f"actions should have shape ({self.__num_envs},), " \
+            f"but got {actions.shape}"
+
+        self.__time += self.__dt
+        score_before = self.__score.copy()
+
+        # place before this tick, swept collision starts from it
+        self.__prev_centers[:] = self.__centers
+        self.__prev_headings[:] = self.__headings
+        self.__m_prev_centers[:] = self.__m_centers
+        self.__m_prev_headings[:] = self.__m_headings
+
+        # right wins when both are pressed, like Simulation
+        right = (actions & INPUT_RIGHT) != 0
+        left = ((actions & INPUT_LEFT) != 0) & ~right
+        headings = self.__headings
+        headings += (right.astype(float) - left) * self.__turn
+        headings += math.pi
+        np.mod(headings, 2 * math.pi, out=headings)
+        headings -= math.pi
+
+        self.__run_due()
+
+        # slots after the last used one are empty in every world
+        used = _used_slots(self.__m_present)
+        self.__update_positions(used)
+        self.__check_colision(used)
+        self.__pickup_coins()
+
+        # remove dead missiles, then score missiles that are gone
+        self.__m_present &= self.__m_alive
+        count = self.__m_present.sum(axis=1)
+        gone = count < self.__last_num
+        self.__score[gone] += self.__last_num[gone] - count[gone]
+        self.__last_num[gone] = count[gone]
+
+        rewards = self.__rewards
+        np.subtract(self.__score, score_before, out=rewards, casting="unsafe")
+        rewards[~self.__alive] += self.DEATH_REWARD
+
+        dones = self.__dones
+        np.logical_not(self.__alive, out=dones)
+        dones |= self.__time >= self.__max_time - 1e-9
+
+        if dones.any():
+            self.__final_scores[dones] = self.__score[dones]
+            self.__final_times[dones] = self.__time[dones]
+            self.__episodes += int(dones.sum())
+            self.__reset_worlds(dones)
+
+        self.__observe()
+        return self.__obs, rewards, dones
+
+    def __reset_worlds(self, worlds: np.ndarray) -> None:
+        """Start a new game in worlds, same as Simulation.reset()
+        and the start of the game"""
+        rules = self.__rules
+
+        self.__time[worlds] = 0.0
+        self.__centers[worlds] = (rules.WORLD_WIDTH / 2,
+                                  rules.WORLD_HEIGHT / 2)
+        self.__headings[worlds] = MissileSwarm.NOSE_UP
+        self.__alive[worlds] = True
+        self.__invincible[worlds] = False
+        self.__score[worlds] = 0
+        self.__last_num[worlds] = 0
+        self.__next_wave[worlds] = rules.MISSILE_SPAWN_TIME
+        self.__next_coin[worlds] = rules.COIN_SPAWN_TIME
+        self.__m_present[worlds] = False
+        self.__c_present[worlds] = False
+
+    def __run_due(self) -> None:
+        """Run missile waves, coin spawns and effect ends that are due,
+        a long tick can have more than one wave"""
+        rules = self.__rules
+        now = self.__time
+
+        self.__invincible &= now < self.__effect_end
+
+        while True:
+            due = np.flatnonzero(now >= self.__next_wave)
+            if len(due) == 0:
+                break
+            self.__spawn_missiles(due)
+            self.__next_wave[due] += rules.MISSILE_SPAWN_TIME
+
+        while True:
+            due = np.flatnonzero(now >= self.__next_coin)
+            if len(due) == 0:
+                break
+            self.__spawn_coins(due)
+            self.__next_coin[due] += rules.COIN_SPAWN_TIME
+
+    def __spawn_missiles(self, worlds: np.ndarray) -> None:
+        """Spawn a wave of 2 to MAX_MISSILES missiles in every world,
+        each at a different spawn position"""
+        rules = self.__rules
+        most = rules.MAX_MISSILES
+
+        counts = self.__rng.integers(2, most + 1, size=len(worlds))
+        while (self.__m_present[worlds].sum(axis=1) + counts
+               > self.__m_present.shape[1]).any():
+            self.__grow_missiles()
+
+        # first positions of a random order of every row are a sample
+        order = self.__rng.random((len(worlds),
+                                   len(self.__spawn_positions)))
+        picks = order.argsort(axis=1)[:, :most]
+
+        # free slots come first in a stable sort of present
+        slots = self.__m_present[worlds].argsort(axis=1,
+                                                 kind="stable")[:, :most]
+        used = np.arange(most) < counts[:, None]
+        rows = np.broadcast_to(worlds[:, None], used.shape)[used]
+        slots = slots[used]
+        centers = self.__spawn_positions[picks[used]]
+
+        self.__m_centers[rows, slots] = centers
+        self.__m_prev_centers[rows, slots] = centers
+        self.__m_headings[rows, slots] = MissileSwarm.NOSE_UP
+        self.__m_prev_headings[rows, slots] = MissileSwarm.NOSE_UP
+        self.__m_speeds[rows, slots] = rules.MISSILE_SPEED
+        self.__m_present[rows, slots] = True
+        self.__m_alive[rows, slots] = True
+
+        self.__last_num[worlds] = counts
+
+    def __spawn_coins(self, worlds: np.ndarray) -> None:
+        """Spawn one coin of a random type in every world"""
+        rules = self.__rules
+        rng = self.__rng
+        margin = rules.COIN_SPAWN_MARGIN
+
+        if self.__c_present[worlds].all(axis=1).any():
+            self.__grow_coins()
+
+        types = rng.choice(len(self.__coin_weights), size=len(worlds),
+                           p=self.__coin_weights)
+        x = rng.integers(margin, rules.WORLD_WIDTH - margin + 1,
+                         size=len(worlds))
+        y = rng.integers(margin, rules.WORLD_HEIGHT - margin + 1,
+                         size=len(worlds))
+
+        slots = np.argmin(self.__c_present[worlds], axis=1)
+        self.__c_centers[worlds, slots, 0] = x
+        self.__c_centers[worlds, slots, 1] = y
+        self.__c_types[worlds, slots] = types
+        self.__c_present[worlds, slots] = True
+
+    def __update_positions(self, used: int) -> None:
+        """Move every player forward, steer and move every missile
+        in first used slots like MissileSwarm.step()"""
+        rules = self.__rules
+        scale = self.__scale
+        centers = self.__centers
+        headings = self.__headings
+
+        distance = rules.AIRPLANE_SPEED * scale
+        centers[:, 0] += distance * np.cos(headings)
+        centers[:, 1] += distance * np.sin(headings)
+
+        # steer every missile to player of its world
+        m_centers = self.__m_centers[:, :used]
+        m_headings = self.__m_headings[:, :used]
+        target = np.arctan2(centers[:, 1, None] - m_centers[:, :, 1],
+                            centers[:, 0, None] - m_centers[:, :, 0])
+
+        diff = target - m_headings
+        diff = np.where(diff > math.pi, diff - 2 * math.pi, diff)
+        diff = np.where(diff < -math.pi, diff + 2 * math.pi, diff)
+        np.clip(diff, -self.__missile_turn, self.__missile_turn, out=diff)
+
+        m_headings += diff
+        m_headings += math.pi
+        np.mod(m_headings, 2 * math.pi, out=m_headings)
+        m_headings -= math.pi
+
+        # speed that reach max_speed means missile is out of fuel
+        speeds = self.__m_speeds[:, :used]
+        self.__m_alive[:, :used] &= speeds != rules.MISSILE_MAX_SPEED
+
+        new_speeds = speeds + rules.MISSILE_ACCELERATION * self.__dt
+        distance = new_speeds * scale
+        m_centers[:, :, 0] += distance * np.cos(m_headings)
+        m_centers[:, :, 1] += distance * np.sin(m_headings)
+        np.minimum(new_speeds, rules.MISSILE_MAX_SPEED, out=speeds)
+
+    def __check_colision(self, used: int) -> None:
+        """Swept collision of players and missiles in first used slots
+        of every world, like Simulation.check_swept_colision()"""
+        rules = self.__rules
+        shape = MissileSwarm.SHAPE
+        nose = MissileSwarm.NOSE_UP
+        present = self.__m_present[:, :used]
+        capacity = self.__m_present.shape[1]
+
+        # (world, time of impact, missile, other missile or -1 for player)
+        events = []
+
+        # Player is invincing. So, missiles can go through player
+        worlds, slots = np.nonzero(present & ~self.__invincible[:, None])
+        if len(worlds) > 0:
+            start, end = self.__missile_poses(worlds * capacity + slots)
+            hit, toi = swept_narrow_phase(
+                shape, start, end,
+                np.full(len(worlds), float(rules.MISSILE_SIZE)),
+                (self.__prev_centers[worlds],
+                 self.__prev_headings[worlds] - nose),
+                (self.__centers[worlds], self.__headings[worlds] - nose),
+                float(rules.AIRPLANE_SIZE))
+            events.extend(zip(worlds[hit].tolist(), toi.tolist(),
+                              slots[hit].tolist(), [-1] * len(hit)))
+
+        # every pair of missiles in the same world
+        if used not in self.__pairs:
+            self.__pairs[used] = np.triu_indices(used, 1)
+        first, second = self.__pairs[used]
+        worlds, pairs = np.nonzero(present[:, first] & present[:, second])
+        if len(worlds) > 0:
+            first, second = first[pairs], second[pairs]
+            start_a, end_a = self.__missile_poses(worlds * capacity + first)
+            start_b, end_b = self.__missile_poses(worlds * capacity + second)
+            sizes = np.full(len(worlds), float(rules.MISSILE_SIZE))
+            hit, toi = swept_narrow_phase(shape, start_a, end_a, sizes,
+                                          start_b, end_b, sizes)
+            events.extend(zip(worlds[hit].tolist(), toi.tolist(),
+                              first[hit].tolist(), second[hit].tolist()))
+
+        # only a few hits in a tick, earliest first in every world
+        dead = set()
+        for world, _, missile, other in sorted(events):
+            if (world, missile) in dead or (world, other) in dead:
+                continue
+
+            dead.add((world, missile))
+            if other < 0:
+                self.__alive[world] = False
+            else:
+                dead.add((world, other))
+
+        if dead:
+            rows, slots = zip(*dead)
+            self.__m_alive[rows, slots] = False
+
+    def __missile_poses(self, index: np.ndarray) -> Tuple[
+            Tuple[np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray]]:
+        """Get centers and turns from nose up of missiles before and
+        after this tick, index is world * slots of a world + slot"""
+        nose = MissileSwarm.NOSE_UP
+        start = (self.__m_prev_centers.reshape(-1, 2).take(index, axis=0),
+                 self.__m_prev_headings.reshape(-1).take(index) - nose)
+        end = (self.__m_centers.reshape(-1, 2).take(index, axis=0),
+               self.__m_headings.reshape(-1).take(index) - nose)
+        return start, end
+
+    def __pickup_coins(self) -> None:
+        """Collect coins that contain the player of their world,
+        and start effects of them"""
+        rules = self.__rules
+        used = _used_slots(self.__c_present)
+        present = self.__c_present[:, :used]
+
+        gap = self.__c_centers[:, :used] - self.__centers[:, None]
+        got = present & ((gap * gap).sum(axis=2)
+                         < rules.COIN_RADIUS * rules.COIN_RADIUS)
+        if not got.any():
+            return
+
+        self.__score += got.sum(axis=1) * rules.COIN_SCORE
+        present &= ~got
+
+        # new coin gives the whole time again
+        types = self.__c_types[:, :used]
+        invincible = (got & (types == self.__invincible_type)).any(axis=1)
+        self.__invincible |= invincible
+        self.__effect_end[invincible] = self.__time[invincible] \
+            + rules.AIRPLANE_EFFECT_TIME
+
+        boom = (got & (types == self.__boom_type)).any(axis=1)
+        self.__m_present[boom] = False
+
+    def __grow_missiles(self) -> None:
+        """Double missile slots of every world"""
+        for name in ("m_centers", "m_headings", "m_speeds",
+                     "m_prev_centers", "m_prev_headings",
+                     "m_present", "m_alive"):
+            self.__double(name)
+
+    def __grow_coins(self) -> None:
+        """Double coin slots of every world"""
+        for name in ("c_centers", "c_types", "c_present"):
+            self.__double(name)
+
+    def __double(self, name: str) -> None:
+        """Double slots of one padded array, new slots are not present"""
+        attr = f"_VectorEnv__{name}"
+        old = getattr(self, attr)
+        new = np.zeros((old.shape[0], old.shape[1] * 2) + old.shape[2:],
+                       dtype=old.dtype)
+        new[:, :old.shape[1]] = old
+        setattr(self, attr, new)
+
+    def __observe(self) -> None:
+        """Write observation of every world into the same array"""
+        rules = self.__rules
+        obs = self.__obs
+        pos_scale = self.__position_scale
+        centers = self.__centers
+        headings = self.__headings
+
+        obs[:, 0] = centers[:, 0] * pos_scale
+        obs[:, 1] = centers[:, 1] * pos_scale
+        obs[:, 2] = np.cos(headings)
+        obs[:, 3] = np.sin(headings)
+        left = (self.__effect_end - self.__time) / rules.AIRPLANE_EFFECT_TIME
+        obs[:, 4] = np.where(self.__invincible, left, 0.0)
+
+        # clear both blocks first so worlds with nothing nearby read zeros
+        obs[:, self.PLAYER_FEATURES:] = 0
+
+        start = self.PLAYER_FEATURES
+        used = _used_slots(self.__m_present)
+        features = self.__nearest(self.__m_centers[:, :used],
+                                  self.__m_present[:, :used],
+                                  self.__missile_obs)
+        if features is not None:
+            gap, rows, slots, found = features
+            headings = self.__m_headings[rows, slots]
+            block = np.stack((gap[..., 0], gap[..., 1], np.cos(headings),
+                              np.sin(headings), np.ones_like(headings)),
+                             axis=2) * found[..., None]
+            end = start + block.shape[1] * self.MISSILE_FEATURES
+            obs[:, start:end] = block.reshape(len(obs), -1)
+        start += self.__missile_obs * self.MISSILE_FEATURES
+
+        used = _used_slots(self.__c_present)
+        features = self.__nearest(self.__c_centers[:, :used],
+                                  self.__c_present[:, :used],
+                                  self.__coin_obs)
+        if features is not None:
+            gap, rows, slots, found = features
+            kinds = len(rules.COIN_TYPES)
+            one_hot = np.eye(kinds)[self.__c_types[rows, slots]]
+            block = np.concatenate((gap, one_hot), axis=2) * found[..., None]
+            end = start + block.shape[1] * self.COIN_FEATURES
+            obs[:, start:end] = block.reshape(len(obs), -1)
+
+    def __nearest(self,
+                  slot_centers: np.ndarray,
+                  present: np.ndarray,
+                  k: int) -> Tuple[np.ndarray, np.ndarray,
+                                   np.ndarray, np.ndarray] | None:
+        """Get k nearest present slots to the player of every world
+
+        Returns:
+            Tuple | None: (n, k, 2) scaled offset from player, (n, k)
+                          world and slot of each and `True` when slot
+                          is present, `None` when k is 0
+        """
+        k = min(k, present.shape[1])
+        if k == 0:
+            return None
+
+        gap = slot_centers - self.__centers[:, None]
+        distance = np.where(present, (gap * gap).sum(axis=2), np.inf)
+
+        slots = np.argpartition(distance, k - 1, axis=1)[:, :k]
+        nearest = np.take_along_axis(distance, slots, axis=1)
+        order = nearest.argsort(axis=1)
+        slots = np.take_along_axis(slots, order, axis=1)
+
+        rows = np.arange(len(present))[:, None]
+        found = present[rows, slots]
+        return gap[rows, slots] * self.__position_scale, rows, slots, found
+
+    # Access data part
+    def get_obs_size(self) -> int:
+        """Get length of one observation
+
+        Returns:
+            int: player, nearest missiles and nearest coins features
+        """
+        return self.PLAYER_FEATURES \
+            + self.__missile_obs * self.MISSILE_FEATURES \
+            + self.__coin_obs * self.COIN_FEATURES
+
+    def get_num_envs(self) -> int:
+        """Get number of worlds
+
+        Returns:
+            int: rows of every array that step() returns
+        """
+        return self.__num_envs
+
+    def get_scores(self) -> np.ndarray:
+        """Get score of running game of every world
+
+        Returns:
+            np.ndarray: (num_envs,) score, it is a view
+        """
+        return self.__score
+
+    def get_times(self) -> np.ndarray:
+        """Get game time of running game of every world
+
+        Returns:
+            np.ndarray: (num_envs,) seconds since the game started
+        """
+        return self.__time
+
+    def get_final_scores(self) -> np.ndarray:
+        """Get score of last finished game of every world, rows that
+        are done in last step are the game that just finished
+
+        Returns:
+            np.ndarray: (num_envs,) final score
+        """
+        return self.__final_scores
+
+    def get_final_times(self) -> np.ndarray:
+        """Get survival time of last finished game of every world
+
+        Returns:
+            np.ndarray: (num_envs,) game time in seconds
+        """
+        return self.__final_times
+
+    def get_episodes(self) -> int:
+        """Get number of finished games of every world together
+
+        Returns:
+            int: games that were done
+        """
+        return self.__episodes
+
+
+def _used_slots(present: np.ndarray) -> int:
+    """Get number of slots up to the last one that is used in any world
+
+    Args:
+        present (np.ndarray): (n, m) `True` where a slot is used
+
+    Returns:
+        int: slots that have to be looked at, the rest are empty
+    """
+    used = present.any(axis=0)
+    return len(used) - int(np.argmax(used[::-1])) if used.any() else 0
+
+
+def bench(num_envs: int,
+          ticks: int = 600,
+          seed: int = 0) -> Tuple[float, float]:
+    """Time num_envs worlds of VectorEnv against as many Simulations
+    that turn at random
+
+    Args:
+        num_envs (int): number of worlds
+        ticks (int): steps of every world
+        seed (int): seed of worlds and actions
+
+    Returns:
+        Tuple[float, float]: seconds per step of VectorEnv and of
+                             every Simulation stepped one by one
+    """
+    rng = np.random.default_rng(seed)
+    choices = np.array([0, INPUT_LEFT, INPUT_RIGHT])
+    actions = choices[rng.integers(0, 3, size=(ticks, num_envs))]
+
+    env = VectorEnv(num_envs, seed=seed)
+    start = time.perf_counter()
+    for tick in range(ticks):
+        env.step(actions[tick])
+    vector = (time.perf_counter() - start) / ticks
+
+    sims = []
+    for i in range(num_envs):
+        sim = Simulation(seed=seed + i)
+        sim.reset()
+        sim.step(INPUT_START, sim.tick_dt)
+        sims.append(sim)
+
+    inputs = actions.tolist()
+    start = time.perf_counter()
+    for tick in range(ticks):
+        for sim, action in zip(sims, inputs[tick]):
+            if not sim.player.get_alive():
+                sim.reset()
+                sim.step(INPUT_START, sim.tick_dt)
+            sim.step(action, sim.tick_dt)
+    single = (time.perf_counter() - start) / ticks
+
+    return vector, single
+
+
+def main() -> None:
+    """Command line of vector environment benchmark"""
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip(),
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--envs", type=int, nargs="+", default=[1, 64, 1024],
+                        help="number of worlds of every run")
+    parser.add_argument("--ticks", type=int, default=600,
+                        help="steps of every run, first wave comes at 210")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'envs':>6} {'vector ms':>10} {'single ms':>10} "
+          f"{'speedup':>8} {'steps/s':>10}")
+    for n in args.envs:
+        vector, single = bench(n, args.ticks, args.seed)
+        print(f"{n:>6} {vector * 1e3:>10.3f} {single * 1e3:>10.3f} "
+              f"{single / vector:>7.1f}x {n / vector:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()